@@ -0,0 +1,168 @@
+import importlib.util
+import os
+import sys
+from typing import Dict, Any
+
+from .harness import BenchmarkSuite
+
+
+FULL_BLOCKS = 5000
+QUICK_BLOCKS = 1000
+
+# Число одновременно перетаскиваемых блоков
+DRAG_BLOCKS = 1000
+
+# Шагов мыши в одном замере перетаскивания
+DRAG_STEPS = 20
+
+ZOOMS = [("100", 1.0), ("25", 0.25), ("10", 0.1)]
+
+# Точек поиска связи и порта под курсором в одном замере
+HIT_QUERIES = 1000
+
+# Число блоков, копируемых и вставляемых через буфер обмена
+CLIPBOARD_BLOCKS = 2000
+
+
+def make_graph(count: int) -> Dict[str, Any]:
+    """Цепочка из count блоков с позициями на сетке"""
+    types = ("urls", "fetch", "extract", "sink")
+    blocks = [{"id": f"block_{i}", "type": types[i % 4], "x": (i % 50) * 220, "y": (i // 50) * 100,
+               "params": {}} for i in range(count)]
+    connections = [{"from": f"block_{i}", "to": f"block_{i + 1}"} for i in range(count - 1)]
+    return {"name": "bench", "data": {"blocks": blocks, "connections": connections}}
+
+
+def run(suite: BenchmarkSuite) -> None:
+    print("Холст блоков (offscreen)")
+    if importlib.util.find_spec("PyQt6") is None:
+        suite.skip("canvas.reload", "PyQt6 не установлен")
+        return
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt, QEvent, QPointF, QRectF
+    from PyQt6.QtGui import QImage, QPainter, QMouseEvent
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from src.core.project_manager import _PROJECT_MANAGER
+    from src.core.edit_history import _EDIT_HISTORY
+    from src.ui.block_canvas import BlockCanvas
+
+    count = QUICK_BLOCKS if suite.quick else FULL_BLOCKS
+    previous_data = _PROJECT_MANAGER.current_project_data
+    _PROJECT_MANAGER.current_project_data = make_graph(count)
+    canvas = BlockCanvas()
+    canvas.resize(1200, 900)
+    canvas.show()
+    app.processEvents()
+
+    try:
+        suite.measure(f"canvas.reload.{count}", canvas.reload, repeat=5, items=count, item_unit="blocks")
+
+        def frame():
+            image = QImage(canvas.viewport().size(), QImage.Format.Format_ARGB32_Premultiplied)
+            painter = QPainter(image)
+            canvas.render(painter)
+            painter.end()
+
+        for label, zoom in ZOOMS:
+            canvas.set_zoom(zoom)
+            canvas.centerOn(0, 0)
+            suite.measure(f"canvas.frame.zoom{label}", frame, repeat=7, number=10)
+
+        # Мини-карта: полная перерисовка (открытие проекта) и перерисовка области одного блока (правка)
+        minimap = canvas.minimap
+        block_rect = canvas.block_scene.block_items["block_0"].sceneBoundingRect()
+
+        def minimap_full():
+            minimap.mark_dirty(QRectF())
+            minimap.refresh()
+
+        def minimap_block():
+            minimap.mark_dirty(block_rect)
+            minimap.refresh()
+
+        minimap_full()
+        suite.measure("canvas.minimap.full", minimap_full, repeat=5, items=count, item_unit="blocks")
+        suite.measure("canvas.minimap.block", minimap_block, repeat=7, number=10)
+
+        index = canvas.block_scene.index
+        bounds = canvas.block_scene.itemsBoundingRect()
+        step_x = bounds.width() / HIT_QUERIES
+        step_y = bounds.height() / HIT_QUERIES
+        points = [(bounds.left() + i * step_x, bounds.top() + (i * 37 % HIT_QUERIES) * step_y)
+                  for i in range(HIT_QUERIES)]
+
+        def hit_test():
+            for x, y in points:
+                index.wire_at(x, y, 5)
+                index.port_at(x, y, 8)
+
+        suite.measure("canvas.hit_test", hit_test, repeat=7, items=HIT_QUERIES, item_unit="queries")
+
+        scene = canvas.block_scene
+        clipboard_blocks = min(CLIPBOARD_BLOCKS, count)
+
+        def select_for_copy():
+            scene.clearSelection()
+            for index in range(clipboard_blocks):
+                scene.block_items[f"block_{index}"].setSelected(True)
+
+        def copy_paste():
+            canvas.copy_selection()
+            canvas.paste()
+
+        def undo_paste():
+            select_for_copy()
+            while _EDIT_HISTORY.can_undo():
+                _EDIT_HISTORY.undo()
+
+        select_for_copy()
+        suite.measure(f"canvas.copy_paste{clipboard_blocks}", copy_paste, repeat=5, setup=undo_paste,
+                      items=clipboard_blocks, item_unit="blocks")
+        undo_paste()
+
+        def restore():
+            while _EDIT_HISTORY.can_undo():
+                _EDIT_HISTORY.undo()
+            # Отложенная подготовка новых элементов сцены выполняется циклом событий
+            app.processEvents()
+
+        suite.measure(f"canvas.select_all.{count}", canvas.select_all, repeat=5, setup=scene.clearSelection,
+                      items=count, item_unit="blocks")
+        suite.measure(f"canvas.clear.{count}", canvas.clear_workspace, repeat=5, setup=restore,
+                      items=count, item_unit="blocks")
+        restore()
+
+        def mouse(event_type, position, buttons):
+            return QMouseEvent(event_type, position, position, Qt.MouseButton.LeftButton, buttons,
+                               Qt.KeyboardModifier.NoModifier)
+
+        for label, zoom in (ZOOMS[0], ZOOMS[1]):
+            canvas.set_zoom(zoom)
+            canvas.centerOn(0, 0)
+
+            def drag():
+                scene.clearSelection()
+                for index in range(DRAG_BLOCKS):
+                    scene.block_items[f"block_{index}"].setSelected(True)
+                start = QPointF(canvas.mapFromScene(scene.block_items["block_0"].sceneBoundingRect().center()))
+                canvas.mousePressEvent(mouse(QEvent.Type.MouseButtonPress, start, Qt.MouseButton.LeftButton))
+                for step in range(1, DRAG_STEPS + 1):
+                    canvas.mouseMoveEvent(mouse(QEvent.Type.MouseMove, start + QPointF(step * 3, step * 2),
+                                                Qt.MouseButton.LeftButton))
+                    frame()
+                end = start + QPointF(DRAG_STEPS * 3, DRAG_STEPS * 2)
+                canvas.mouseReleaseEvent(mouse(QEvent.Type.MouseButtonRelease, end, Qt.MouseButton.NoButton))
+                # Возврат блоков на место, чтобы замеры были одинаковыми
+                while _EDIT_HISTORY.can_undo():
+                    _EDIT_HISTORY.undo()
+
+            suite.measure(f"canvas.drag{DRAG_BLOCKS}.zoom{label}", drag, repeat=5,
+                          items=DRAG_STEPS, item_unit="frames")
+    finally:
+        canvas.shutdown()
+        canvas.deleteLater()
+        _EDIT_HISTORY.clear()
+        _PROJECT_MANAGER.current_project_data = previous_data
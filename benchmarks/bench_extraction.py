@@ -0,0 +1,86 @@
+import random
+from pathlib import Path
+
+from .harness import BenchmarkSuite
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name: str) -> str:
+    with open(FIXTURES_DIR / name, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def make_catalog_page(card_count: int) -> str:
+    """
+    Создает детерминированную страницу каталога из шаблона карточки.
+
+    Args:
+        card_count: Число карточек товаров
+
+    Returns:
+        HTML страницы
+    """
+    template = load_fixture("catalog.html")
+    card = load_fixture("catalog_card.html")
+    rng = random.Random(42)
+
+    cards = []
+    for index in range(card_count):
+        cards.append(card.format(
+            index=index,
+            title=f"Товар номер {index}",
+            price=rng.randint(100, 99999),
+            rating=rng.randint(1, 5),
+            badge="sale" if index % 7 == 0 else "regular"
+        ))
+    return template.replace("{cards}", "\n".join(cards))
+
+
+CATALOG_FIELDS = {
+    "title": {"selector": "a.title"},
+    "url": {"selector": "a.title", "attr": "href"},
+    "price": {"selector": "span.price"},
+    "image": {"selector": "img", "attr": "src"},
+    "tags": {"selector": "ul.tags > li", "all": True}
+}
+
+
+def run(suite: BenchmarkSuite) -> None:
+    from src.engine.extractor import Extractor, parse_html, select, generate_selector, generate_xpath
+
+    print("Извлечение данных и генерация селекторов")
+    card_count = 200 if suite.quick else 1000
+    catalog = make_catalog_page(card_count)
+    article = load_fixture("article.html")
+    catalog_bytes = len(catalog.encode('utf-8'))
+    # Размер страницы входит в имя, чтобы быстрый и полный прогоны не сравнивались между собой
+    size = f"[{card_count}]"
+
+    suite.measure(f"extraction.parse_html.catalog{size}", lambda: parse_html(catalog),
+                  repeat=5, bytes_processed=catalog_bytes)
+    suite.measure("extraction.parse_html.article", lambda: parse_html(article),
+                  repeat=7, number=20, bytes_processed=len(article.encode('utf-8')))
+
+    extractor = Extractor(CATALOG_FIELDS, item_selector="div.card")
+    suite.measure(f"extraction.extract.catalog{size}", lambda: extractor.extract(catalog),
+                  repeat=5, items=card_count, item_unit="records")
+
+    root = parse_html(catalog)
+    suite.measure(f"extraction.select.descendant{size}", lambda: select(root, "div.card a.title"),
+                  repeat=5, items=card_count, item_unit="matches")
+    suite.measure(f"extraction.select.child{size}", lambda: select(root, "ul.tags > li"),
+                  repeat=5)
+
+    elements = list(root.iter_descendants())
+    suite.measure(f"selectors.generate_css{size}", lambda: [generate_selector(n) for n in elements],
+                  repeat=5, items=len(elements), item_unit="elements")
+    suite.measure(f"selectors.generate_xpath{size}", lambda: [generate_xpath(n) for n in elements],
+                  repeat=5, items=len(elements), item_unit="elements")
+
+    # Полный цикл: селектор из инспектора -> поиск по нему при извлечении
+    sample = elements[::max(1, len(elements) // 50)]
+    suite.measure(f"selectors.roundtrip50{size}",
+                  lambda: [select(root, generate_selector(n)) for n in sample],
+                  repeat=3, items=len(sample), item_unit="elements")
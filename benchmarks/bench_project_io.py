@@ -0,0 +1,110 @@
+import contextlib
+import io
+import itertools
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Any
+
+from .harness import BenchmarkSuite
+
+
+KB = 1024
+MB = 1024 * 1024
+
+FULL_SIZES = [("1KB", KB), ("100KB", 100 * KB), ("1MB", MB), ("10MB", 10 * MB), ("100MB", 100 * MB)]
+QUICK_SIZES = FULL_SIZES[:3]
+
+
+def make_project_data(target_size: int) -> Dict[str, Any]:
+    """
+    Создает детерминированный проект примерно заданного размера в JSON.
+
+    Args:
+        target_size: Желаемый размер сохраненного файла в байтах
+
+    Returns:
+        Данные проекта в формате ProjectManager
+    """
+    def make_block(index: int) -> Dict[str, Any]:
+        return {
+            "id": f"block_{index}",
+            "type": ("fetch", "extract", "sink")[index % 3],
+            "x": (index % 50) * 160,
+            "y": (index // 50) * 90,
+            "params": {
+                "selector": f"div.card:nth-of-type({index % 40 + 1}) > a.title",
+                "url": f"https://example.com/catalog/page/{index}",
+                "note": "Описание блока " * 4
+            }
+        }
+
+    sample = json.dumps(make_block(0), ensure_ascii=False, indent=2).encode('utf-8')
+    count = max(1, target_size // (len(sample) + 8))
+
+    return {
+        "name": "benchmark",
+        "created": "2024-01-01",
+        "version": "1.0.0",
+        "data": {
+            "blocks": [make_block(i) for i in range(count)],
+            "connections": [{"from": f"block_{i}", "to": f"block_{i + 1}"} for i in range(count - 1)]
+        }
+    }
+
+
+def project_size(file_path: str) -> int:
+    """Размер сохраненного проекта в байтах: файл и его части (каталог .chunks), если они есть"""
+    path = Path(file_path)
+    chunks_dir = path.with_name(path.stem + ".chunks")
+    size = path.stat().st_size
+    if chunks_dir.is_dir():
+        size += sum(chunk.stat().st_size for chunk in chunks_dir.iterdir() if chunk.is_file())
+    return size
+
+
+def run(suite: BenchmarkSuite) -> None:
+    from src.core.project_manager import ProjectManager
+
+    print("Проекты: сохранение и открытие")
+    temp_dir = Path(tempfile.mkdtemp(prefix="parser_bench_"))
+
+    manager = ProjectManager()
+    # Не трогаем настоящий список последних проектов, каталог и хранилище блобов
+    manager.recent_projects_file = temp_dir / "recent_projects.json"
+    manager.catalog_file = temp_dir / "project_catalog.db"
+    manager.staging_blobs_dir = temp_dir / "blobs" / "untitled.blobs"
+
+    try:
+        for label, size in (QUICK_SIZES if suite.quick else FULL_SIZES):
+            project_data = make_project_data(size)
+            file_path = str(temp_dir / f"project_{label}.json")
+            repeat = 5 if size <= MB else 3
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager.save_project(file_path, project_data)
+            actual_size = project_size(file_path)
+
+            blocks = project_data["data"]["blocks"]
+            edits = itertools.count()
+
+            def edit():
+                # Между сохранениями блок заменяется измененной копией, как при перемещении на холсте:
+                # иначе сохранение без изменений переиспользует все части файла
+                index = next(edits) * 7919 % len(blocks)
+                blocks[index] = {**blocks[index], "x": blocks[index]["x"] + 10}
+
+            def save():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    manager.save_project(file_path, project_data)
+
+            def open_():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    manager.open_project(file_path)
+
+            suite.measure(f"project_io.save[{label}]", save, repeat=repeat, setup=edit,
+                          bytes_processed=actual_size)
+            suite.measure(f"project_io.open[{label}]", open_, repeat=repeat, bytes_processed=actual_size)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,70 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from .harness import BenchmarkSuite
+
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# Скрипт запускается в отдельном процессе, чтобы каждый замер был "холодным"
+_MAIN_WINDOW_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from src.ui.main_window import MainWindow
+imported = time.perf_counter()
+window = MainWindow()
+app.processEvents()
+ready = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "construct_s": ready - imported, "total_s": ready - start}))
+window.close()
+"""
+
+
+def run(suite: BenchmarkSuite) -> None:
+    from src.core.config_loader import ConfigLoader
+    from src.core.text_manager import TextManager
+    from src.core.theme_manager import ThemeManager
+
+    print("Инициализация менеджеров")
+
+    def load_all_configs():
+        loader = ConfigLoader()
+        loader.load_menu_config()
+        loader.load_localization()
+        loader.load_color_schemes()
+
+    suite.measure("startup.config_loader", load_all_configs, repeat=7, number=20)
+    suite.measure("startup.text_manager", TextManager, repeat=7, number=20)
+    suite.measure("startup.theme_manager", ThemeManager, repeat=7, number=20)
+
+    print("Запуск главного окна (offscreen)")
+    if importlib.util.find_spec("PyQt6") is None:
+        suite.skip("startup.main_window.total", "PyQt6 не установлен")
+        return
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    repeat = 3 if suite.quick else 5
+    samples = {"import_s": [], "construct_s": [], "total_s": []}
+
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _MAIN_WINDOW_SCRIPT],
+            cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=120
+        )
+        lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+        if completed.returncode != 0 or not lines:
+            suite.skip("startup.main_window.total", f"ошибка запуска: {completed.stderr.strip()[-200:]}")
+            return
+        measurement = json.loads(lines[-1])
+        for key in samples:
+            samples[key].append(measurement[key])
+
+    suite.add("startup.main_window.import", samples["import_s"])
+    suite.add("startup.main_window.construct", samples["construct_s"])
+    suite.add("startup.main_window.total", samples["total_s"])
@@ -0,0 +1,181 @@
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+
+class BenchmarkSuite:
+
+    def __init__(self, quick: bool = False):
+        """
+        Набор результатов измерений.
+
+        Args:
+            quick: Сокращенный режим (меньше повторов и размеров данных)
+        """
+        self.quick = quick
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def measure(self, name: str, fn: Callable[[], Any], repeat: int = 5, number: int = 1,
+                setup: Callable[[], Any] = None, items: int = None, item_unit: str = "items",
+                bytes_processed: int = None) -> Dict[str, Any]:
+        """
+        Измеряет время выполнения функции.
+
+        Args:
+            name: Уникальное имя измерения (ключ для сравнения с эталоном)
+            fn: Измеряемая функция
+            repeat: Число замеров
+            number: Сколько раз вызвать fn в одном замере
+            setup: Функция подготовки, вызываемая перед каждым замером (не измеряется)
+            items: Число обработанных элементов за один вызов (для пропускной способности)
+            item_unit: Название единицы элементов
+            bytes_processed: Число обработанных байт за один вызов
+
+        Returns:
+            Словарь с результатом измерения
+        """
+        if self.quick:
+            repeat = max(1, min(repeat, 3))
+
+        # Прогрев: первый вызов часто включает импорты и заполнение кэшей
+        if setup:
+            setup()
+        fn()
+
+        samples = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number)
+
+        return self.add(name, samples, items=items, item_unit=item_unit, bytes_processed=bytes_processed)
+
+    def add(self, name: str, samples: List[float], items: int = None, item_unit: str = "items",
+            bytes_processed: int = None) -> Dict[str, Any]:
+        """
+        Добавляет результат по готовым замерам (например, из дочернего процесса).
+
+        Args:
+            name: Имя измерения
+            samples: Времена замеров в секундах
+
+        Returns:
+            Словарь с результатом измерения
+        """
+        median = statistics.median(samples)
+        result = {
+            "median_s": median,
+            "min_s": min(samples),
+            "max_s": max(samples),
+            "runs": len(samples)
+        }
+        if items and median > 0:
+            result[f"{item_unit}_per_s"] = items / median
+        if bytes_processed and median > 0:
+            result["mb_per_s"] = bytes_processed / median / (1024 * 1024)
+
+        self.results[name] = result
+        print(f"  {name:<45} {self._format_time(median):>10}" + self._format_rate(result, item_unit))
+        return result
+
+    def skip(self, name: str, reason: str) -> None:
+        self.results[name] = {"skipped": reason}
+        print(f"  {name:<45} {'пропущен':>10}  ({reason})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "quick": self.quick
+            },
+            "benchmarks": self.results
+        }
+
+    def save(self, file_path: str) -> None:
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _format_time(seconds: float) -> str:
+        if seconds >= 1:
+            return f"{seconds:.2f} s"
+        if seconds >= 1e-3:
+            return f"{seconds * 1e3:.2f} ms"
+        return f"{seconds * 1e6:.1f} us"
+
+    @staticmethod
+    def _format_rate(result: Dict[str, Any], item_unit: str) -> str:
+        parts = []
+        if f"{item_unit}_per_s" in result:
+            parts.append(f"{result[f'{item_unit}_per_s']:,.0f} {item_unit}/s")
+        if "mb_per_s" in result:
+            parts.append(f"{result['mb_per_s']:.1f} MB/s")
+        return "  (" + ", ".join(parts) + ")" if parts else ""
+
+
+def compare_with_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                          threshold: float = 0.25, noise_floor: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Сравнивает результаты с эталоном.
+
+    Args:
+        current: Результаты текущего прогона (BenchmarkSuite.to_dict())
+        baseline: Сохраненный эталон в том же формате
+        threshold: Допустимое относительное замедление (0.25 = 25%)
+        noise_floor: Абсолютная разница в секундах, ниже которой замедление не считается
+
+    Returns:
+        Список строк сравнения с ключом "regression"
+    """
+    rows = []
+    baseline_results = baseline.get("benchmarks", {})
+
+    for name, result in current.get("benchmarks", {}).items():
+        reference = baseline_results.get(name)
+        if not reference or "median_s" not in result or "median_s" not in reference:
+            continue
+
+        ratio = result["median_s"] / reference["median_s"] if reference["median_s"] else 1.0
+        slower_by = result["median_s"] - reference["median_s"]
+        rows.append({
+            "name": name,
+            "baseline_s": reference["median_s"],
+            "current_s": result["median_s"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold and slower_by > noise_floor
+        })
+
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        print("Нет общих измерений с эталоном")
+        return
+
+    print(f"\n{'Измерение':<45} {'эталон':>10} {'сейчас':>10} {'x':>7}")
+    for row in rows:
+        marker = "  <-- РЕГРЕССИЯ" if row["regression"] else ""
+        print(f"{row['name']:<45} {BenchmarkSuite._format_time(row['baseline_s']):>10} "
+              f"{BenchmarkSuite._format_time(row['current_s']):>10} {row['ratio']:>6.2f}x{marker}")
+
+
+def load_results(file_path: str) -> Optional[Dict[str, Any]]:
+    path = Path(file_path)
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,81 @@
+"""
+Запуск бенчмарков Parser Bot.
+
+Примеры:
+    python -m benchmarks.run_benchmarks                   # все бенчмарки + сравнение с эталоном
+    python -m benchmarks.run_benchmarks --quick           # быстрый прогон (малые размеры)
+    python -m benchmarks.run_benchmarks --only project_io
+    python -m benchmarks.run_benchmarks --update-baseline # сохранить результаты как эталон
+
+Результаты пишутся в JSON (по умолчанию benchmarks/results/latest.json).
+Код возврата 1 означает регрессию относительно эталона.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks import bench_project_io, bench_startup, bench_extraction, bench_canvas
+from benchmarks.harness import BenchmarkSuite, compare_with_baseline, print_comparison, load_results
+
+
+BENCHMARKS = {
+    "project_io": bench_project_io.run,
+    "startup": bench_startup.run,
+    "extraction": bench_extraction.run,
+    "canvas": bench_canvas.run
+}
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "latest.json"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки Parser Bot")
+    parser.add_argument("--quick", action="store_true", help="быстрый прогон с малыми данными")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS),
+                        help="запустить только указанную группу (можно повторять)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="файл для результатов JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="файл эталона JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="допустимое замедление относительно эталона (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="записать результаты как эталон")
+    parser.add_argument("--no-fail", action="store_true", help="не возвращать код ошибки при регрессии")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    suite = BenchmarkSuite(quick=args.quick)
+
+    for name in (args.only or BENCHMARKS):
+        BENCHMARKS[name](suite)
+
+    suite.save(args.output)
+    print(f"\nРезультаты сохранены: {args.output}")
+
+    if args.update_baseline:
+        suite.save(args.baseline)
+        print(f"Эталон обновлен: {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"Эталон не найден ({args.baseline}), сравнение пропущено")
+        return 0
+
+    rows = compare_with_baseline(suite.to_dict(), baseline, threshold=args.threshold)
+    print_comparison(rows)
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\nРегрессий: {len(regressions)}")
+        return 0 if args.no_fail else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
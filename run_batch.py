@@ -0,0 +1,12 @@
+"""
+Пакетное выполнение проектов в пуле процессов.
+
+Пример:
+    python run_batch.py projects/*.json -o results/ --shard-size 5000 --merge all.jsonl
+"""
+import sys
+from src.engine.batch import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Запуск проекта без графического интерфейса.
+
+Пример:
+    python run_headless.py project.json -o results.jsonl --progress 30
+    python run_headless.py project.json -o retry.jsonl --dead-letters failed.json --retry-dead-letters
+"""
+import sys
+from src.engine.headless import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
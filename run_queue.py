@@ -0,0 +1,14 @@
+"""
+Распределенное выполнение проекта через общую очередь заданий.
+
+Пример:
+    python run_queue.py submit queue.db project.json --chunk-size 200
+    python run_queue.py work queue.db
+    python run_queue.py collect queue.db -o results.jsonl
+"""
+import sys
+from src.engine.queue_worker import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
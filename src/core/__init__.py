@@ -1,11 +1,36 @@
 """
 Ядро приложения - основные компоненты
 """
-from .theme_manager import ThemeManager, _THEME
-from .config_loader import ConfigLoader
-from .project_manager import ProjectManager, _PROJECT_MANAGER
-from .title_manager import TitleManager, _TITLE_MANAGER
-from .window_router import WindowRouter
-from .text_manager import TextManager, get_text, set_language, get_current_language, has_text
-
-__all__ = ['ThemeManager', '_THEME', 'ConfigLoader', 'ProjectManager', '_PROJECT_MANAGER', 'TitleManager', '_TITLE_MANAGER', 'WindowRouter', 'TextManager', 'get_text', 'set_language', 'get_current_language', 'has_text']
+import importlib
+
+# Имена подгружаются при первом обращении, чтобы импорт отдельного менеджера
+# (например, project_manager) не тянул за собой окна и Qt-виджеты через window_router
+_EXPORTS = {
+    'ThemeManager': 'theme_manager',
+    '_THEME': 'theme_manager',
+    'ConfigLoader': 'config_loader',
+    'ProjectManager': 'project_manager',
+    '_PROJECT_MANAGER': 'project_manager',
+    'TitleManager': 'title_manager',
+    '_TITLE_MANAGER': 'title_manager',
+    'EditHistory': 'edit_history',
+    '_EDIT_HISTORY': 'edit_history',
+    'WindowRouter': 'window_router',
+    'TextManager': 'text_manager',
+    'get_text': 'text_manager',
+    'set_language': 'text_manager',
+    'get_current_language': 'text_manager',
+    'has_text': 'text_manager',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -18,7 +18,8 @@ class AppSettingsManager:
             "theme": "dark",
             "auto_save": True,
             "show_grid": True,
-            "snap_to_grid": True
+            "snap_to_grid": True,
+            "undo_memory_mb": 8
         }
     
     def _load_settings(self) -> None:
@@ -0,0 +1,237 @@
+"""
+Автосохранение проекта в файл восстановления.
+
+В потоке интерфейса снимается дешевый снимок данных (копируются словари
+и списки, но не сами блоки), сериализация и запись выполняются в фоновом
+потоке. Пока идет запись, новые снимки не ставятся в очередь, а заменяют
+ожидающий: записывается только последнее состояние.
+
+Блоки и соединения, как и для ChunkedProjectStore, нужно заменять новыми
+объектами, а не изменять на месте: снимок ссылается на те же объекты.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+from .project_storage import atomic_write_chunks
+
+
+RECOVERY_SUFFIX = ".recovery.json"
+
+# Каталог файлов восстановления для еще не сохраненных проектов
+RECOVERY_DIR = Path(__file__).parent.parent / "config" / "recovery"
+
+# Ключ метаданных автосохранения в файле восстановления
+AUTOSAVE_META_KEY = "autosave"
+
+
+def recovery_path_for(project_path: Optional[str], project_name: str = "untitled") -> Path:
+    """
+    Путь к файлу восстановления проекта.
+
+    Args:
+        project_path: Путь к файлу проекта (None для не сохраненного проекта)
+        project_name: Имя проекта (для не сохраненного проекта)
+    """
+    if project_path:
+        path = Path(project_path)
+        return path.with_name(f".{path.stem}{RECOVERY_SUFFIX}")
+    return RECOVERY_DIR / f"{project_name}{RECOVERY_SUFFIX}"
+
+
+def find_recovery(project_path: Optional[str], project_name: str = "untitled") -> Optional[Path]:
+    """
+    Возвращает файл восстановления, если он новее файла проекта.
+    """
+    recovery_path = recovery_path_for(project_path, project_name)
+    try:
+        recovery_mtime = recovery_path.stat().st_mtime
+    except OSError:
+        return None
+    if project_path:
+        try:
+            if Path(project_path).stat().st_mtime >= recovery_mtime:
+                return None
+        except OSError:
+            pass
+    return recovery_path
+
+
+class _EncodedSection:
+
+    __slots__ = ("codec", "content")
+
+    def __init__(self, codec: str, content: bytes):
+        # Секция двоичного контейнера, к которой не обращались: декодируется в фоновом потоке
+        self.codec = codec
+        self.content = content
+
+
+def snapshot_project(project_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Снимок данных проекта для записи в другом потоке.
+
+    Копируются словари и списки верхних уровней (без копирования элементов),
+    поэтому снимок большого проекта занимает миллисекунды.
+    """
+    from .project_container import LazySections
+
+    snapshot = dict(project_data)
+    data = project_data.get("data")
+    if isinstance(data, LazySections):
+        sections = {}
+        for key in data:
+            if data.is_loaded(key):
+                sections[key] = _shallow_copy(data[key])
+            else:
+                codec, view = data.stored_section(key)
+                sections[key] = _EncodedSection(codec, bytes(view))
+                view.release()
+        snapshot["data"] = sections
+    elif isinstance(data, dict):
+        snapshot["data"] = {key: _shallow_copy(value) for key, value in data.items()}
+    return snapshot
+
+
+def _shallow_copy(value: Any) -> Any:
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def iter_project_json(snapshot: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Сериализует снимок проекта частями.
+
+    Элементы больших списков кодируются по одному: между короткими вызовами
+    json.dumps поток интерфейса получает GIL, и интерфейс не подвисает.
+    """
+    from .project_container import decode_section
+
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+    yield b"{"
+    for index, (key, value) in enumerate(snapshot.items()):
+        yield (b"," if index else b"") + dumps(key) + b":"
+        if key != "data" or not isinstance(value, dict):
+            yield dumps(value)
+            continue
+
+        yield b"{"
+        for section_index, (section_key, section) in enumerate(value.items()):
+            yield (b"," if section_index else b"") + dumps(section_key) + b":"
+            if isinstance(section, _EncodedSection):
+                section = decode_section(section.content, section.codec)
+            if isinstance(section, list):
+                yield b"["
+                for item_index, item in enumerate(section):
+                    yield (b"," if item_index else b"") + dumps(item)
+                yield b"]"
+            else:
+                yield dumps(section)
+        yield b"}"
+    yield b"}"
+
+
+class AutosaveWriter:
+
+    def __init__(self):
+        """
+        Фоновый поток записи файлов восстановления.
+
+        Поток запускается при первой записи и ждет новых снимков.
+        """
+        self._condition = threading.Condition()
+        self._pending = None
+        self._current: Optional[Path] = None
+        self._discarded = set()
+        self._closed = False
+        self._thread = None
+        self.last_error: Optional[str] = None
+        self.last_saved_at: Optional[float] = None
+
+    def submit(self, snapshot: Dict[str, Any], target: Path) -> None:
+        """Ставит снимок на запись (заменяет ожидающий снимок)"""
+        with self._condition:
+            if self._closed:
+                return
+            self._pending = (snapshot, Path(target))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def is_idle(self) -> bool:
+        with self._condition:
+            return self._pending is None and self._current is None
+
+    def discard(self, target: Path) -> None:
+        """
+        Отменяет ожидающую запись и удаляет файл восстановления.
+
+        Вызывается в потоке интерфейса после обычного сохранения проекта.
+        """
+        target = Path(target)
+        with self._condition:
+            if self._pending is not None and self._pending[1] == target:
+                self._pending = None
+            # Запись этого файла уже идет - он будет удален фоновым потоком после нее
+            if self._current == target:
+                self._discarded.add(target)
+                return
+        _remove_file(target)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Дописывает ожидающий снимок и останавливает поток"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                snapshot, target = self._pending
+                self._pending = None
+                self._current = target
+
+            try:
+                self._write(snapshot, target)
+            finally:
+                with self._condition:
+                    self._current = None
+                    discarded = target in self._discarded
+                    self._discarded.discard(target)
+            if discarded:
+                _remove_file(target)
+
+    def _write(self, snapshot: Dict[str, Any], target: Path) -> None:
+        snapshot[AUTOSAVE_META_KEY] = {"time": time.time()}
+        try:
+            atomic_write_chunks(target, iter_project_json(snapshot))
+        except (OSError, ValueError, TypeError, RuntimeError) as e:
+            # RuntimeError - словарь блока изменили на месте во время записи; следующее изменение запишет снова
+            self.last_error = str(e)
+            print(f"Ошибка автосохранения: {e}")
+            return
+        self.last_error = None
+        self.last_saved_at = time.time()
+
+
+def _remove_file(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Ошибка удаления файла восстановления: {e}")
@@ -0,0 +1,417 @@
+"""
+Хранилище больших двоичных данных проекта (снимки страниц, ответы, скриншоты).
+
+Данные адресуются по SHA-256 содержимого: одинаковые снимки разных страниц
+и запусков хранятся один раз. Блобы сжимаются (zstandard, если установлен,
+иначе zlib) и дописываются в файлы сегментов каталога <имя файла>.blobs
+(например, proj.json.blobs) рядом с файлом проекта. В JSON проекта хранится
+только ссылка "blob:<sha256>".
+
+Структура записи сегмента:
+    SHA-256 (32 байта) | кодек (uint8) | длина исходных данных (uint32 LE) |
+    длина записанных данных (uint32 LE) | данные
+
+Индекс строится при открытии по заголовкам записей; запись, оборванная
+сбоем, отрезается. Чтение идет через отображение сегмента в память.
+Сборка мусора переписывает сегменты, в которых много блобов без ссылок,
+копируя живые записи без повторного сжатия.
+"""
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from .project_storage import atomic_write_chunks, _fsync_directory
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+BLOBS_SUFFIX = ".blobs"
+BLOB_REF_PREFIX = "blob:"
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+# Новый сегмент начинается, когда текущий превышает этот размер
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+# Сегмент переписывается сборкой мусора, если мертвых данных в нем не меньше этой доли
+GC_MIN_GARBAGE = 0.25
+
+# Данные меньше этого размера не сжимаются
+COMPRESS_MIN_BYTES = 256
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+_RECORD_HEADER = struct.Struct("<32sBII")
+_SEGMENT_NAME = re.compile(r"^seg-(\d{6})\.pack$")
+_REF_PATTERN = re.compile(r"^blob:([0-9a-f]{64})$")
+
+
+def blobs_dir_for(project_path) -> Path:
+    """Каталог блобов проекта; имя файла берется целиком, чтобы proj.json и proj.pbp не делили каталог"""
+    path = Path(project_path)
+    return path.with_name(path.name + BLOBS_SUFFIX)
+
+
+def blob_ref(digest: str) -> str:
+    """Ссылка на блоб для JSON проекта"""
+    return BLOB_REF_PREFIX + digest
+
+
+def parse_blob_ref(value: Any) -> Optional[str]:
+    """Возвращает хеш из ссылки на блоб или None, если значение не ссылка"""
+    if isinstance(value, str) and value.startswith(BLOB_REF_PREFIX):
+        match = _REF_PATTERN.match(value)
+        if match:
+            return match.group(1)
+    return None
+
+
+def iter_blob_refs(value: Any) -> Iterator[str]:
+    """Обходит данные проекта и возвращает хеши всех ссылок на блобы"""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            digest = parse_blob_ref(value)
+            if digest is not None:
+                yield digest
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, Mapping):
+            # Секции контейнера .pbp (LazySections)
+            stack.extend(value.values())
+
+
+class _BlobLocation:
+
+    __slots__ = ("segment", "offset", "codec", "size", "stored_size")
+
+    def __init__(self, segment: int, offset: int, codec: int, size: int, stored_size: int):
+        # offset указывает на данные записи (после заголовка)
+        self.segment = segment
+        self.offset = offset
+        self.codec = codec
+        self.size = size
+        self.stored_size = stored_size
+
+
+class BlobStore:
+
+    def __init__(self, directory, segment_max_bytes: int = SEGMENT_MAX_BYTES):
+        """
+        Хранилище блобов в каталоге сегментов.
+
+        Каталог создается при первой записи. Методы можно вызывать из разных
+        потоков (например, из потоков движка, сохраняющих снимки страниц).
+
+        Args:
+            directory: Каталог сегментов (обычно <имя файла проекта>.blobs)
+            segment_max_bytes: Размер, после которого начинается новый сегмент
+        """
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self._index: Dict[str, _BlobLocation] = {}
+        self._segment_sizes: Dict[int, int] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._active: Optional[int] = None
+        self._active_file = None
+        self._unsynced = False
+        self._lock = threading.RLock()
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL) if zstandard is not None else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+        self._load_index()
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def put(self, content: bytes) -> str:
+        """
+        Сохраняет данные (повторно одинаковые данные не записываются).
+
+        Данные становятся надежно записанными после flush.
+
+        Returns:
+            Хеш SHA-256 содержимого (ссылка в JSON - blob_ref(хеш))
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        if digest in self._index:
+            return digest
+
+        codec, stored = self._compress(content)
+        self._append_record(digest, codec, len(content), stored)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Читает данные блоба.
+
+        Raises:
+            KeyError: Если блоба нет в хранилище
+        """
+        digest = parse_blob_ref(digest) or digest
+        with self._lock:
+            location = self._index[digest]
+            segment_map = self._map_segment(location.segment, location.offset + location.stored_size)
+            stored = segment_map[location.offset:location.offset + location.stored_size]
+        return self._decompress(location.codec, stored, location.size)
+
+    def size(self, digest: str) -> int:
+        """Размер исходных данных блоба"""
+        return self._index[parse_blob_ref(digest) or digest].size
+
+    def flush(self) -> None:
+        """Сбрасывает записанные блобы на диск (до записи файла проекта со ссылками на них)"""
+        with self._lock:
+            if not self._unsynced or self._active_file is None:
+                return
+            os.fsync(self._active_file.fileno())
+            self._unsynced = False
+
+    def copy_to(self, other: "BlobStore", digests: Iterable[str]) -> int:
+        """
+        Копирует блобы в другое хранилище без повторного сжатия ("Сохранить как").
+
+        Returns:
+            Число скопированных блобов
+        """
+        copied = 0
+        for digest in set(digests):
+            if digest in other or digest not in self._index:
+                continue
+            with self._lock:
+                location = self._index[digest]
+                segment_map = self._map_segment(location.segment, location.offset + location.stored_size)
+                stored = segment_map[location.offset:location.offset + location.stored_size]
+            other._append_record(digest, location.codec, location.size, stored)
+            copied += 1
+        return copied
+
+    def collect_garbage(self, referenced: Set[str]) -> int:
+        """
+        Удаляет блобы без ссылок.
+
+        Сегменты, где мертвые данные составляют не меньше GC_MIN_GARBAGE,
+        переписываются с одними живыми записями; сегменты без живых
+        записей удаляются.
+
+        Args:
+            referenced: Хеши блобов, на которые ссылается проект
+
+        Returns:
+            Число освобожденных байт
+        """
+        with self._lock:
+            live_bytes: Dict[int, int] = dict.fromkeys(self._segment_sizes, 0)
+            for digest, location in self._index.items():
+                if digest in referenced:
+                    live_bytes[location.segment] += _RECORD_HEADER.size + location.stored_size
+
+            freed = 0
+            for segment, total in sorted(self._segment_sizes.items()):
+                live = live_bytes[segment]
+                if total == 0 or (total - live) < total * GC_MIN_GARBAGE:
+                    continue
+                freed += total - live
+                self._compact_segment(segment, referenced)
+            return freed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active_file is not None:
+                if self._unsynced:
+                    os.fsync(self._active_file.fileno())
+                    self._unsynced = False
+                self._active_file.close()
+                self._active_file = None
+            for segment_map in self._maps.values():
+                segment_map.close()
+            self._maps.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "blobs": len(self._index),
+                "segments": len(self._segment_sizes),
+                "size": sum(location.size for location in self._index.values()),
+                "disk_size": sum(self._segment_sizes.values()),
+            }
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"seg-{segment:06d}.pack"
+
+    def _load_index(self) -> None:
+        if not self.directory.is_dir():
+            return
+        # Временные файлы остаются только после сбоя во время сборки мусора
+        for path in self.directory.glob(".*.tmp"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+        segments = []
+        for path in self.directory.iterdir():
+            match = _SEGMENT_NAME.match(path.name)
+            if match:
+                segments.append(int(match.group(1)))
+        for segment in sorted(segments):
+            self._scan_segment(segment)
+
+    def _scan_segment(self, segment: int) -> None:
+        path = self._segment_path(segment)
+        size = path.stat().st_size
+        offset = 0
+        if size > 0:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as segment_map:
+                while offset + _RECORD_HEADER.size <= size:
+                    digest_bytes, codec, raw_size, stored_size = _RECORD_HEADER.unpack_from(segment_map, offset)
+                    data_offset = offset + _RECORD_HEADER.size
+                    if data_offset + stored_size > size:
+                        break
+                    # Блоб мог попасть в несколько сегментов при сборке мусора; берется первая запись
+                    self._index.setdefault(digest_bytes.hex(), _BlobLocation(segment, data_offset, codec,
+                                                                             raw_size, stored_size))
+                    offset = data_offset + stored_size
+
+        if offset < size:
+            print(f"Хранилище блобов: оборванная запись в {path.name} отброшена")
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        self._segment_sizes[segment] = offset
+
+    def _writable_segment(self, record_size: int) -> int:
+        active = self._active
+        if active is not None and self._segment_sizes[active] + record_size > self.segment_max_bytes \
+                and self._segment_sizes[active] > 0:
+            self._close_active()
+            active = None
+
+        if active is None:
+            # Дописывается последний сегмент, если в нем есть место
+            last = max(self._segment_sizes, default=None)
+            if last is not None and self._segment_sizes[last] + record_size <= self.segment_max_bytes:
+                active = last
+            else:
+                active = (last or 0) + 1
+                self._segment_sizes[active] = 0
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._active_file = open(self._segment_path(active), 'ab')
+            self._active = active
+        return active
+
+    def _close_active(self) -> None:
+        if self._active_file is not None:
+            if self._unsynced:
+                os.fsync(self._active_file.fileno())
+                self._unsynced = False
+            self._active_file.close()
+        self._active_file = None
+        self._active = None
+
+    def _append_record(self, digest: str, codec: int, size: int, stored: bytes) -> None:
+        with self._lock:
+            if digest in self._index:
+                return
+            segment = self._writable_segment(len(stored))
+            offset = self._segment_sizes[segment]
+            self._active_file.write(_RECORD_HEADER.pack(bytes.fromhex(digest), codec, size, len(stored)))
+            self._active_file.write(stored)
+            self._active_file.flush()
+            self._segment_sizes[segment] = offset + _RECORD_HEADER.size + len(stored)
+            self._index[digest] = _BlobLocation(segment, offset + _RECORD_HEADER.size, codec, size, len(stored))
+            self._unsynced = True
+
+    def _map_segment(self, segment: int, end: int) -> mmap.mmap:
+        segment_map = self._maps.get(segment)
+        # Дописанный сегмент отображается заново, когда запись выходит за старое отображение
+        if segment_map is None or len(segment_map) < end:
+            if segment == self._active and self._active_file is not None:
+                self._active_file.flush()
+            if segment_map is not None:
+                segment_map.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = segment_map
+        return segment_map
+
+    def _compact_segment(self, segment: int, referenced: Set[str]) -> None:
+        live = sorted(((digest, location) for digest, location in self._index.items()
+                       if location.segment == segment and digest in referenced),
+                      key=lambda item: item[1].offset)
+        if segment == self._active:
+            self._close_active()
+
+        new_segment = None
+        if live:
+            new_segment = max(self._segment_sizes) + 1
+            segment_map = self._map_segment(segment, self._segment_sizes[segment])
+            records = [segment_map[location.offset - _RECORD_HEADER.size:location.offset + location.stored_size]
+                       for _, location in live]
+            # Новый сегмент записывается целиком до удаления старого
+            atomic_write_chunks(self._segment_path(new_segment), records)
+
+        old_map = self._maps.pop(segment, None)
+        if old_map is not None:
+            old_map.close()
+        for digest in [d for d, location in self._index.items() if location.segment == segment]:
+            del self._index[digest]
+        del self._segment_sizes[segment]
+
+        if new_segment is not None:
+            offset = 0
+            for digest, location in live:
+                offset += _RECORD_HEADER.size
+                self._index[digest] = _BlobLocation(new_segment, offset, location.codec,
+                                                    location.size, location.stored_size)
+                offset += location.stored_size
+            self._segment_sizes[new_segment] = offset
+
+        try:
+            self._segment_path(segment).unlink()
+        except OSError as e:
+            print(f"Ошибка удаления сегмента блобов: {e}")
+        _fsync_directory(self.directory)
+
+    def _compress(self, content: bytes) -> Tuple[int, bytes]:
+        if len(content) < COMPRESS_MIN_BYTES:
+            return CODEC_RAW, content
+        if self._compressor is not None:
+            with self._lock:
+                stored = self._compressor.compress(content)
+            codec = CODEC_ZSTD
+        else:
+            stored = zlib.compress(content, ZLIB_LEVEL)
+            codec = CODEC_ZLIB
+        # Уже сжатые данные (PNG, gzip) хранятся как есть
+        if len(stored) >= len(content):
+            return CODEC_RAW, content
+        return codec, stored
+
+    def _decompress(self, codec: int, stored: bytes, size: int) -> bytes:
+        if codec == CODEC_RAW:
+            return stored
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(stored)
+        if codec == CODEC_ZSTD:
+            if self._decompressor is None:
+                raise ValueError("Blob is compressed with zstd, but zstandard is not installed")
+            return self._decompressor.decompress(stored, max_output_size=size)
+        raise ValueError(f"Unknown blob codec: {codec}")
@@ -0,0 +1,466 @@
+"""
+История изменений проекта (отмена и повтор).
+
+Каждое изменение - команда, которая хранит только затронутые элементы до
+и после изменения. Элементы проекта не изменяются на месте: новая версия
+блока создается функцией assoc_in, которая копирует только путь до
+измененного значения, а остальное разделяет с прежней версией. Поэтому
+запись истории занимает объем изменения, а отмена и повтор выполняются
+за время, пропорциональное изменению, а не размеру проекта.
+
+Когда объем истории превышает бюджет памяти, старые записи сначала
+сливаются (последовательные изменения одного элемента), затем удаляются.
+"""
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from .title_manager import _TITLE_MANAGER
+
+
+# Бюджет памяти истории по умолчанию
+DEFAULT_MEMORY_BUDGET = 8 * 1024 * 1024
+
+# Объем длинного списка элементов оценивается по выборке такого размера
+SIZE_SAMPLE = 256
+
+
+def assoc_in(value: Any, path: Sequence, new_value: Any) -> Any:
+    """
+    Возвращает копию value, в которой по пути path записано new_value.
+
+    Копируются только словари и списки на пути; остальные значения
+    разделяются с исходным объектом, который не изменяется.
+
+    Args:
+        value: Исходный словарь или список
+        path: Ключи и индексы, например ("params", "url")
+        new_value: Новое значение
+    """
+    if not path:
+        return new_value
+    key = path[0]
+    copy = list(value) if isinstance(value, list) else dict(value)
+    child = value[key] if isinstance(value, list) or key in value else {}
+    copy[key] = assoc_in(child, path[1:], new_value)
+    return copy
+
+
+def _unshared_size(value: Any, other: Any = None) -> int:
+    # Объем value без частей, общих с other
+    if value is other:
+        return 0
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        other_dict = other if isinstance(other, dict) else {}
+        for key, item in value.items():
+            size += _unshared_size(item, other_dict.get(key))
+    elif isinstance(value, (list, tuple)):
+        other_list = other if isinstance(other, (list, tuple)) else ()
+        for index, item in enumerate(value):
+            size += _unshared_size(item, other_list[index] if index < len(other_list) else None)
+    return size
+
+
+def _items_size(items: List[Any]) -> int:
+    # Объем списка элементов; для длинного списка (очистка, массовая вставка) - по равномерной выборке
+    if len(items) <= SIZE_SAMPLE:
+        return _unshared_size(items)
+    step = len(items) / SIZE_SAMPLE
+    sample = sum(_unshared_size(items[int(position * step)]) for position in range(SIZE_SAMPLE))
+    return sys.getsizeof(items) + sample * len(items) // SIZE_SAMPLE
+
+
+class Command:
+
+    description = ""
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def revert(self, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        """Примерный объем памяти, занимаемый командой"""
+        return sys.getsizeof(self)
+
+    def values(self) -> List[Any]:
+        """Значения проекта, которые команда хранит для отмены и повтора"""
+        return []
+
+    def merge(self, later: "Command") -> Optional["Command"]:
+        """
+        Сливает команду со следующей за ней.
+
+        Returns:
+            Команда с тем же результатом, что и обе подряд, или None если слить нельзя
+        """
+        return None
+
+
+class ReplaceItemCommand(Command):
+
+    description = "replace"
+
+    def __init__(self, section: str, index: int, old_item: Any, new_item: Any):
+        """
+        Замена элемента списка секции (например, блока в "blocks").
+
+        Args:
+            section: Ключ списка в секции "data"
+            index: Индекс элемента
+            old_item: Прежняя версия элемента
+            new_item: Новая версия (обычно из assoc_in)
+        """
+        self.section = section
+        self.index = index
+        self.old_item = old_item
+        self.new_item = new_item
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        data[self.section][self.index] = self.new_item
+
+    def revert(self, data: Dict[str, Any]) -> None:
+        data[self.section][self.index] = self.old_item
+
+    def size(self) -> int:
+        return (sys.getsizeof(self) + _unshared_size(self.old_item, self.new_item)
+                + _unshared_size(self.new_item, self.old_item))
+
+    def values(self) -> List[Any]:
+        return [self.old_item, self.new_item]
+
+    def merge(self, later: Command) -> Optional[Command]:
+        if (isinstance(later, ReplaceItemCommand) and later.section == self.section
+                and later.index == self.index and later.old_item is self.new_item):
+            return ReplaceItemCommand(self.section, self.index, self.old_item, later.new_item)
+        return None
+
+
+class InsertItemsCommand(Command):
+
+    description = "insert"
+
+    def __init__(self, section: str, index: int, items: List[Any]):
+        """
+        Вставка элементов в список секции.
+
+        Args:
+            section: Ключ списка в секции "data"
+            index: Позиция вставки (len списка - в конец)
+            items: Вставляемые элементы
+        """
+        self.section = section
+        self.index = index
+        self.items = list(items)
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        if self.section not in data:
+            data[self.section] = []
+        data[self.section][self.index:self.index] = self.items
+
+    def revert(self, data: Dict[str, Any]) -> None:
+        del data[self.section][self.index:self.index + len(self.items)]
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + _items_size(self.items)
+
+    def values(self) -> List[Any]:
+        return self.items
+
+
+class RemoveItemsCommand(Command):
+
+    description = "remove"
+
+    def __init__(self, section: str, index: int, items: List[Any]):
+        """
+        Удаление подряд идущих элементов списка секции.
+
+        Args:
+            section: Ключ списка в секции "data"
+            index: Позиция первого удаляемого элемента
+            items: Удаляемые элементы (для отмены)
+        """
+        self.section = section
+        self.index = index
+        self.items = list(items)
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        del data[self.section][self.index:self.index + len(self.items)]
+
+    def revert(self, data: Dict[str, Any]) -> None:
+        data[self.section][self.index:self.index] = self.items
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + _items_size(self.items)
+
+    def values(self) -> List[Any]:
+        return self.items
+
+
+class SetSectionCommand(Command):
+
+    description = "set"
+
+    # Значение-метка отсутствующей секции
+    MISSING = object()
+
+    def __init__(self, section: str, old_value: Any, new_value: Any):
+        """
+        Замена значения секции "data" целиком (например, настроек проекта).
+
+        Args:
+            section: Ключ секции
+            old_value: Прежнее значение (MISSING если секции не было)
+            new_value: Новое значение (MISSING - удалить секцию)
+        """
+        self.section = section
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        self._set(data, self.new_value)
+
+    def revert(self, data: Dict[str, Any]) -> None:
+        self._set(data, self.old_value)
+
+    def _set(self, data: Dict[str, Any], value: Any) -> None:
+        if value is self.MISSING:
+            data.pop(self.section, None)
+        else:
+            data[self.section] = value
+
+    def size(self) -> int:
+        return (sys.getsizeof(self) + _unshared_size(self.old_value, self.new_value)
+                + _unshared_size(self.new_value, self.old_value))
+
+    def values(self) -> List[Any]:
+        return [value for value in (self.old_value, self.new_value) if value is not self.MISSING]
+
+    def merge(self, later: Command) -> Optional[Command]:
+        if (isinstance(later, SetSectionCommand) and later.section == self.section
+                and later.old_value is self.new_value):
+            return SetSectionCommand(self.section, self.old_value, later.new_value)
+        return None
+
+
+class CompositeCommand(Command):
+
+    description = "composite"
+
+    def __init__(self, commands: List[Command], description: str = "composite"):
+        """
+        Несколько команд, которые отменяются и повторяются как одно действие.
+
+        Args:
+            commands: Команды в порядке выполнения
+            description: Описание действия
+        """
+        self.commands = list(commands)
+        self.description = description
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        for command in self.commands:
+            command.apply(data)
+
+    def revert(self, data: Dict[str, Any]) -> None:
+        for command in reversed(self.commands):
+            command.revert(data)
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + sum(command.size() for command in self.commands)
+
+    def values(self) -> List[Any]:
+        return [value for command in self.commands for value in command.values()]
+
+
+class _Entry:
+
+    __slots__ = ("command", "size")
+
+    def __init__(self, command: Command):
+        self.command = command
+        self.size = command.size()
+
+
+class EditHistory:
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 data_provider: Callable[[], Dict[str, Any]] = None):
+        """
+        Линейная история команд с отменой и повтором.
+
+        Args:
+            memory_budget: Максимальный объем истории в байтах
+            data_provider: Возвращает секцию "data" текущего проекта
+                (если None, берется из ProjectManager)
+        """
+        self.memory_budget = memory_budget
+        self._data_provider = data_provider
+        self._undo: List[_Entry] = []
+        self._redo: List[_Entry] = []
+        self._memory = 0
+        # Число команд в истории на момент сохранения; None - сохраненное состояние недостижимо
+        self._saved_depth: Optional[int] = 0
+        self._listeners: List[Callable[[Command, str], None]] = []
+
+    def add_listener(self, callback: Callable[[Command, str], None]) -> None:
+        """
+        Подписывает на выполнение команд.
+
+        Args:
+            callback: Вызывается с (команда, "do" | "undo" | "redo") после изменения данных
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Command, str], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def execute(self, command: Command, merge: bool = False) -> None:
+        """
+        Выполняет команду и добавляет ее в историю.
+
+        Args:
+            command: Команда
+            merge: Слить с предыдущей командой, если возможно (например, при перетаскивании)
+        """
+        command.apply(self._data())
+        self._clear_redo()
+
+        merged = None
+        if merge and self._undo and self._saved_depth != len(self._undo):
+            merged = self._undo[-1].command.merge(command)
+        if merged is not None:
+            self._memory -= self._undo.pop().size
+            self._push(merged)
+        else:
+            self._push(command)
+
+        self._compact()
+        self._notify(command, "do")
+
+    def undo(self) -> bool:
+        if not self._undo:
+            return False
+        entry = self._undo.pop()
+        entry.command.revert(self._data())
+        self._redo.append(entry)
+        self._notify(entry.command, "undo")
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo:
+            return False
+        entry = self._redo.pop()
+        entry.command.apply(self._data())
+        self._undo.append(entry)
+        self._notify(entry.command, "redo")
+        return True
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        """Очищает историю (при открытии или создании проекта)"""
+        self._undo.clear()
+        self._redo.clear()
+        self._memory = 0
+        self._saved_depth = 0
+
+    def on_project_event(self, event: str) -> None:
+        """Обработчик событий TitleManager"""
+        if event in ("new", "open"):
+            self.clear()
+        elif event == "save":
+            self.mark_saved()
+
+    def mark_saved(self) -> None:
+        """Запоминает текущее состояние как сохраненное"""
+        self._saved_depth = len(self._undo)
+
+    def is_at_saved_state(self) -> bool:
+        return self._saved_depth == len(self._undo)
+
+    def memory_usage(self) -> int:
+        return self._memory
+
+    def held_values(self) -> List[Any]:
+        """Значения проекта, на которые ссылаются записи отмены и повтора"""
+        return [value for entry in self._undo + self._redo for value in entry.command.values()]
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def _data(self) -> Dict[str, Any]:
+        if self._data_provider is not None:
+            return self._data_provider()
+        from .project_manager import _PROJECT_MANAGER
+        project_data = _PROJECT_MANAGER.get_current_project_data()
+        if project_data.get("data") is None:
+            project_data["data"] = {}
+        return project_data["data"]
+
+    def _push(self, command: Command) -> None:
+        entry = _Entry(command)
+        self._undo.append(entry)
+        self._memory += entry.size
+
+    def _clear_redo(self) -> None:
+        if self._redo:
+            self._memory -= sum(entry.size for entry in self._redo)
+            self._redo.clear()
+            if self._saved_depth is not None and self._saved_depth > len(self._undo):
+                self._saved_depth = None
+
+    def _compact(self) -> None:
+        if self._memory <= self.memory_budget:
+            return
+
+        # Сначала сливаются последовательные изменения одного элемента в старшей половине истории
+        compacted: List[_Entry] = []
+        limit = len(self._undo) // 2
+        for position, entry in enumerate(self._undo):
+            merged = None
+            # Слияние через сохраненное состояние сделало бы его недостижимым
+            if compacted and position < limit and self._saved_depth != len(compacted):
+                merged = compacted[-1].command.merge(entry.command)
+            if merged is not None:
+                if self._saved_depth is not None and self._saved_depth > len(compacted):
+                    self._saved_depth -= 1
+                compacted[-1] = _Entry(merged)
+            else:
+                compacted.append(entry)
+        self._undo = compacted
+        self._memory = sum(entry.size for entry in self._undo) + sum(entry.size for entry in self._redo)
+
+        # Затем удаляются самые старые записи - с запасом, чтобы не сжимать историю при каждой команде
+        target = self.memory_budget * 3 // 4
+        dropped = 0
+        while self._memory > target and dropped < len(self._undo) - 1:
+            self._memory -= self._undo[dropped].size
+            dropped += 1
+        if dropped:
+            del self._undo[:dropped]
+            if self._saved_depth is not None:
+                self._saved_depth = self._saved_depth - dropped if self._saved_depth >= dropped else None
+
+    def _notify(self, command: Command, action: str) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(command, action)
+            except Exception as e:
+                print(f"Ошибка обработчика истории изменений: {e}")
+
+
+def _sync_modified_flag(command: Command, action: str) -> None:
+    # После отмены до сохраненного состояния проект снова считается сохраненным
+    _TITLE_MANAGER.set_modified(not _EDIT_HISTORY.is_at_saved_state())
+
+
+_EDIT_HISTORY = EditHistory()
+_EDIT_HISTORY.add_listener(_sync_modified_flag)
+_TITLE_MANAGER.add_listener(_EDIT_HISTORY.on_project_event)
@@ -0,0 +1,259 @@
+"""
+Журнал изменений проекта для восстановления после сбоя.
+
+Каждая команда истории изменений дописывается в журнал рядом с файлом
+проекта одной строкой JSON. fsync выполняется фоновым потоком не чаще раза
+в FSYNC_INTERVAL секунд, поэтому изменение стоит одной короткой записи, а не
+сериализации всего проекта. Первая строка журнала описывает файл проекта,
+поверх которого записаны изменения; при следующем открытии этого файла
+журнал воспроизводится. После сохранения проекта журнал начинается заново.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .project_storage import atomic_write_bytes
+from .edit_history import (Command, ReplaceItemCommand, InsertItemsCommand, RemoveItemsCommand,
+                           SetSectionCommand, CompositeCommand)
+
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+
+# Максимальная задержка fsync после записи
+FSYNC_INTERVAL = 0.25
+
+
+def journal_path_for(project_path: str) -> Path:
+    path = Path(project_path)
+    return path.with_name(f".{path.stem}{JOURNAL_SUFFIX}")
+
+
+def _base_info(project_path: str) -> Dict[str, Any]:
+    stat = os.stat(project_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def encode_command(command: Command, inverse: bool = False) -> Dict[str, Any]:
+    """
+    Записывает команду как операцию над секцией "data".
+
+    Args:
+        command: Команда истории
+        inverse: Записать обратную операцию (для отмены)
+    """
+    if isinstance(command, ReplaceItemCommand):
+        return {"op": "replace", "section": command.section, "index": command.index,
+                "item": command.old_item if inverse else command.new_item}
+    if isinstance(command, (InsertItemsCommand, RemoveItemsCommand)):
+        inserting = isinstance(command, InsertItemsCommand) != inverse
+        if inserting:
+            return {"op": "insert", "section": command.section, "index": command.index, "items": command.items}
+        return {"op": "remove", "section": command.section, "index": command.index, "count": len(command.items)}
+    if isinstance(command, SetSectionCommand):
+        value = command.old_value if inverse else command.new_value
+        if value is SetSectionCommand.MISSING:
+            return {"op": "delete", "section": command.section}
+        return {"op": "set", "section": command.section, "value": value}
+    if isinstance(command, CompositeCommand):
+        commands = reversed(command.commands) if inverse else command.commands
+        return {"op": "batch", "ops": [encode_command(c, inverse) for c in commands]}
+    raise ValueError(f"Command can't be journaled: {type(command).__name__}")
+
+
+def apply_operation(data: Dict[str, Any], operation: Dict[str, Any]) -> None:
+    """Применяет операцию журнала к секции "data" проекта"""
+    op = operation["op"]
+    if op == "batch":
+        for nested in operation["ops"]:
+            apply_operation(data, nested)
+        return
+
+    section = operation["section"]
+    if op == "replace":
+        data[section][operation["index"]] = operation["item"]
+    elif op == "insert":
+        if section not in data:
+            data[section] = []
+        index = operation["index"]
+        data[section][index:index] = operation["items"]
+    elif op == "remove":
+        index = operation["index"]
+        del data[section][index:index + operation["count"]]
+    elif op == "set":
+        data[section] = operation["value"]
+    elif op == "delete":
+        data.pop(section, None)
+    else:
+        raise ValueError(f"Unknown journal operation: {op}")
+
+
+def read_journal(project_path: str) -> List[Dict[str, Any]]:
+    """
+    Читает операции журнала, если он относится к текущей версии файла проекта.
+
+    Оборванная последняя строка (сбой во время записи) отбрасывается.
+
+    Returns:
+        Список операций (пустой, если журнала нет или он устарел)
+    """
+    path = journal_path_for(project_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().split("\n")
+    except OSError:
+        return []
+
+    try:
+        header = json.loads(lines[0])
+    except (ValueError, IndexError):
+        return []
+    try:
+        base = _base_info(project_path)
+    except OSError:
+        return []
+    if header.get("journal") != JOURNAL_VERSION or header.get("base") != base:
+        print(f"Журнал изменений {path.name} относится к другой версии проекта и не будет применен")
+        return []
+
+    operations = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        try:
+            operations.append(json.loads(line))
+        except ValueError:
+            break
+    return operations
+
+
+def replay_journal(project_path: str, project_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Воспроизводит журнал поверх прочитанного проекта.
+
+    Returns:
+        Примененные операции
+    """
+    operations = read_journal(project_path)
+    if not operations:
+        return []
+    if project_data.get("data") is None:
+        project_data["data"] = {}
+    data = project_data["data"]
+    applied = []
+    for operation in operations:
+        try:
+            apply_operation(data, operation)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            print(f"Ошибка применения журнала изменений: {e}")
+            break
+        applied.append(operation)
+    return applied
+
+
+class EditJournal:
+
+    def __init__(self, fsync_interval: float = FSYNC_INTERVAL):
+        """
+        Журнал изменений открытого проекта.
+
+        Args:
+            fsync_interval: Максимальная задержка fsync после записи
+        """
+        self.fsync_interval = fsync_interval
+        self.path: Optional[Path] = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def start(self, project_path: str, operations: List[Dict[str, Any]] = None) -> None:
+        """
+        Начинает журнал для файла проекта.
+
+        Args:
+            project_path: Путь к сохраненному файлу проекта
+            operations: Уже примененные операции прежнего журнала (после воспроизведения)
+        """
+        path = journal_path_for(project_path)
+        # Журнал прежнего файла (например, после "Сохранить как") больше не нужен: иначе при
+        # открытии прежнего файла его изменения применились бы повторно
+        self.close(discard=self.path is not None and self.path != path)
+        lines = [json.dumps({"journal": JOURNAL_VERSION, "base": _base_info(project_path)})]
+        # Журнал переписывается целиком: оборванная строка после сбоя не должна остаться в середине
+        lines.extend(json.dumps(operation, ensure_ascii=False, separators=(",", ":"))
+                     for operation in operations or [])
+
+        atomic_write_bytes(path, ("\n".join(lines) + "\n").encode('utf-8'))
+        self._file = open(path, 'a', encoding='utf-8')
+        self.path = path
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._fsync_loop, name="edit-journal", daemon=True)
+            self._thread.start()
+
+    def append(self, command: Command, inverse: bool = False) -> None:
+        """Дописывает команду (вызывается в потоке интерфейса; fsync выполняется позже в фоне)"""
+        if self._file is None:
+            return
+        line = json.dumps(encode_command(command, inverse), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        self._dirty.set()
+
+    def close(self, discard: bool = False) -> None:
+        """
+        Закрывает журнал.
+
+        Args:
+            discard: Удалить файл журнала (изменения сохранены или отброшены)
+        """
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            if not discard:
+                file.flush()
+                os.fsync(file.fileno())
+            file.close()
+        if discard and self.path is not None:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Ошибка удаления журнала изменений: {e}")
+        self.path = None
+
+    def shutdown(self, discard: bool = False) -> None:
+        self.close(discard)
+        self._stop_event.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def _fsync_loop(self) -> None:
+        # Групповой fsync: все записи за интервал сбрасываются на диск одним вызовом
+        while not self._stop_event.is_set():
+            self._dirty.wait()
+            if self._stop_event.wait(self.fsync_interval):
+                return
+            self._dirty.clear()
+            with self._lock:
+                if self._file is None:
+                    continue
+                # Копия дескриптора: fsync идет без блокировки, и запись из потока интерфейса не ждет диска
+                fileno = os.dup(self._file.fileno())
+            try:
+                os.fsync(fileno)
+            except OSError as e:
+                print(f"Ошибка записи журнала изменений: {e}")
+            finally:
+                os.close(fileno)
@@ -0,0 +1,482 @@
+"""
+Каталог проектов в SQLite.
+
+Хранит сведения о файлах проектов в каталогах-корнях (имя, размер, время
+изменения, число блоков) и историю открытия. Каталог обновляется в
+фоновом потоке: полный обход корней, проверка изменившихся каталогов
+(по сигналам QFileSystemWatcher) и периодическая проверка stat известных
+файлов. Списки последних проектов и поиск читаются из индексов и не
+обращаются к файловой системе.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Файлы больше этого размера не разбираются ради числа блоков (для JSON без счетчиков)
+MAX_PARSE_BYTES = 64 * 1024 * 1024
+
+# Глубина обхода подкаталогов корня
+DEFAULT_SCAN_DEPTH = 2
+
+# Период полной проверки известных файлов
+DEFAULT_RESCAN_INTERVAL = 300.0
+
+PROJECT_SUFFIXES = (".json", ".pbp")
+
+# Признаки файла проекта в начале JSON файла
+_PROJECT_MARKERS = (b'"data"', b'"storage"', b'"version"')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    root TEXT,
+    size INTEGER,
+    mtime REAL,
+    block_count INTEGER,
+    missing INTEGER NOT NULL DEFAULT 0,
+    last_opened REAL,
+    open_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS projects_name_key ON projects(name_key);
+CREATE INDEX IF NOT EXISTS projects_last_opened ON projects(last_opened) WHERE last_opened IS NOT NULL;
+CREATE INDEX IF NOT EXISTS projects_root ON projects(root);
+"""
+
+
+def _name_key(name: str) -> str:
+    return name.casefold()
+
+
+def read_project_stats(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Определяет, является ли файл проектом, и читает число блоков.
+
+    Для двоичного контейнера и проекта частями число блоков берется из
+    заголовка или манифеста; обычный JSON разбирается целиком, если он не
+    слишком велик.
+
+    Returns:
+        {"block_count": int | None} или None если файл не проект
+    """
+    from .project_container import MAGIC, ProjectContainer
+    from .project_storage import ChunkedProjectStore
+
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(4096)
+    except OSError:
+        return None
+
+    if head.startswith(MAGIC):
+        try:
+            container = ProjectContainer(file_path)
+        except (OSError, ValueError):
+            return None
+        try:
+            return {"block_count": container.sections.get("blocks", {}).get("count")}
+        finally:
+            container.close()
+
+    if not head.lstrip().startswith(b"{") or not any(marker in head for marker in _PROJECT_MARKERS):
+        return None
+
+    try:
+        if os.path.getsize(file_path) > MAX_PARSE_BYTES:
+            return {"block_count": None}
+        with open(file_path, 'r', encoding='utf-8') as f:
+            raw_data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(raw_data, dict):
+        return None
+
+    if ChunkedProjectStore.is_manifest(raw_data):
+        blocks = raw_data["storage"].get("sections", {}).get("blocks", {})
+        return {"block_count": blocks.get("count")}
+
+    data = raw_data.get("data")
+    if not isinstance(data, dict):
+        return None
+    blocks = data.get("blocks")
+    return {"block_count": len(blocks) if isinstance(blocks, list) else 0}
+
+
+def count_blocks(project_data: Dict[str, Any]) -> Optional[int]:
+    """Число блоков проекта в памяти (без декодирования секций двоичного контейнера)"""
+    from .project_container import LazySections
+
+    data = project_data.get("data") if isinstance(project_data, dict) else None
+    if isinstance(data, LazySections) and "blocks" in data and not data.is_loaded("blocks"):
+        return data.stored_count("blocks")
+    blocks = data.get("blocks") if data is not None else None
+    return len(blocks) if isinstance(blocks, list) else 0
+
+
+class ProjectCatalog:
+
+    def __init__(self, db_path: str, roots: Iterable[str] = (), scan_depth: int = DEFAULT_SCAN_DEPTH):
+        """
+        Каталог проектов.
+
+        Args:
+            db_path: Файл базы SQLite
+            roots: Каталоги, в которых ищутся проекты
+            scan_depth: Глубина обхода подкаталогов
+        """
+        self.db_path = str(db_path)
+        self.roots: List[str] = [str(Path(root)) for root in roots]
+        self.scan_depth = scan_depth
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.has_fts = False
+        self._init_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        # У каждого потока свое соединение
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30.0)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _init_schema(self) -> None:
+        connection = self._connection()
+        with self._write_lock, connection:
+            connection.executescript(_SCHEMA)
+            try:
+                connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(name, folder)"
+                )
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite собран без FTS5 - поиск по подстроке через LIKE
+                self.has_fts = False
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def upsert(self, file_path: str, size: int, mtime: float, block_count: Optional[int],
+               root: str = None) -> None:
+        """Добавляет или обновляет сведения о файле проекта"""
+        path = str(Path(file_path))
+        name = Path(path).stem
+        connection = self._connection()
+        with self._write_lock, connection:
+            connection.execute(
+                "INSERT INTO projects (path, name, name_key, root, size, mtime, block_count, missing) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0) "
+                "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime, "
+                "block_count = excluded.block_count, missing = 0, "
+                "root = COALESCE(excluded.root, projects.root)",
+                (path, name, _name_key(name), root, size, mtime, block_count)
+            )
+            if self.has_fts:
+                # Строка полнотекстового индекса имеет тот же rowid, что и строка проекта
+                rowid = connection.execute("SELECT rowid FROM projects WHERE path = ?", (path,)).fetchone()[0]
+                connection.execute("DELETE FROM projects_fts WHERE rowid = ?", (rowid,))
+                connection.execute("INSERT INTO projects_fts (rowid, name, folder) VALUES (?, ?, ?)",
+                                   (rowid, name.replace("_", " "), Path(path).parent.name))
+
+    def mark_missing(self, paths: Iterable[str]) -> None:
+        """Отмечает удаленные файлы; открывавшиеся проекты остаются в истории до появления файла"""
+        paths = [(str(Path(path)),) for path in paths]
+        if not paths:
+            return
+        connection = self._connection()
+        with self._write_lock, connection:
+            if self.has_fts:
+                connection.executemany(
+                    "DELETE FROM projects_fts WHERE rowid IN (SELECT rowid FROM projects WHERE path = ?)", paths
+                )
+            connection.executemany("UPDATE projects SET missing = 1 WHERE path = ?", paths)
+            connection.executemany("DELETE FROM projects WHERE path = ? AND last_opened IS NULL", paths)
+
+    def record_open(self, file_path: str, block_count: Optional[int] = None) -> None:
+        """
+        Отмечает открытие или сохранение проекта (для списка последних).
+
+        Файл проекта не читается: число блоков передает вызывающий код,
+        у которого данные проекта уже в памяти.
+
+        Args:
+            file_path: Путь к файлу проекта
+            block_count: Число блоков (None - оставить известное значение)
+        """
+        path = str(Path(file_path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        if block_count is None:
+            known = self.get(path)
+            block_count = known["block_count"] if known is not None else None
+        self.upsert(path, stat.st_size, stat.st_mtime, block_count)
+
+        connection = self._connection()
+        with self._write_lock, connection:
+            connection.execute(
+                "UPDATE projects SET last_opened = ?, open_count = open_count + 1 WHERE path = ?",
+                (time.time(), path)
+            )
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT * FROM projects WHERE path = ?", (str(Path(file_path)),)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Последние открытые проекты, существующие на диске"""
+        rows = self._connection().execute(
+            "SELECT * FROM projects WHERE last_opened IS NOT NULL AND missing = 0 "
+            "ORDER BY last_opened DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def clear_recent(self) -> None:
+        connection = self._connection()
+        with self._write_lock, connection:
+            connection.execute("UPDATE projects SET last_opened = NULL, open_count = 0")
+            connection.execute("DELETE FROM projects WHERE missing = 1")
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Ищет проекты по имени.
+
+        Сначала идут проекты, имя которых начинается с запроса (по индексу),
+        затем совпадения по словам имени и каталога (FTS5, префиксы слов).
+        """
+        query = query.strip()
+        if not query:
+            return self.all_projects(limit)
+
+        connection = self._connection()
+        key = _name_key(query)
+        rows = connection.execute(
+            "SELECT * FROM projects WHERE missing = 0 AND name_key >= ? AND name_key < ? "
+            "ORDER BY last_opened IS NULL, last_opened DESC, name_key LIMIT ?",
+            (key, key + "\U0010ffff", limit)
+        ).fetchall()
+        results = [dict(row) for row in rows]
+        if len(results) >= limit:
+            return results
+
+        seen = {row["path"] for row in results}
+        if self.has_fts:
+            terms = [term.replace('"', '""') for term in query.replace("_", " ").split()]
+            match = " ".join(f'"{term}"*' for term in terms)
+            try:
+                rows = connection.execute(
+                    "SELECT p.* FROM projects_fts f JOIN projects p ON p.rowid = f.rowid "
+                    "WHERE projects_fts MATCH ? AND p.missing = 0 ORDER BY rank LIMIT ?",
+                    (match, limit)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+        else:
+            rows = connection.execute(
+                "SELECT * FROM projects WHERE missing = 0 AND name_key LIKE ? LIMIT ?",
+                (f"%{key}%", limit)
+            ).fetchall()
+
+        for row in rows:
+            if row["path"] not in seen and len(results) < limit:
+                seen.add(row["path"])
+                results.append(dict(row))
+        return results
+
+    def all_projects(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT * FROM projects WHERE missing = 0 ORDER BY last_opened IS NULL, last_opened DESC, "
+            "name_key LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM projects WHERE missing = 0").fetchone()[0]
+
+    def scan_directory(self, directory: str, root: str = None, depth: int = 0,
+                       cancel_event: threading.Event = None) -> List[str]:
+        """
+        Обновляет сведения о проектах в каталоге.
+
+        Файлы, размер и время изменения которых не изменились, не читаются.
+
+        Args:
+            directory: Каталог
+            root: Корень, к которому относится каталог
+            depth: Глубина обхода подкаталогов
+            cancel_event: Флаг остановки обхода
+
+        Returns:
+            Просмотренные подкаталоги (для наблюдения за ними)
+        """
+        directory = str(Path(directory))
+        known = {row["path"]: row for row in self._connection().execute(
+            "SELECT path, size, mtime FROM projects WHERE path >= ? AND path < ?",
+            (directory + os.sep, directory + os.sep + "\U0010ffff")
+        )}
+        seen = set()
+        subdirectories = [directory]
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            if cancel_event is not None and cancel_event.is_set():
+                return subdirectories
+            # Скрытые файлы (файлы восстановления, временные файлы) и каталоги частей пропускаются
+            if entry.name.startswith(".") or entry.name.endswith(".chunks"):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if depth > 0:
+                        subdirectories.extend(self.scan_directory(entry.path, root, depth - 1, cancel_event))
+                    continue
+                if not entry.name.lower().endswith(PROJECT_SUFFIXES):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            path = str(Path(entry.path))
+            row = known.get(path)
+            if row is not None and row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+                seen.add(path)
+                continue
+            project_stats = read_project_stats(path)
+            if project_stats is None:
+                continue
+            seen.add(path)
+            self.upsert(path, stat.st_size, stat.st_mtime, project_stats["block_count"], root or directory)
+
+        # Файлы только этого каталога (не подкаталогов), которых больше нет
+        removed = [path for path in known
+                   if path not in seen and str(Path(path).parent) == directory]
+        self.mark_missing(removed)
+        return subdirectories
+
+    def refresh_known(self, cancel_event: threading.Event = None) -> None:
+        """Проверяет stat всех известных файлов (в том числе вне корней)"""
+        rows = self._connection().execute("SELECT path, size, mtime, missing FROM projects").fetchall()
+        removed = []
+        for row in rows:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            try:
+                stat = os.stat(row["path"])
+            except OSError:
+                if not row["missing"]:
+                    removed.append(row["path"])
+                continue
+            if row["missing"] or stat.st_size != row["size"] or stat.st_mtime != row["mtime"]:
+                project_stats = read_project_stats(row["path"])
+                if project_stats is not None:
+                    self.upsert(row["path"], stat.st_size, stat.st_mtime, project_stats["block_count"])
+        self.mark_missing(removed)
+
+    def import_recent_list(self, recent_projects: List[Dict[str, str]]) -> None:
+        """Переносит прежний список последних проектов (старые записи - ниже)"""
+        now = time.time()
+        for position, project_info in enumerate(recent_projects):
+            path = project_info.get("path") if isinstance(project_info, dict) else project_info
+            if not path or not os.path.exists(path):
+                continue
+            project_stats = read_project_stats(path) or {"block_count": None}
+            self.record_open(path, project_stats["block_count"])
+            connection = self._connection()
+            with self._write_lock, connection:
+                connection.execute("UPDATE projects SET last_opened = ? WHERE path = ?",
+                                   (now - position, str(Path(path))))
+
+
+class CatalogScanner:
+
+    def __init__(self, catalog: ProjectCatalog, rescan_interval: float = DEFAULT_RESCAN_INTERVAL,
+                 on_changed: Callable[[List[str]], None] = None):
+        """
+        Фоновый поток обновления каталога.
+
+        Args:
+            catalog: Каталог проектов
+            rescan_interval: Период проверки stat всех известных файлов
+            on_changed: Вызывается из фонового потока после обхода со списком
+                просмотренных каталогов
+        """
+        self.catalog = catalog
+        self.rescan_interval = rescan_interval
+        self.on_changed = on_changed
+        self._condition = threading.Condition()
+        self._pending_dirs = set()
+        self._full_scan = True
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="project-catalog", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request_scan(self, directory: str = None) -> None:
+        """Запрашивает проверку каталога (None - всех корней)"""
+        with self._condition:
+            if directory is None:
+                self._full_scan = True
+            else:
+                self._pending_dirs.add(str(Path(directory)))
+            self._condition.notify()
+
+    def _run(self) -> None:
+        next_refresh = time.monotonic() + self.rescan_interval
+        while not self._stop_event.is_set():
+            with self._condition:
+                while (not self._full_scan and not self._pending_dirs and not self._stop_event.is_set()
+                       and time.monotonic() < next_refresh):
+                    self._condition.wait(max(0.0, next_refresh - time.monotonic()))
+                full_scan = self._full_scan
+                pending = self._pending_dirs
+                self._full_scan = False
+                self._pending_dirs = set()
+            if self._stop_event.is_set():
+                return
+
+            scanned = []
+            try:
+                if full_scan:
+                    for root in self.catalog.roots:
+                        scanned.extend(self.catalog.scan_directory(root, root, self.catalog.scan_depth,
+                                                                   self._stop_event))
+                for directory in pending:
+                    scanned.extend(self.catalog.scan_directory(directory, cancel_event=self._stop_event))
+                if time.monotonic() >= next_refresh:
+                    self.catalog.refresh_known(self._stop_event)
+                    next_refresh = time.monotonic() + self.rescan_interval
+            except sqlite3.Error as e:
+                print(f"Ошибка обновления каталога проектов: {e}")
+                continue
+
+            if self.on_changed is not None:
+                self.on_changed(scanned)
@@ -0,0 +1,325 @@
+"""
+Двоичный контейнер проекта (.pbp).
+
+Структура файла:
+    MAGIC (8 байт) | длина заголовка (uint32 LE) | заголовок JSON | секции
+
+Заголовок содержит метаданные проекта и индекс секций (ключ секции "data",
+кодек, смещение от начала секций, длина). При открытии читается только
+заголовок, файл отображается в память, а секции декодируются при первом
+обращении. Секции, к которым не обращались, при сохранении копируются
+без декодирования.
+
+Секции кодируются msgpack (если установлен), иначе компактным JSON.
+Данные проекта должны сохранять совместимость с JSON, чтобы файл можно было
+преобразовать в .json и обратно.
+
+Преобразование в JSON и обратно:
+    python -m src.core.project_container project.pbp project.json
+    python -m src.core.project_container project.json project.pbp
+"""
+import json
+import mmap
+import struct
+import sys
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Iterator
+
+from .project_storage import atomic_write_chunks
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MAGIC = b"PBPROJ\x00\x01"
+CONTAINER_SUFFIX = ".pbp"
+CONTAINER_VERSION = 1
+
+CODEC_MSGPACK = "msgpack"
+CODEC_JSON = "json"
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def is_container_file(file_path) -> bool:
+    """Проверяет сигнатуру файла (расширение не важно)"""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def is_container_path(file_path) -> bool:
+    """True если проект по этому пути нужно сохранять в двоичном формате"""
+    return Path(file_path).suffix.lower() == CONTAINER_SUFFIX
+
+
+def encode_section(value: Any, codec: str = None) -> Tuple[str, bytes]:
+    """
+    Кодирует значение секции.
+
+    Args:
+        value: Значение
+        codec: Кодек (если None, msgpack при наличии, иначе JSON)
+
+    Returns:
+        (кодек, байты)
+    """
+    if codec is None:
+        codec = CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+    if codec == CODEC_MSGPACK:
+        return codec, msgpack.packb(value, use_bin_type=True)
+    return CODEC_JSON, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def decode_section(buffer, codec: str) -> Any:
+    """
+    Декодирует секцию.
+
+    Raises:
+        ValueError: Если кодек неизвестен или msgpack не установлен
+    """
+    if codec == CODEC_JSON:
+        return json.loads(bytes(buffer).decode('utf-8'))
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Section is encoded with msgpack, install the msgpack package to read it")
+        return msgpack.unpackb(buffer, raw=False)
+    raise ValueError(f"Unknown section codec: {codec}")
+
+
+class ProjectContainer:
+
+    def __init__(self, file_path: str):
+        """
+        Открытый двоичный контейнер проекта.
+
+        Читает только заголовок; данные секций остаются в отображенном файле.
+
+        Args:
+            file_path: Путь к файлу контейнера
+
+        Raises:
+            ValueError: Если файл не является контейнером проекта
+        """
+        self.file_path = Path(file_path)
+        self._file = open(self.file_path, 'rb')
+        try:
+            self._read_header()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._data_size else None
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_header(self) -> None:
+        prefix = self._file.read(len(MAGIC) + _HEADER_LENGTH.size)
+        if len(prefix) < len(MAGIC) + _HEADER_LENGTH.size or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a project container: {self.file_path}")
+
+        header_length, = _HEADER_LENGTH.unpack_from(prefix, len(MAGIC))
+        header = json.loads(self._file.read(header_length).decode('utf-8'))
+        if header.get("version", 0) > CONTAINER_VERSION:
+            raise ValueError(f"Unsupported container version: {header.get('version')}")
+
+        self.meta: Dict[str, Any] = header.get("meta", {})
+        self.sections: Dict[str, Dict[str, Any]] = {entry["key"]: entry for entry in header.get("sections", [])}
+        self._data_offset = len(prefix) + header_length
+        self._data_size = sum(entry["length"] for entry in self.sections.values())
+
+    def raw_section(self, key: str) -> memoryview:
+        """Возвращает байты секции без копирования"""
+        entry = self.sections[key]
+        start = self._data_offset + entry["offset"]
+        if self._mmap is None:
+            return memoryview(b"")
+        return memoryview(self._mmap)[start:start + entry["length"]]
+
+    def decode(self, key: str) -> Any:
+        view = self.raw_section(key)
+        try:
+            return decode_section(view, self.sections[key]["codec"])
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Есть неосвобожденные memoryview; отображение закроется сборщиком мусора
+                pass
+            self._mmap = None
+        self._file.close()
+
+
+class LazySections(MutableMapping):
+
+    def __init__(self, container: ProjectContainer):
+        """
+        Секция "data" проекта, секции которой декодируются при первом обращении.
+
+        Args:
+            container: Открытый контейнер проекта
+        """
+        self._container = container
+        self._keys: List[str] = list(container.sections)
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        if key not in self._keys:
+            raise KeyError(key)
+        value = self._container.decode(key)
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._keys:
+            self._keys.append(key)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        self._keys.remove(key)
+        self._values.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._values
+
+    def stored_section(self, key: str) -> Tuple[str, memoryview]:
+        """Кодек и байты секции, к которой не обращались (для копирования при сохранении)"""
+        return self._container.sections[key]["codec"], self._container.raw_section(key)
+
+    def stored_count(self, key: str):
+        """Число элементов списка секции по заголовку (None если не список)"""
+        return self._container.sections[key].get("count")
+
+    def rebind(self, container: ProjectContainer) -> None:
+        """Переключает не декодированные секции на новый файл после сохранения"""
+        self._container = container
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self._keys}
+
+
+def read_container(file_path: str) -> Tuple[Dict[str, Any], ProjectContainer]:
+    """
+    Открывает контейнер проекта.
+
+    Returns:
+        (данные проекта с ленивой секцией "data", открытый контейнер)
+    """
+    container = ProjectContainer(file_path)
+    project_data = dict(container.meta)
+    project_data["data"] = LazySections(container)
+    return project_data, container
+
+
+def write_container(file_path: str, project_data: Dict[str, Any], codec: str = None,
+                    current: ProjectContainer = None) -> ProjectContainer:
+    """
+    Атомарно сохраняет проект в двоичный контейнер.
+
+    Args:
+        file_path: Путь к файлу
+        project_data: Данные проекта (обычные или из read_container)
+        codec: Кодек секций (если None, msgpack при наличии, иначе JSON)
+        current: Открытый контейнер по этому же пути (будет закрыт перед заменой файла)
+
+    Returns:
+        Открытый контейнер нового файла
+    """
+    data = project_data.get("data") or {}
+    meta = {k: v for k, v in project_data.items() if k != "data"}
+
+    entries = []
+    parts = []
+    offset = 0
+    for key in data:
+        if isinstance(data, LazySections) and not data.is_loaded(key):
+            section_codec, content = data.stored_section(key)
+            count = data.stored_count(key)
+        else:
+            value = data[key]
+            section_codec, content = encode_section(value, codec)
+            count = len(value) if isinstance(value, list) else None
+        entry = {"key": key, "codec": section_codec, "offset": offset, "length": len(content)}
+        # Число элементов списка позволяет узнать размер проекта по одному заголовку
+        if count is not None:
+            entry["count"] = count
+        entries.append(entry)
+        parts.append(content)
+        offset += len(content)
+
+    header = json.dumps({"version": CONTAINER_VERSION, "meta": meta, "sections": entries},
+                        ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+    def release_parts():
+        # Не декодированные секции - окна в отображение старого файла; пока они не
+        # освобождены, отображение нельзя закрыть (BufferError)
+        for part in parts:
+            if isinstance(part, memoryview):
+                part.release()
+
+    def close_current():
+        if current is not None and current.file_path.resolve() == Path(file_path).resolve():
+            # Не декодированные секции читаются из старого файла до этого момента
+            release_parts()
+            current.close()
+
+    atomic_write_chunks(file_path, [MAGIC, _HEADER_LENGTH.pack(len(header)), header] + parts,
+                        before_replace=close_current)
+    release_parts()
+
+    container = ProjectContainer(file_path)
+    if isinstance(data, LazySections):
+        data.rebind(container)
+    return container
+
+
+def to_plain(project_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Возвращает данные проекта с обычным словарем в секции "data" (для JSON)"""
+    data = project_data.get("data")
+    if not isinstance(data, LazySections):
+        return project_data
+    plain = dict(project_data)
+    plain["data"] = data.to_dict()
+    return plain
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Использование: python -m src.core.project_container <вход> <выход>", file=sys.stderr)
+        return 2
+
+    from .project_storage import read_project_file, atomic_write_json
+
+    source, target = argv
+    project_data, store = read_project_file(source)
+    if is_container_path(target):
+        write_container(target, project_data).close()
+    else:
+        atomic_write_json(target, to_plain(project_data), indent=2)
+    if isinstance(store, ProjectContainer):
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
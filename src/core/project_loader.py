@@ -0,0 +1,193 @@
+"""
+Потоковое чтение JSON файлов проекта.
+
+Файл читается частями; объекты и массивы верхних уровней разбираются по
+элементам, а сами элементы (блоки, соединения) - стандартным json. Между
+частями вызывается обратный вызов прогресса и проверяется флаг отмены,
+поэтому чтение можно выполнять в рабочем потоке и прервать в любой момент.
+"""
+import codecs
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List
+
+
+# Размер части файла, читаемой за один раз
+READ_CHUNK_BYTES = 1 << 20
+
+# Объекты и массивы на глубине меньше этой разбираются по элементам:
+# проект -> секция "data" -> списки блоков и соединений
+SPLIT_DEPTH = 3
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Символы, которыми может продолжаться число JSON
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+
+
+class LoadCancelled(Exception):
+    """Чтение проекта отменено"""
+
+
+class StreamingJsonLoader:
+
+    def __init__(self, file_path: str, on_progress: Callable[[int, int], None] = None,
+                 cancel_event: threading.Event = None, chunk_size: int = READ_CHUNK_BYTES):
+        """
+        Читает JSON файл частями.
+
+        Args:
+            file_path: Путь к файлу
+            on_progress: Вызывается после чтения каждой части с (прочитано байт, размер файла)
+            cancel_event: Установленный флаг прерывает чтение исключением LoadCancelled
+            chunk_size: Размер части в байтах
+        """
+        self.file_path = file_path
+        self.on_progress = on_progress
+        self.cancel_event = cancel_event
+        self.chunk_size = chunk_size
+
+        self.total_bytes = 0
+        self.bytes_read = 0
+        self._file = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def load(self) -> Any:
+        """
+        Returns:
+            Разобранные данные (как json.load)
+
+        Raises:
+            LoadCancelled: Если чтение отменено
+            ValueError: Если файл поврежден
+            OSError: Если файл не удалось прочитать
+        """
+        self.total_bytes = os.path.getsize(self.file_path)
+        with open(self.file_path, 'rb') as f:
+            self._file = f
+            try:
+                value = self._parse_value(0)
+                self._skip_whitespace()
+                if self._pos < len(self._buffer):
+                    raise self._error("Extra data")
+                return value
+            finally:
+                self._file = None
+
+    def _read_more(self, size: int = None) -> bool:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise LoadCancelled()
+        if self._eof:
+            return False
+
+        chunk = self._file.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+
+        self.bytes_read += len(chunk)
+        # Разобранная часть буфера больше не нужна
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += self._decoder.decode(chunk)
+        if self.on_progress is not None:
+            self.on_progress(self.bytes_read, self.total_bytes)
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._read_more():
+                return
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise self._error("Unexpected end of file")
+        return self._buffer[self._pos]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _parse_value(self, depth: int) -> Any:
+        char = self._peek()
+        if depth < SPLIT_DEPTH and char == '{':
+            return self._parse_object(depth)
+        if depth < SPLIT_DEPTH and char == '[':
+            return self._parse_array(depth)
+        return self._parse_leaf()
+
+    def _parse_object(self, depth: int) -> Dict[str, Any]:
+        self._pos += 1
+        result = {}
+        if self._peek() == '}':
+            self._pos += 1
+            return result
+        while True:
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self._parse_leaf()
+            self._expect(':')
+            result[key] = self._parse_value(depth + 1)
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return result
+            if char != ',':
+                raise self._error("Expecting ',' delimiter")
+
+    def _parse_array(self, depth: int) -> List[Any]:
+        self._pos += 1
+        result = []
+        if self._peek() == ']':
+            self._pos += 1
+            return result
+        while True:
+            result.append(self._parse_value(depth + 1))
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return result
+            if char != ',':
+                raise self._error("Expecting ',' delimiter")
+
+    def _parse_leaf(self) -> Any:
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Значение обрезано концом буфера - дочитываем и разбираем заново;
+                # размер дочитываемой части растет, чтобы большие значения не разбирались много раз
+                if not self._read_more(size):
+                    raise
+                size *= 2
+                continue
+            # Число на границе буфера может продолжаться в следующей части,
+            # в том числе после уже прочитанных '.', 'e' или знака порядка
+            if (isinstance(value, (int, float)) and not isinstance(value, bool) and not self._eof
+                    and _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)):
+                self._read_more(size)
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+
+def load_json_streaming(file_path: str, on_progress: Callable[[int, int], None] = None,
+                        cancel_event: threading.Event = None) -> Any:
+    """Читает JSON файл частями (см. StreamingJsonLoader)"""
+    return StreamingJsonLoader(file_path, on_progress, cancel_event).load()
@@ -1,7 +1,13 @@
 import os
 import json
+import shutil
 from pathlib import Path
 from typing import List, Dict, Any
+from .project_storage import ChunkedProjectStore, atomic_write_json, read_project_file
+from .project_container import ProjectContainer, is_container_path, write_container, to_plain
+from .edit_history import _EDIT_HISTORY
+from .edit_journal import EditJournal, journal_path_for, replay_journal
+from .blob_store import BlobStore, blobs_dir_for, blob_ref, iter_blob_refs
 
 
 class ProjectManager:
@@ -10,7 +16,19 @@ class ProjectManager:
         self.projects_dir = Path.home() / "Downloads"
         config_dir = Path(__file__).parent.parent / "config"
         self.recent_projects_file = config_dir / "recent_projects.json"
-        self.max_recent_files = 5
+        self.catalog_file = config_dir / "project_catalog.db"
+        # Блобы проекта, который еще не сохранен
+        self.staging_blobs_dir = config_dir / "blobs" / "untitled.blobs"
+        self.max_recent_files = 10
+        self._catalog = None
+        self._journal = EditJournal()
+        self._blob_store: BlobStore = None
+        # Ссылки на блобы могли исчезнуть (правки или новые блобы после прошлой сборки мусора)
+        self._blob_gc_needed = False
+        _EDIT_HISTORY.add_listener(self._on_history_command)
+        self.current_project_data: Dict[str, Any] = None
+        # ChunkedProjectStore, ProjectContainer или None для обычного JSON
+        self._store = None
         self._ensure_projects_directory()
     
     def _ensure_projects_directory(self) -> None:
@@ -38,7 +56,7 @@ class ProjectManager:
             else:
                 default_name = project_name
         
-        if not default_name.endswith('.json'):
+        if Path(default_name).suffix.lower() not in ('.json', '.pbp'):
             default_name += '.json'
         
         default_path = str(self.projects_dir / default_name)
@@ -46,7 +64,7 @@ class ProjectManager:
             parent_widget,
             "Сохранить проект",
             default_path,
-            "JSON файлы (*.json);;Все файлы (*)"
+            "JSON файлы (*.json);;Двоичные проекты (*.pbp);;Все файлы (*)"
         )
         return file_path
     
@@ -66,7 +84,7 @@ class ProjectManager:
             parent_widget,
             "Открыть проект",
             str(self.projects_dir),
-            "JSON файлы (*.json);;Все файлы (*)"
+            "Проекты (*.json *.pbp);;JSON файлы (*.json);;Двоичные проекты (*.pbp);;Все файлы (*)"
         )
         return file_path
     
@@ -85,13 +103,18 @@ class ProjectManager:
             True если проект успешно сохранен
         """
         if project_data is None:
-            project_data = self._create_default_project_data()
+            project_data = self.get_current_project_data()
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(project_data, f, ensure_ascii=False, indent=2)
+            self._save_blobs(file_path, project_data)
+            self._write_project(file_path, project_data)
+            # Блобы без ссылок удаляются только после записи файла, который на них больше не ссылается
+            self._collect_blob_garbage(file_path, project_data)
+            # Сохраненный файл - новая основа журнала изменений
+            self._start_journal(file_path)
             
-            self.add_recent_project(file_path)
+            self.current_project_data = project_data
+            self.add_recent_project(file_path, project_data)
             self._update_title_manager_save(file_path)
             print(f"Проект сохранен: {Path(file_path).name}")
             return True
@@ -116,17 +139,279 @@ class ProjectManager:
             return False
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                project_data = json.load(f)
-            
-            self.add_recent_project(file_path)
-            self._update_title_manager_open(file_path)
-            print(f"Проект открыт: {Path(file_path).name}")
-            return True
-            
+            project_data, store = read_project_file(file_path)
         except Exception as e:
             print(f"Ошибка открытия проекта: {str(e)}")
             return False
+        
+        self.apply_loaded_project(file_path, project_data, store)
+        return True
+    
+    def apply_loaded_project(self, file_path: str, project_data: Dict[str, Any], store=None) -> None:
+        """
+        Делает прочитанный проект текущим (для чтения в фоновом потоке).
+        
+        Args:
+            file_path: Путь к файлу проекта
+            project_data: Данные проекта (из read_project_file)
+            store: Хранилище проекта (из read_project_file)
+        """
+        # Журнал этого же файла из текущего сеанса хранит изменения, от которых пользователь
+        # отказался, открывая файл заново; воспроизводится только журнал, оставшийся после сбоя
+        if self._journal.path is not None and self._journal.path.resolve() == journal_path_for(file_path).resolve():
+            self._journal.close(discard=True)
+        # Изменения, не сохраненные до сбоя, применяются поверх файла
+        operations = replay_journal(file_path, project_data)
+        self._journal.close(discard=True)
+        self._start_journal(file_path, operations)
+        
+        self._close_store()
+        self._close_blob_store()
+        self._store = store
+        self.current_project_data = project_data
+        self.add_recent_project(file_path, project_data)
+        self._update_title_manager_open(file_path)
+        print(f"Проект открыт: {Path(file_path).name}")
+        
+        if operations:
+            from .title_manager import _TITLE_MANAGER
+            print(f"Восстановлено изменений из журнала: {len(operations)}")
+            _TITLE_MANAGER.set_modified(True)
+    
+    def restore_recovery(self, recovery_path: str, project_path: str = None) -> bool:
+        """
+        Делает автосохраненную копию текущим проектом с несохраненными изменениями.
+        
+        Args:
+            recovery_path: Файл восстановления (из find_recovery)
+            project_path: Файл проекта, к которому относится копия (None - не сохраненный проект)
+            
+        Returns:
+            True если копия прочитана и применена
+        """
+        from .autosave import AUTOSAVE_META_KEY
+        from .title_manager import _TITLE_MANAGER
+        
+        try:
+            project_data = self.load_project_data(str(recovery_path))
+        except (OSError, ValueError) as e:
+            print(f"Ошибка чтения автосохраненной копии: {e}")
+            return False
+        project_data.pop(AUTOSAVE_META_KEY, None)
+        
+        # Копия новее файла: журнал изменений файла больше не описывает текущее состояние,
+        # до следующего сохранения состояние защищает автосохранение
+        self._journal.close(discard=True)
+        self._close_store()
+        self._close_blob_store()
+        self.current_project_data = project_data
+        if project_path:
+            _TITLE_MANAGER.open_project(project_path)
+        else:
+            _TITLE_MANAGER.new_project()
+        _TITLE_MANAGER.set_modified(True)
+        print(f"Проект восстановлен из автосохраненной копии: {Path(recovery_path).name}")
+        return True
+    
+    @staticmethod
+    def load_project_data(file_path: str) -> Dict[str, Any]:
+        """
+        Читает данные проекта из файла без изменения состояния приложения.
+        
+        Args:
+            file_path: Путь к файлу проекта
+            
+        Returns:
+            Данные проекта
+            
+        Raises:
+            OSError: Если файл не удалось прочитать
+            ValueError: Если файл поврежден
+        """
+        project_data, store = read_project_file(file_path)
+        if isinstance(store, ProjectContainer):
+            project_data = to_plain(project_data)
+            store.close()
+        return project_data
+    
+    def mark_section_modified(self, section: str = None) -> None:
+        """
+        Отмечает секцию данных проекта, измененную на месте.
+        
+        Сохранение большого проекта переписывает только части, объекты
+        которых были заменены; изменение существующего объекта без замены
+        нужно отметить этим методом.
+        
+        Args:
+            section: Ключ в секции "data" (например, "blocks"); None - весь проект
+        """
+        # Секции двоичного контейнера, к которым обращались, перекодируются при каждом сохранении
+        if isinstance(self._store, ChunkedProjectStore):
+            self._store.mark_dirty(section)
+    
+    def new_project(self) -> None:
+        """Сбрасывает данные текущего проекта"""
+        self.current_project_data = None
+        self._journal.close(discard=True)
+        self._close_store()
+        self._close_blob_store()
+    
+    def discard_journal(self) -> None:
+        """Удаляет журнал изменений: пользователь отказался от несохраненных изменений"""
+        self._journal.close(discard=True)
+    
+    def close_journal(self, discard: bool = True) -> None:
+        """
+        Закрывает журнал изменений (при закрытии приложения).
+        
+        Args:
+            discard: Удалить журнал - изменения сохранены или отброшены пользователем
+        """
+        self._journal.shutdown(discard)
+        self._close_blob_store()
+    
+    def _start_journal(self, file_path: str, operations: List[Dict[str, Any]] = None) -> None:
+        try:
+            self._journal.start(file_path, operations)
+        except OSError as e:
+            print(f"Ошибка создания журнала изменений: {e}")
+    
+    def _on_history_command(self, command, action: str) -> None:
+        self._blob_gc_needed = True
+        # Отмена записывается как обратная операция, поэтому журнал воспроизводится только вперед
+        try:
+            self._journal.append(command, inverse=action == "undo")
+        except (OSError, ValueError) as e:
+            print(f"Ошибка записи журнала изменений: {e}")
+    
+    def put_blob(self, content: bytes) -> str:
+        """
+        Сохраняет большие данные (снимок страницы, ответ, скриншот) в хранилище
+        блобов проекта. Одинаковые данные хранятся один раз.
+        
+        Args:
+            content: Данные
+            
+        Returns:
+            Ссылка на блоб для хранения в данных проекта
+        """
+        digest = self.get_blob_store().put(content)
+        self._blob_gc_needed = True
+        return blob_ref(digest)
+    
+    def get_blob(self, ref: str) -> bytes:
+        """
+        Читает данные по ссылке из put_blob.
+        
+        Raises:
+            KeyError: Если блоба нет в хранилище
+        """
+        return self.get_blob_store().get(ref)
+    
+    def get_blob_store(self) -> BlobStore:
+        """Хранилище блобов текущего проекта (до первого сохранения - во временном каталоге)"""
+        if self._blob_store is None:
+            from .title_manager import _TITLE_MANAGER
+            project_path = _TITLE_MANAGER.get_project_path()
+            directory = blobs_dir_for(project_path) if project_path else self.staging_blobs_dir
+            self._blob_store = BlobStore(directory)
+        return self._blob_store
+    
+    def _save_blobs(self, file_path: str, project_data: Dict[str, Any]) -> None:
+        # Блобы должны быть на диске раньше файла проекта, который на них ссылается
+        store = self._blob_store
+        if store is None:
+            return
+        target_dir = blobs_dir_for(file_path)
+        if store.directory != target_dir:
+            # "Сохранить как" - в новый каталог копируются только блобы, на которые есть ссылки
+            target = BlobStore(target_dir)
+            store.copy_to(target, iter_blob_refs(project_data))
+            store.close()
+            if store.directory == self.staging_blobs_dir:
+                shutil.rmtree(store.directory, ignore_errors=True)
+            self._blob_store = store = target
+            self._blob_gc_needed = False
+        store.flush()
+    
+    def _collect_blob_garbage(self, file_path: str, project_data: Dict[str, Any]) -> None:
+        if not self._blob_gc_needed:
+            return
+        self._blob_gc_needed = False
+        store = self._blob_store
+        if store is None:
+            directory = blobs_dir_for(file_path)
+            if not directory.is_dir():
+                return
+            store = self._blob_store = BlobStore(directory)
+        # Блобы, на которые ссылается история, нужны для отмены и повтора после сохранения
+        referenced = set(iter_blob_refs(project_data))
+        referenced.update(iter_blob_refs(_EDIT_HISTORY.held_values()))
+        try:
+            freed = store.collect_garbage(referenced)
+        except OSError as e:
+            print(f"Ошибка сборки мусора в хранилище блобов: {e}")
+            return
+        if freed:
+            print(f"Хранилище блобов: освобождено {freed // 1024} КБ")
+    
+    def _close_blob_store(self) -> None:
+        if self._blob_store is not None:
+            self._blob_store.close()
+        self._blob_store = None
+        self._blob_gc_needed = False
+    
+    def _close_store(self) -> None:
+        if isinstance(self._store, ProjectContainer):
+            self._store.close()
+        self._store = None
+    
+    def _write_project(self, file_path: str, project_data: Dict[str, Any]) -> None:
+        """
+        Атомарно записывает проект: файлы .pbp - двоичным контейнером, большие
+        проекты - частями, остальные - одним JSON файлом.
+        
+        Args:
+            file_path: Путь к файлу проекта
+            project_data: Данные проекта
+        """
+        if is_container_path(file_path):
+            current = self._store if isinstance(self._store, ProjectContainer) else None
+            container = write_container(file_path, project_data, current=current)
+            if current is not None and current is not container:
+                current.close()
+            self._store = container
+            return
+        
+        # Не прочитанные секции контейнера декодируются перед записью в JSON
+        project_data = to_plain(project_data)
+        if isinstance(self._store, ProjectContainer):
+            self._close_store()
+        
+        store = self._store
+        if store is not None and store.file_path != Path(file_path):
+            # "Сохранить как" - части пишутся в каталог нового файла
+            store = None
+        
+        if store is None and ChunkedProjectStore.should_use(project_data):
+            store = ChunkedProjectStore(file_path)
+        
+        if store is not None:
+            store.save(project_data)
+        else:
+            atomic_write_json(file_path, project_data, indent=2)
+        self._store = store
+    
+    def get_current_project_data(self) -> Dict[str, Any]:
+        """
+        Возвращает данные открытого проекта.
+        
+        Returns:
+            Данные проекта или шаблон, если проект еще не открыт и не сохранен
+        """
+        if self.current_project_data is None:
+            self.current_project_data = self._create_default_project_data()
+        return self.current_project_data
     
     def _create_default_project_data(self) -> Dict[str, Any]:
         """
@@ -147,41 +432,70 @@ class ProjectManager:
         }
     
     
-    def add_recent_project(self, file_path: str) -> None:
+    @property
+    def catalog(self):
+        """
+        Каталог проектов (создается при первом обращении).
+        
+        При первом создании переносит прежний список последних проектов.
+        """
+        if self._catalog is None:
+            from .project_catalog import ProjectCatalog
+            from .app_settings_manager import _APP_SETTINGS
+            
+            roots = [str(self.projects_dir)] + list(_APP_SETTINGS.get_setting("project_roots", []))
+            is_new = not self.catalog_file.exists()
+            self._catalog = ProjectCatalog(self.catalog_file, roots)
+            if is_new and self.recent_projects_file.exists():
+                self._import_recent_projects()
+        return self._catalog
+    
+    def add_recent_project(self, file_path: str, project_data: Dict[str, Any] = None) -> None:
         """
         Добавляет проект в список последних.
         
         Args:
             file_path: Путь к файлу проекта
+            project_data: Данные проекта (для числа блоков в каталоге)
         """
-        if not file_path or not os.path.exists(file_path):
+        if not file_path:
             return
         
-        recent_projects = self.get_recent_projects()
-        project_info = self._create_project_info(file_path)
-        
-        recent_projects = [p for p in recent_projects if p.get("path") != file_path]
-        recent_projects.insert(0, project_info)
-        recent_projects = recent_projects[:self.max_recent_files]
-        self._save_recent_projects(recent_projects)
+        from .project_catalog import count_blocks
+        block_count = count_blocks(project_data) if project_data is not None else None
+        try:
+            self.catalog.record_open(file_path, block_count)
+        except Exception as e:
+            print(f"Ошибка обновления каталога проектов: {e}")
     
-    def get_recent_projects(self) -> List[Dict[str, str]]:
+    def get_recent_projects(self) -> List[Dict[str, Any]]:
         """
-        Получает список последних проектов.
+        Получает список последних проектов из каталога (без обращения к файлам).
         
         Returns:
             Список словарей с информацией о проектах
         """
-        if not self.recent_projects_file.exists():
+        try:
+            return self.catalog.recent(self.max_recent_files)
+        except Exception as e:
+            print(f"Ошибка чтения каталога проектов: {e}")
             return []
+    
+    def search_projects(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Ищет проекты в каталоге по началу имени и словам имени.
         
-        try:
-            with open(self.recent_projects_file, 'r', encoding='utf-8') as f:
-                recent_projects = json.load(f)
-            
-            return self._filter_existing_projects(recent_projects)
+        Args:
+            query: Строка поиска
+            limit: Максимальное число результатов
             
-        except (json.JSONDecodeError, IOError):
+        Returns:
+            Список словарей с информацией о проектах
+        """
+        try:
+            return self.catalog.search(query, limit)
+        except Exception as e:
+            print(f"Ошибка поиска проектов: {e}")
             return []
     
     def get_recent_project_name(self, project_info: Dict[str, str]) -> str:
@@ -198,58 +512,17 @@ class ProjectManager:
     
     def clear_recent_projects(self) -> None:
         """Очищает список последних проектов."""
-        if self.recent_projects_file.exists():
-            self.recent_projects_file.unlink()
-    
-    def _create_project_info(self, file_path: str) -> Dict[str, str]:
-        """
-        Создает информацию о проекте.
-        
-        Args:
-            file_path: Путь к файлу проекта
-            
-        Returns:
-            Словарь с информацией о проекте
-        """
-        return {
-            "name": Path(file_path).stem,
-            "path": file_path
-        }
-    
-    def _filter_existing_projects(self, recent_projects: List) -> List[Dict[str, str]]:
-        """
-        Фильтрует список проектов, оставляя только существующие файлы.
-        
-        Args:
-            recent_projects: Список проектов из JSON
-            
-        Returns:
-            Отфильтрованный список существующих проектов
-        """
-        existing_projects = []
-        
-        for project_info in recent_projects:
-            if isinstance(project_info, dict) and os.path.exists(project_info.get("path", "")):
-                existing_projects.append(project_info)
-            elif isinstance(project_info, str) and os.path.exists(project_info):
-                existing_projects.append(self._create_project_info(project_info))
-        
-        return existing_projects
+        self.catalog.clear_recent()
     
-    def _save_recent_projects(self, recent_projects: List[Dict[str, str]]) -> None:
-        """
-        Сохраняет список последних проектов в JSON файл.
-        
-        Args:
-            recent_projects: Список словарей с информацией о проектах
-        """
+    def _import_recent_projects(self) -> None:
+        """Переносит список последних проектов из recent_projects.json в каталог"""
         try:
-            self.recent_projects_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.recent_projects_file, 'w', encoding='utf-8') as f:
-                json.dump(recent_projects, f, ensure_ascii=False, indent=2)
-        except IOError as e:
-            print(f"Ошибка сохранения списка последних проектов: {e}")
+            with open(self.recent_projects_file, 'r', encoding='utf-8') as f:
+                recent_projects = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        if isinstance(recent_projects, list):
+            self._catalog.import_recent_list(recent_projects)
     
     
     def _update_title_manager_save(self, file_path: str) -> None:
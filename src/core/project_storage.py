@@ -0,0 +1,340 @@
+import hashlib
+import json
+import operator
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Callable
+
+
+# Списки секции "data", которые делятся на части при сохранении
+CHUNKED_LISTS = ("blocks", "connections")
+
+# Число элементов списка в одной части
+CHUNK_ITEMS = 512
+
+# Проект меньше этого числа элементов сохраняется обычным JSON файлом
+CHUNKED_MIN_ITEMS = 2048
+
+STORAGE_FORMAT = "chunked-v1"
+
+
+def atomic_write_bytes(file_path, content: bytes) -> None:
+    """
+    Атомарно записывает файл: временный файл в том же каталоге, fsync, rename.
+
+    При сбое во время записи на диске остается либо старая, либо новая версия
+    файла целиком.
+
+    Args:
+        file_path: Путь к файлу
+        content: Содержимое
+    """
+    atomic_write_chunks(file_path, [content])
+
+
+def atomic_write_chunks(file_path, chunks: Iterable[bytes],
+                        before_replace: Callable[[], None] = None) -> None:
+    """
+    Атомарно записывает файл из последовательности частей (без сборки в памяти).
+
+    Args:
+        file_path: Путь к файлу
+        chunks: Части содержимого
+        before_replace: Вызывается перед заменой файла (например, чтобы закрыть
+            отображение старого файла в память, иначе Windows не даст его заменить)
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        if before_replace is not None:
+            before_replace()
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(path.parent)
+
+
+def atomic_write_json(file_path, data: Any, indent: int = None) -> None:
+    """Атомарно записывает данные в JSON файл"""
+    separators = None if indent else (",", ":")
+    content = json.dumps(data, ensure_ascii=False, indent=indent, separators=separators)
+    atomic_write_bytes(file_path, content.encode('utf-8'))
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Запись о переименовании хранится в каталоге; на Windows каталог открыть нельзя
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _CachedChunk:
+
+    __slots__ = ("items", "name")
+
+    def __init__(self, items: List[Any], name: str):
+        # Ссылки на сами объекты: часть не изменилась, если в ней те же объекты
+        self.items = items
+        self.name = name
+
+
+class ChunkedProjectStore:
+
+    def __init__(self, file_path: str):
+        """
+        Хранилище проекта из манифеста и частей в каталоге <имя>.chunks.
+
+        Манифест содержит метаданные проекта и списки частей; части
+        именуются по хешу содержимого. При сохранении часть, элементы
+        которой не заменялись (те же объекты), не сериализуется повторно.
+        Изменение элемента на месте нужно отметить через mark_dirty.
+
+        Args:
+            file_path: Путь к файлу манифеста проекта
+        """
+        self.file_path = Path(file_path)
+        self.chunks_dir = self.file_path.with_name(self.file_path.stem + ".chunks")
+        self._cache: Dict[Tuple[str, int], _CachedChunk] = {}
+        self._sections: Dict[str, _CachedChunk] = {}
+        self._dirty = set()
+        self._has_garbage = True
+        self.last_written_chunks = 0
+
+    @staticmethod
+    def should_use(project_data: Dict[str, Any]) -> bool:
+        """True если проект достаточно велик для хранения частями"""
+        data = project_data.get("data")
+        if not isinstance(data, dict):
+            return False
+        total = sum(len(data.get(key) or []) for key in CHUNKED_LISTS if isinstance(data.get(key), list))
+        return total >= CHUNKED_MIN_ITEMS
+
+    @staticmethod
+    def is_manifest(raw_data: Dict[str, Any]) -> bool:
+        storage = raw_data.get("storage")
+        return isinstance(storage, dict) and storage.get("format") == STORAGE_FORMAT
+
+    def mark_dirty(self, section: str = None) -> None:
+        """
+        Отмечает секцию данных проекта как измененную на месте.
+
+        Args:
+            section: Ключ секции (например, "blocks"); None - все секции
+        """
+        if section is None:
+            self._cache.clear()
+            self._sections.clear()
+        else:
+            self._dirty.add(section)
+
+    def save(self, project_data: Dict[str, Any]) -> None:
+        """
+        Сохраняет проект: записывает только измененные части, затем манифест.
+
+        Args:
+            project_data: Данные проекта
+        """
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        self.last_written_chunks = 0
+
+        data = project_data.get("data") or {}
+        sections = {}
+        for key, value in data.items():
+            if key in CHUNKED_LISTS and isinstance(value, list):
+                # Число элементов позволяет каталогу проектов не читать части
+                sections[key] = {"chunks": self._save_list(key, value), "count": len(value)}
+            else:
+                sections[key] = {"chunk": self._save_section(key, value)}
+
+        # Части удаленных секций больше не нужны
+        for key, _ in list(self._cache):
+            if key not in data:
+                self._drop_list_cache(key)
+        for key in list(self._sections):
+            if key not in data:
+                del self._sections[key]
+                self._has_garbage = True
+        self._dirty.clear()
+
+        manifest = {k: v for k, v in project_data.items() if k != "data"}
+        manifest["storage"] = {
+            "format": STORAGE_FORMAT,
+            "chunks_dir": self.chunks_dir.name,
+            "sections": sections
+        }
+        atomic_write_json(self.file_path, manifest, indent=2)
+
+        # Старые части появляются только при замене или удалении частей
+        if self._has_garbage:
+            self._collect_garbage(sections)
+            self._has_garbage = False
+
+    def load(self, manifest: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Собирает проект из манифеста и частей.
+
+        Загруженные части запоминаются, поэтому следующее сохранение
+        перезапишет только то, что изменилось после открытия.
+
+        Args:
+            manifest: Уже прочитанный манифест (если None, читается из файла)
+
+        Returns:
+            Данные проекта в обычном виде (как в JSON файле)
+
+        Raises:
+            OSError: Если часть не найдена
+            ValueError: Если манифест или часть повреждены
+        """
+        if manifest is None:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+
+        storage = manifest.get("storage", {})
+        self.chunks_dir = self.file_path.parent / storage.get("chunks_dir", self.chunks_dir.name)
+        self._cache.clear()
+        self._sections.clear()
+
+        data = {}
+        for key, section in storage.get("sections", {}).items():
+            if "chunks" in section:
+                items = []
+                for index, name in enumerate(section["chunks"]):
+                    chunk_items = self._read_chunk(name)
+                    self._cache[(key, index)] = _CachedChunk(chunk_items, name)
+                    items.extend(chunk_items)
+                data[key] = items
+            else:
+                value = self._read_chunk(section["chunk"])
+                self._sections[key] = _CachedChunk([value], section["chunk"])
+                data[key] = value
+
+        project_data = {k: v for k, v in manifest.items() if k != "storage"}
+        project_data["data"] = data
+        return project_data
+
+    def _save_list(self, key: str, items: List[Any]) -> List[str]:
+        names = []
+        chunk_count = (len(items) + CHUNK_ITEMS - 1) // CHUNK_ITEMS
+        dirty = key in self._dirty
+
+        for index in range(chunk_count):
+            chunk_items = items[index * CHUNK_ITEMS:(index + 1) * CHUNK_ITEMS]
+            cached = self._cache.get((key, index))
+            if (not dirty and cached is not None and len(cached.items) == len(chunk_items)
+                    and all(map(operator.is_, cached.items, chunk_items))):
+                names.append(cached.name)
+                continue
+
+            name = self._write_chunk(chunk_items)
+            if cached is not None and cached.name != name:
+                self._has_garbage = True
+            self._cache[(key, index)] = _CachedChunk(chunk_items, name)
+            names.append(name)
+
+        # Список стал короче - лишние части из кэша удаляются
+        index = chunk_count
+        while (key, index) in self._cache:
+            del self._cache[(key, index)]
+            self._has_garbage = True
+            index += 1
+        return names
+
+    def _save_section(self, key: str, value: Any) -> str:
+        cached = self._sections.get(key)
+        if cached is not None and key not in self._dirty and cached.items[0] is value:
+            return cached.name
+        name = self._write_chunk(value)
+        if cached is not None and cached.name != name:
+            self._has_garbage = True
+        self._sections[key] = _CachedChunk([value], name)
+        return name
+
+    def _drop_list_cache(self, key: str) -> None:
+        for cache_key in [k for k in self._cache if k[0] == key]:
+            del self._cache[cache_key]
+            self._has_garbage = True
+
+    def _write_chunk(self, value: Any) -> str:
+        content = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        name = hashlib.sha1(content).hexdigest() + ".json"
+        path = self.chunks_dir / name
+        # Части адресуются по содержимому: существующий файл уже содержит те же данные
+        if not path.exists():
+            atomic_write_bytes(path, content)
+            self.last_written_chunks += 1
+        return name
+
+    def _read_chunk(self, name: str) -> Any:
+        with open(self.chunks_dir / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _collect_garbage(self, sections: Dict[str, Any]) -> None:
+        referenced = set()
+        for section in sections.values():
+            referenced.update(section.get("chunks", []))
+            if "chunk" in section:
+                referenced.add(section["chunk"])
+
+        # Временные файлы остаются только после сбоя во время записи
+        for path in list(self.chunks_dir.glob("*.json")) + list(self.chunks_dir.glob(".*.tmp")):
+            if path.name not in referenced:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+def read_project_file(file_path: str, on_progress: Callable[[int, int], None] = None,
+                      cancel_event=None) -> Tuple[Dict[str, Any], Optional[Any]]:
+    """
+    Читает проект в обычном, частичном или двоичном формате.
+
+    Args:
+        file_path: Путь к файлу проекта
+        on_progress: Если задан, JSON читается частями с вызовом (прочитано байт, размер файла)
+        cancel_event: threading.Event, прерывающий потоковое чтение (LoadCancelled)
+
+    Returns:
+        (данные проекта, хранилище: ChunkedProjectStore, ProjectContainer
+        или None для обычного JSON)
+    """
+    from .project_container import is_container_file, read_container
+
+    if is_container_file(file_path):
+        return read_container(file_path)
+
+    if on_progress is not None or cancel_event is not None:
+        from .project_loader import load_json_streaming
+        raw_data = load_json_streaming(file_path, on_progress, cancel_event)
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            raw_data = json.load(f)
+
+    if not ChunkedProjectStore.is_manifest(raw_data):
+        return raw_data, None
+
+    store = ChunkedProjectStore(file_path)
+    return store.load(raw_data), store
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable, List
 
 
 class TitleManager:
@@ -16,6 +16,7 @@ class TitleManager:
         self.project_path: Optional[str] = None
         self.is_modified = False
         self._main_window = None
+        self._listeners: List[Callable[[str], None]] = []
     
     
     def set_main_window(self, main_window):
@@ -28,12 +29,26 @@ class TitleManager:
         self._main_window = main_window
         self._update_title()
     
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        Подписывает на изменения состояния проекта.
+        
+        Args:
+            callback: Вызывается с событием "new", "open", "save" или "modified"
+        """
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
     
     def new_project(self):
         self.project_name = "untitled"
         self.project_path = None
         self.is_modified = False
         self._update_title()
+        self._notify("new")
     
     def open_project(self, file_path: str):
         """
@@ -46,6 +61,7 @@ class TitleManager:
         self.project_name = Path(file_path).stem  # Имя файла без расширения
         self.is_modified = False
         self._update_title()
+        self._notify("open")
     
     def save_project(self, file_path: str = None):
         """
@@ -60,6 +76,7 @@ class TitleManager:
         
         self.is_modified = False
         self._update_title()
+        self._notify("save")
     
     def set_modified(self, modified: bool = True):
         """
@@ -70,6 +87,8 @@ class TitleManager:
         """
         self.is_modified = modified
         self._update_title()
+        if modified:
+            self._notify("modified")
     
     
     def get_project_path(self) -> Optional[str]:
@@ -118,6 +137,13 @@ class TitleManager:
         return self._format_title()
     
     
+    def _notify(self, event: str):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Ошибка обработчика состояния проекта: {e}")
+    
     def _update_title(self):
         if not self._main_window:
             return
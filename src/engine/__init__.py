@@ -0,0 +1,16 @@
+"""
+Движок выполнения проектов - загрузка страниц и обработка данных
+"""
+from .concurrency import AdaptiveConcurrencyController
+from .fetcher import Fetcher, FetchResponse
+from .resilience import RetryPolicy, CircuitBreaker, DeadLetterQueue, ResilientFetcher
+from .archive import ArchiveWriter, ArchiveReader, RecordingFetcher, ReplayFetcher, ArchiveServer
+from .profiler import BlockProfiler
+from .run_engine import RunEngine, RunContext
+from .job_queue import SQLiteJobQueue, HttpJobQueue, JobQueueServer
+
+__all__ = ['AdaptiveConcurrencyController', 'Fetcher', 'FetchResponse',
+           'RetryPolicy', 'CircuitBreaker', 'DeadLetterQueue', 'ResilientFetcher',
+           'ArchiveWriter', 'ArchiveReader', 'RecordingFetcher', 'ReplayFetcher', 'ArchiveServer',
+           'BlockProfiler', 'RunEngine', 'RunContext',
+           'SQLiteJobQueue', 'HttpJobQueue', 'JobQueueServer']
@@ -0,0 +1,405 @@
+import mmap
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .fetcher import Fetcher, FetchResponse
+
+
+# Заголовки, которые не имеют смысла после распаковки тела ответа
+_STRIPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+_HOP_BY_HOP_HEADERS = {"host", "connection", "accept-encoding", "proxy-connection",
+                       "keep-alive", "transfer-encoding", "upgrade", "te"}
+
+
+class ArchivedResponse:
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class ArchiveWriter:
+
+    def __init__(self, file_path: str):
+        """
+        Запись запросов и ответов в архив формата WARC (.warc.gz).
+
+        Каждая запись сжимается отдельным gzip-блоком, поэтому архив
+        можно читать стандартными WARC-инструментами и дописывать.
+
+        Args:
+            file_path: Путь к файлу архива
+        """
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.file_path, 'ab')
+        self._lock = threading.Lock()
+
+    def record(self, url: str, method: str, request_headers: Dict[str, str],
+               status: int, response_headers: Dict[str, str], body: bytes) -> None:
+        """
+        Записывает пару запрос/ответ.
+
+        Args:
+            url: Полный URL запроса
+            method: HTTP метод
+            request_headers: Заголовки запроса
+            status: HTTP статус ответа
+            response_headers: Заголовки ответа
+            body: Тело ответа (распакованное)
+        """
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        request_lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}"]
+        request_lines += [f"{k}: {v}" for k, v in request_headers.items() if k.lower() != "host"]
+        request_block = ("\r\n".join(request_lines) + "\r\n\r\n").encode('utf-8')
+
+        headers = {k: v for k, v in response_headers.items() if k.lower() not in _STRIPPED_RESPONSE_HEADERS}
+        headers["Content-Length"] = str(len(body))
+        reason = HTTP_REASONS.get(status, "")
+        response_lines = [f"HTTP/1.1 {status} {reason}"] + [f"{k}: {v}" for k, v in headers.items()]
+        response_block = ("\r\n".join(response_lines) + "\r\n\r\n").encode('utf-8') + body
+
+        response_id = f"<urn:uuid:{uuid.uuid4()}>"
+        date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        with self._lock:
+            self._write_record("response", url, date, response_id, response_block, {})
+            self._write_record("request", url, date, f"<urn:uuid:{uuid.uuid4()}>", request_block,
+                               {"WARC-Concurrent-To": response_id})
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _write_record(self, record_type: str, url: str, date: str, record_id: str,
+                      block: bytes, extra: Dict[str, str]) -> None:
+        msgtype = "response" if record_type == "response" else "request"
+        header_lines = [
+            "WARC/1.1",
+            f"WARC-Type: {record_type}",
+            f"WARC-Record-ID: {record_id}",
+            f"WARC-Date: {date}",
+            f"WARC-Target-URI: {url}",
+            f"Content-Type: application/http;msgtype={msgtype}",
+            f"Content-Length: {len(block)}"
+        ] + [f"{k}: {v}" for k, v in extra.items()]
+        record = ("\r\n".join(header_lines) + "\r\n\r\n").encode('utf-8') + block + b"\r\n\r\n"
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        self._file.write(compressor.compress(record) + compressor.flush())
+
+
+class ArchiveReader:
+
+    def __init__(self, file_path: str):
+        """
+        Чтение архива, записанного ArchiveWriter.
+
+        При открытии строится индекс смещений ответов по URL; сами ответы
+        распаковываются только при обращении к ним.
+
+        Args:
+            file_path: Путь к файлу архива
+        """
+        self.file_path = Path(file_path)
+        self._index: Dict[str, List[int]] = {}
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._file = open(self.file_path, 'rb')
+        size = self.file_path.stat().st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._build_index()
+
+    def urls(self) -> List[str]:
+        return list(self._index)
+
+    def lookup(self, url: str) -> Optional[ArchivedResponse]:
+        """
+        Возвращает записанный ответ для URL.
+
+        Если URL запрашивался несколько раз, ответы выдаются в порядке записи,
+        а после последнего повторяется последний - так повторный прогон
+        получает ту же последовательность ответов, что и исходный.
+
+        Args:
+            url: Полный URL
+
+        Returns:
+            ArchivedResponse или None если URL нет в архиве
+        """
+        offsets = self._index.get(url)
+        if not offsets:
+            return None
+
+        with self._lock:
+            position = self._served.get(url, 0)
+            self._served[url] = position + 1
+
+        offset = offsets[min(position, len(offsets) - 1)]
+        record, _ = self._read_member(offset)
+        _, block = self._split_record(record)
+        return self._parse_response(url, block)
+
+    def rewind(self) -> None:
+        """Начинает выдачу повторяющихся URL сначала"""
+        with self._lock:
+            self._served.clear()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _build_index(self) -> None:
+        offset = 0
+        while offset < len(self._data):
+            record, next_offset = self._read_member(offset)
+            headers, _ = self._split_record(record)
+            if headers.get("warc-type") == "response":
+                url = headers.get("warc-target-uri", "")
+                self._index.setdefault(url, []).append(offset)
+            offset = next_offset
+
+    def _read_member(self, offset: int) -> Tuple[bytes, int]:
+        decompressor = zlib.decompressobj(31)
+        chunks = []
+        position = offset
+        while not decompressor.eof and position < len(self._data):
+            chunk = self._data[position:position + 65536]
+            chunks.append(decompressor.decompress(chunk))
+            position += len(chunk)
+        return b"".join(chunks), position - len(decompressor.unused_data)
+
+    @staticmethod
+    def _split_record(record: bytes) -> Tuple[Dict[str, str], bytes]:
+        head, _, rest = record.partition(b"\r\n\r\n")
+        headers = {}
+        for line in head.decode('utf-8', errors='replace').split("\r\n")[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", len(rest)))
+        return headers, rest[:length]
+
+    @staticmethod
+    def _parse_response(url: str, block: bytes) -> ArchivedResponse:
+        head, _, body = block.partition(b"\r\n\r\n")
+        lines = head.decode('iso-8859-1').split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return ArchivedResponse(url, status, headers, body)
+
+
+class RecordingFetcher(Fetcher):
+
+    def __init__(self, writer: ArchiveWriter, **kwargs):
+        """
+        HTTP загрузчик, записывающий все ответы в архив.
+
+        Args:
+            writer: Архив для записи
+            **kwargs: Параметры Fetcher
+        """
+        super().__init__(**kwargs)
+        self.writer = writer
+
+    def _perform_request(self, url: str, headers: Dict[str, str] = None) -> FetchResponse:
+        response = super()._perform_request(url, headers)
+        if response.status is not None:
+            request_headers = {"User-Agent": self.user_agent}
+            request_headers.update(headers or {})
+            self.writer.record(url, "GET", request_headers, response.status, response.headers, response.body)
+        return response
+
+
+class ReplayFetcher(Fetcher):
+
+    def __init__(self, reader: ArchiveReader, **kwargs):
+        """
+        HTTP загрузчик, отдающий ответы из архива без обращения к сети.
+
+        Args:
+            reader: Архив для чтения
+            **kwargs: Параметры Fetcher
+        """
+        super().__init__(**kwargs)
+        self.reader = reader
+
+    def _perform_request(self, url: str, headers: Dict[str, str] = None) -> FetchResponse:
+        archived = self.reader.lookup(url)
+        if archived is None:
+            return FetchResponse(url, error="not in archive")
+        return FetchResponse(url, archived.status, archived.headers, archived.body)
+
+
+class ArchiveServer:
+
+    def __init__(self, mode: str, writer: ArchiveWriter = None, reader: ArchiveReader = None,
+                 fetcher: Fetcher = None, port: int = 0):
+        """
+        Локальный HTTP сервер для записи или воспроизведения страниц браузера.
+
+        Запросы браузера переадресуются на адреса вида
+        http://127.0.0.1:<port>/<scheme>/<host>/<path>. В режиме "record"
+        сервер загружает оригинал и записывает ответ, в режиме "replay"
+        отдает ответ из архива.
+
+        Args:
+            mode: "record" или "replay"
+            writer: Архив для записи (режим record)
+            reader: Архив для чтения (режим replay)
+            fetcher: Загрузчик для режима record (если None, создается новый)
+            port: Порт (0 - выбрать свободный)
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        if mode == "record" and writer is None:
+            raise ValueError("Record mode requires an ArchiveWriter")
+        if mode == "replay" and reader is None:
+            raise ValueError("Replay mode requires an ArchiveReader")
+
+        self.mode = mode
+        self.writer = writer
+        self.reader = reader
+        self.fetcher = fetcher or Fetcher()
+
+        handler = self._create_handler()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def is_local(self, url: str) -> bool:
+        return url.startswith(self.base_url + "/")
+
+    def to_local_url(self, url: str) -> str:
+        """
+        Преобразует внешний URL в адрес на локальном сервере.
+
+        Args:
+            url: Внешний http(s) URL
+
+        Returns:
+            URL вида http://127.0.0.1:<port>/<scheme>/<host>/<path>
+        """
+        parts = urlsplit(url)
+        local = f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            local += "?" + parts.query
+        return local
+
+    def to_original_url(self, path: str, referer: str = None) -> Optional[str]:
+        """
+        Восстанавливает внешний URL по пути запроса к локальному серверу.
+
+        Пути от корня сайта ("/img/a.png") не содержат схемы и хоста,
+        их источник определяется по заголовку Referer.
+
+        Args:
+            path: Путь запроса вместе с query
+            referer: Заголовок Referer
+
+        Returns:
+            Внешний URL или None если его не удалось определить
+        """
+        segments = path.lstrip("/").split("/", 2)
+        if len(segments) >= 2 and segments[0] in ("http", "https"):
+            rest = segments[2] if len(segments) > 2 else ""
+            return f"{segments[0]}://{segments[1]}/{rest}"
+
+        if referer and self.is_local(referer):
+            origin = self.to_original_url(urlsplit(referer).path)
+            if origin:
+                origin_parts = urlsplit(origin)
+                return f"{origin_parts.scheme}://{origin_parts.netloc}{path}"
+        return None
+
+    def _create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self)
+
+            def do_HEAD(self):
+                server._handle(self, send_body=False)
+
+        return Handler
+
+    def _handle(self, request: BaseHTTPRequestHandler, send_body: bool = True) -> None:
+        url = self.to_original_url(request.path, request.headers.get("Referer"))
+        if url is None:
+            request.send_error(404, "Unknown origin")
+            return
+
+        if self.mode == "replay":
+            archived = self.reader.lookup(url)
+            if archived is None:
+                request.send_error(404, "Not in archive")
+                return
+            status, headers, body = archived.status, archived.headers, archived.body
+        else:
+            forwarded = {k: v for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS}
+            referer = forwarded.pop("Referer", None)
+            if referer and self.is_local(referer):
+                original_referer = self.to_original_url(urlsplit(referer).path)
+                if original_referer:
+                    forwarded["Referer"] = original_referer
+
+            response = self.fetcher.fetch(url, forwarded)
+            if response.status is None:
+                request.send_error(502, response.error or "Upstream error")
+                return
+
+            status, headers, body = response.status, response.headers, response.body
+            self.writer.record(url, request.command, forwarded, status, headers, body)
+
+        request.send_response(status)
+        for key, value in headers.items():
+            if key.lower() not in _STRIPPED_RESPONSE_HEADERS:
+                request.send_header(key, value)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        if send_body:
+            request.wfile.write(body)
@@ -0,0 +1,55 @@
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import (QWebEngineProfile, QWebEngineUrlRequestInfo,
+                                   QWebEngineUrlRequestInterceptor)
+
+from .archive import ArchiveServer
+
+
+class ArchiveInterceptor(QWebEngineUrlRequestInterceptor):
+
+    def __init__(self, server: ArchiveServer, parent=None):
+        """
+        Перехватчик запросов QWebEngine, направляющий их через ArchiveServer.
+
+        Args:
+            server: Запущенный локальный сервер записи/воспроизведения
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.server = server
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo) -> None:
+        url = info.requestUrl()
+        if url.scheme() not in ("http", "https"):
+            return
+
+        url_text = url.toString()
+        if self.server.is_local(url_text):
+            return
+
+        # Запросы с телом (формы) не воспроизводимы - пропускаем их как есть
+        if bytes(info.requestMethod()).decode('ascii', errors='replace') != "GET":
+            return
+
+        info.redirect(QUrl(self.server.to_local_url(url_text)))
+
+
+def install_archive(profile: QWebEngineProfile, server: ArchiveServer) -> ArchiveInterceptor:
+    """
+    Подключает запись или воспроизведение архива к профилю QWebEngine.
+
+    Args:
+        profile: Профиль, через который загружаются страницы (например, RenderPool.profile)
+        server: Локальный сервер архива (будет запущен, если еще не запущен)
+
+    Returns:
+        Установленный перехватчик (нужно хранить ссылку на него)
+    """
+    if not server.is_running():
+        server.start()
+
+    interceptor = ArchiveInterceptor(server, profile)
+    profile.setUrlRequestInterceptor(interceptor)
+    # В режиме воспроизведения кэш браузера не должен подменять ответы архива
+    profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.NoCache)
+    return interceptor
@@ -0,0 +1,393 @@
+"""
+Пакетное выполнение проектов в пуле процессов.
+
+Каждый процесс выполняет проекты через HeadlessRunner со своим пулом
+рендеринга. Большие списки URL делятся на части, задания раздаются
+процессам от самых дорогих к дешевым, прогресс и результаты собираются
+в главном процессе.
+
+Пример:
+    python run_batch.py projects/*.json -o results/ --shard-size 5000 --merge all.jsonl
+"""
+import argparse
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+from .blocks import UrlListBlock, needs_rendering
+from .headless import EXIT_OK, EXIT_USAGE, EXIT_INTERRUPTED
+from .sinks import available_formats
+
+
+# Страница с рендерингом в QtWebEngine обходится примерно на порядок дороже HTTP загрузки
+RENDER_COST_FACTOR = 10
+
+# Очередь прогресса рабочих процессов (задается инициализатором пула)
+_progress_queue = None
+
+
+class BatchJob:
+
+    def __init__(self, name: str, project_data: Dict[str, Any], cost: float):
+        """
+        Одно задание пакета - проект или часть его списка URL.
+
+        Args:
+            name: Имя задания (используется для файла результатов)
+            project_data: Данные проекта для выполнения
+            cost: Оценка стоимости выполнения
+        """
+        self.name = name
+        self.project_data = project_data
+        self.cost = cost
+
+
+def read_source_urls(block_data: Dict[str, Any]) -> List[str]:
+    """Возвращает все URL блока-источника (из параметров и файла)"""
+    return list(UrlListBlock("source", block_data.get("params", {}), None).generate())
+
+
+def estimate_cost(project_data: Dict[str, Any], url_count: int = None) -> float:
+    """
+    Оценивает стоимость выполнения проекта.
+
+    Args:
+        project_data: Данные проекта
+        url_count: Число URL (если None, считается по блокам-источникам)
+
+    Returns:
+        Условная стоимость: число страниц с учетом рендеринга
+    """
+    if url_count is None:
+        data = project_data.get("data", project_data)
+        url_count = sum(
+            len(read_source_urls(block)) for block in data.get("blocks", [])
+            if block.get("type") == UrlListBlock.block_type
+        )
+    factor = RENDER_COST_FACTOR if needs_rendering(project_data) else 1
+    return max(1, url_count) * factor
+
+
+def replace_source_urls(project_data: Dict[str, Any], urls: List[str]) -> Dict[str, Any]:
+    """
+    Возвращает копию проекта, в которой единственный блок-источник выдает заданные URL.
+
+    Args:
+        project_data: Данные проекта
+        urls: Новый список URL
+
+    Returns:
+        Копия данных проекта
+
+    Raises:
+        ValueError: Если в проекте не ровно один блок-источник URL
+    """
+    project_data = copy.deepcopy(project_data)
+    data = project_data.get("data", project_data)
+    sources = [block for block in data.get("blocks", [])
+               if block.get("type") == UrlListBlock.block_type]
+    if len(sources) != 1:
+        raise ValueError(f"Project must have exactly one URL source block, found {len(sources)}")
+
+    params = {**sources[0].get("params", {}), "urls": list(urls)}
+    params.pop("file", None)
+    sources[0]["params"] = params
+    return project_data
+
+
+def project_job_names(project_paths: List[str]) -> List[str]:
+    """
+    Уникальные имена заданий для файлов проектов.
+
+    Имя - имя файла без расширения; проекты с одинаковым именем из разных
+    папок получают короткий хеш полного пути (их файлы результатов и прогресс
+    не должны совпадать), повторно указанный файл - еще и номер.
+    """
+    stems = [Path(project_path).stem for project_path in project_paths]
+    names = []
+    used = set()
+    for position, (project_path, stem) in enumerate(zip(project_paths, stems)):
+        name = stem
+        if stems.count(stem) > 1:
+            digest = hashlib.sha1(str(Path(project_path).resolve()).encode('utf-8')).hexdigest()[:8]
+            name = f"{stem}-{digest}"
+        if name in used:
+            name = f"{name}-{position}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def expand_jobs(project_paths: List[str], shard_size: int = None,
+                inputs_file: str = None) -> List[BatchJob]:
+    """
+    Превращает файлы проектов в список заданий.
+
+    Если у проекта один блок-источник URL и задан shard_size, его список
+    делится на части по shard_size адресов, каждая часть - отдельное задание.
+
+    Args:
+        project_paths: Пути к файлам проектов
+        shard_size: Максимальное число URL в одном задании
+        inputs_file: Файл со списком URL, заменяющим источник каждого проекта
+
+    Returns:
+        Задания, отсортированные по убыванию стоимости
+    """
+    from ..core.project_manager import ProjectManager
+
+    override_urls = None
+    if inputs_file:
+        override_urls = read_source_urls({"params": {"file": inputs_file}})
+
+    jobs = []
+    for project_path, name in zip(project_paths, project_job_names(project_paths)):
+        project_data = ProjectManager.load_project_data(project_path)
+        data = project_data.get("data", project_data)
+        sources = [block for block in data.get("blocks", [])
+                   if block.get("type") == UrlListBlock.block_type]
+
+        if len(sources) != 1 or (not shard_size and override_urls is None):
+            jobs.append(BatchJob(name, project_data, estimate_cost(project_data)))
+            continue
+
+        urls = override_urls if override_urls is not None else read_source_urls(sources[0])
+        step = shard_size or len(urls) or 1
+        shards = [urls[start:start + step] for start in range(0, len(urls), step)] or [[]]
+
+        for index, shard in enumerate(shards):
+            job_data = replace_source_urls(project_data, shard)
+            job_name = name if len(shards) == 1 else f"{name}-{index:04d}"
+            jobs.append(BatchJob(job_name, job_data, estimate_cost(job_data, len(shard))))
+
+    # Самые дорогие задания первыми: свободный процесс берет следующее по стоимости,
+    # поэтому в конце пакета остаются короткие задания и процессы завершаются почти одновременно
+    jobs.sort(key=lambda job: job.cost, reverse=True)
+    return jobs
+
+
+def _init_worker(progress_queue) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run_job(job: BatchJob, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Выполняет одно задание в рабочем процессе"""
+    from .headless import parse_args, HeadlessRunner
+
+    output = str(Path(options["output_dir"]) / f"{job.name}.{options['format']}")
+    argv = [job.name, "-o", output, "--format", options["format"],
+            "--progress", str(options["progress_interval"]),
+            "--render-pages", str(options["render_pages"])]
+    if options["static"]:
+        argv.append("--static")
+    if options["replay"]:
+        argv += ["--replay", options["replay"]]
+    if options["profile"]:
+        argv += ["--profile-json", str(Path(options["output_dir"]) / f"{job.name}.profile.json")]
+
+    def report(engine):
+        context = engine.context
+        _progress_queue.put((job.name, os.getpid(), context.result_count,
+                             context.fetcher.dead_letters.added_count, False))
+
+    runner = HeadlessRunner(parse_args(argv), on_progress=report)
+    try:
+        exit_code = runner.run(job.project_data)
+    except Exception as e:
+        print(f"Ошибка выполнения задания {job.name}: {e}", file=sys.stderr)
+        exit_code = EXIT_USAGE
+
+    summary = {k: v for k, v in runner.summary.items() if k != "blocks"}
+    _progress_queue.put((job.name, os.getpid(), summary.get("records", 0),
+                         summary.get("dead_letters", 0), True))
+    return {"name": job.name, "output": output, "exit_code": exit_code,
+            "cost": job.cost, "summary": summary}
+
+
+class BatchRunner:
+
+    def __init__(self, jobs: List[BatchJob], output_dir: str, processes: int = None,
+                 sink_format: str = "jsonl", static: bool = False, render_pages: int = 2,
+                 replay: str = None, profile: bool = False, progress_interval: float = 5.0):
+        """
+        Выполнение заданий в пуле процессов.
+
+        Args:
+            jobs: Задания (обычно из expand_jobs)
+            output_dir: Каталог для файлов результатов заданий
+            processes: Число процессов (по умолчанию число ядер)
+            sink_format: Формат файлов результатов
+            static: Не запускать QtWebEngine в процессах
+            render_pages: Число страниц пула рендеринга в каждом процессе
+            replay: Архив WARC для воспроизведения
+            profile: Сохранять профиль каждого задания
+            progress_interval: Период вывода общего прогресса в секундах
+        """
+        self.jobs = jobs
+        self.output_dir = Path(output_dir)
+        self.processes = max(1, min(processes or os.cpu_count() or 1, len(jobs) or 1))
+        self.progress_interval = progress_interval
+        self.options = {
+            "output_dir": str(self.output_dir),
+            "format": sink_format,
+            "static": static,
+            "render_pages": render_pages,
+            "replay": replay,
+            "profile": profile,
+            "progress_interval": max(0.5, progress_interval / 2)
+        }
+        self.results: List[Dict[str, Any]] = []
+        self._job_progress: Dict[str, tuple] = {}
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Выполняет все задания и ждет их завершения.
+
+        Returns:
+            Сводка пакета {elapsed_s, jobs, records, dead_letters, failed_jobs, exit_code, results}
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+
+        # spawn: QtWebEngine (Chromium) не переносит fork процесса
+        mp_context = multiprocessing.get_context("spawn")
+        progress_queue = mp_context.Queue()
+        interrupted = False
+
+        with mp_context.Pool(self.processes, initializer=_init_worker, initargs=(progress_queue,)) as pool:
+            pending = [pool.apply_async(_run_job, (job, self.options)) for job in self.jobs]
+            try:
+                while pending:
+                    pending[0].wait(self.progress_interval)
+                    still_pending = []
+                    for async_result in pending:
+                        if async_result.ready():
+                            self.results.append(async_result.get())
+                        else:
+                            still_pending.append(async_result)
+                    pending = still_pending
+                    self._drain_progress(progress_queue)
+                    self._print_progress(start)
+                # Простаивающие процессы завершаются сами: terminate() при выходе из with
+                # может зависнуть на очереди заданий, которую держит завершаемый процесс
+                pool.close()
+                pool.join()
+            except KeyboardInterrupt:
+                interrupted = True
+                pool.terminate()
+
+        summary = self._summary(time.perf_counter() - start, interrupted)
+        self._write_summary(summary)
+        return summary
+
+    def merge_outputs(self, target: str) -> None:
+        """
+        Объединяет файлы результатов заданий в один файл.
+
+        Для CSV заголовок берется из первого файла, заголовки остальных пропускаются.
+        """
+        is_csv = self.options["format"] == "csv"
+        header_written = False
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(target, 'wb') as out:
+            for result in sorted(self.results, key=lambda r: r["name"]):
+                if not os.path.exists(result["output"]):
+                    continue
+                with open(result["output"], 'rb') as f:
+                    if is_csv:
+                        header = f.readline()
+                        if not header_written and header:
+                            out.write(header)
+                            header_written = True
+                    shutil.copyfileobj(f, out)
+
+    def _drain_progress(self, progress_queue) -> None:
+        while True:
+            try:
+                job_name, pid, records, dead_letters, done = progress_queue.get_nowait()
+            except Exception:
+                return
+            self._job_progress[job_name] = (pid, records, dead_letters, done)
+
+    def _print_progress(self, start: float) -> None:
+        records = sum(progress[1] for progress in self._job_progress.values())
+        dead_letters = sum(progress[2] for progress in self._job_progress.values())
+        running = sum(1 for progress in self._job_progress.values() if not progress[3])
+        print(f"[{time.perf_counter() - start:7.1f} с] заданий: {len(self.results)}/{len(self.jobs)}, "
+              f"выполняется: {running}, записей: {records}, неудач: {dead_letters}", file=sys.stderr)
+
+    def _summary(self, elapsed: float, interrupted: bool) -> Dict[str, Any]:
+        failed = [result["name"] for result in self.results if result["exit_code"] != EXIT_OK]
+        if interrupted:
+            exit_code = EXIT_INTERRUPTED
+        else:
+            exit_code = max((result["exit_code"] for result in self.results), default=EXIT_OK)
+
+        return {
+            "elapsed_s": elapsed,
+            "processes": self.processes,
+            "jobs": len(self.jobs),
+            "completed_jobs": len(self.results),
+            "records": sum(result["summary"].get("records", 0) for result in self.results),
+            "dead_letters": sum(result["summary"].get("dead_letters", 0) for result in self.results),
+            "failed_jobs": failed,
+            "exit_code": exit_code,
+            "results": sorted(self.results, key=lambda r: r["name"])
+        }
+
+    def _write_summary(self, summary: Dict[str, Any]) -> None:
+        try:
+            with open(self.output_dir / "batch_summary.json", 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        except IOError as e:
+            print(f"Ошибка сохранения сводки пакета: {e}", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетное выполнение проектов Parser Bot")
+    parser.add_argument("projects", nargs="+", help="файлы проектов (.json)")
+    parser.add_argument("-o", "--output-dir", default="batch_results", help="каталог для результатов заданий")
+    parser.add_argument("-j", "--processes", type=int, help="число процессов (по умолчанию число ядер)")
+    parser.add_argument("--shard-size", type=int, help="делить списки URL на задания по N адресов")
+    parser.add_argument("--inputs", metavar="FILE",
+                        help="файл URL, заменяющий источник каждого проекта")
+    parser.add_argument("--format", choices=available_formats(), default="jsonl", help="формат результатов")
+    parser.add_argument("--merge", metavar="FILE", help="объединить результаты всех заданий в один файл")
+    parser.add_argument("--static", action="store_true", help="не запускать QtWebEngine")
+    parser.add_argument("--render-pages", type=int, default=2, help="страниц рендеринга на процесс")
+    parser.add_argument("--replay", metavar="WARC", help="воспроизвести страницы из архива")
+    parser.add_argument("--profile", action="store_true", help="сохранить профиль каждого задания")
+    parser.add_argument("--progress", type=float, default=5.0, help="период вывода прогресса в секундах")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    try:
+        jobs = expand_jobs(args.projects, args.shard_size, args.inputs)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка чтения проектов: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    runner = BatchRunner(jobs, args.output_dir, args.processes, args.format, args.static,
+                         args.render_pages, args.replay, args.profile, args.progress)
+    print(f"Заданий: {len(jobs)}, процессов: {runner.processes}", file=sys.stderr)
+    summary = runner.run()
+
+    if args.merge:
+        runner.merge_outputs(args.merge)
+
+    print(f"Готово за {summary['elapsed_s']:.1f} с: заданий {summary['completed_jobs']}/{summary['jobs']}, "
+          f"записей {summary['records']}, неудач {summary['dead_letters']}, "
+          f"с ошибками {len(summary['failed_jobs'])}", file=sys.stderr)
+    return summary["exit_code"]
@@ -0,0 +1,151 @@
+from pathlib import Path
+from typing import Dict, Any, List, Iterable
+
+from .extractor import Extractor
+
+
+class Block:
+
+    block_type = ""
+    is_source = False
+    default_workers = 1
+
+    def __init__(self, block_id: str, params: Dict[str, Any], context):
+        """
+        Базовый блок графа проекта.
+
+        Args:
+            block_id: Идентификатор блока
+            params: Параметры блока из файла проекта
+            context: RunContext запуска
+        """
+        self.block_id = block_id
+        self.params = params
+        self.context = context
+        self.workers = max(1, int(params.get("workers", self.default_workers)))
+
+    def generate(self) -> Iterable[Any]:
+        """Порождает элементы (только для блоков-источников)"""
+        return []
+
+    def process(self, item: Any) -> List[Any]:
+        """
+        Обрабатывает один входящий элемент.
+
+        Args:
+            item: Элемент от предыдущего блока
+
+        Returns:
+            Список элементов для следующих блоков
+        """
+        return [item]
+
+
+class UrlListBlock(Block):
+
+    block_type = "urls"
+    is_source = True
+
+    def generate(self) -> Iterable[str]:
+        for url in self.params.get("urls", []):
+            url = url.strip()
+            if url:
+                yield url
+
+        # Большие списки удобнее хранить в отдельном текстовом файле (один URL в строке)
+        file_path = self.params.get("file")
+        if file_path:
+            with open(Path(file_path), 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        yield line
+
+
+class FetchBlock(Block):
+
+    block_type = "fetch"
+    default_workers = 4
+
+    def process(self, item: Any) -> List[Dict[str, Any]]:
+        url = item["url"] if isinstance(item, dict) else str(item)
+
+        if self.params.get("render"):
+            html = self.context.render(url)
+            if html is None:
+                return []
+            return [{"url": url, "status": 200, "html": html}]
+
+        response = self.context.fetcher.fetch(url)
+        if response is None:
+            # Задание уже в очереди неудач
+            return []
+        return [{"url": url, "status": response.status, "html": response.text(), "elapsed": response.elapsed}]
+
+
+class ExtractBlock(Block):
+
+    block_type = "extract"
+
+    def __init__(self, block_id: str, params: Dict[str, Any], context):
+        super().__init__(block_id, params, context)
+        self.extractor = Extractor(params.get("fields", {}), params.get("item_selector"))
+
+    def process(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        records = self.extractor.extract(item.get("html", ""))
+        for record in records:
+            record["_url"] = item.get("url")
+        return records
+
+
+class SinkBlock(Block):
+
+    block_type = "sink"
+
+    def process(self, item: Any) -> List[Any]:
+        self.context.emit_result(item)
+        return []
+
+
+BLOCK_TYPES = {
+    block_class.block_type: block_class
+    for block_class in (UrlListBlock, FetchBlock, ExtractBlock, SinkBlock)
+}
+
+
+def create_block(block_data: Dict[str, Any], context) -> Block:
+    """
+    Создает блок по его описанию из файла проекта.
+
+    Args:
+        block_data: Словарь {"id", "type", "params"}
+        context: RunContext запуска
+
+    Returns:
+        Экземпляр блока
+
+    Raises:
+        ValueError: Если тип блока неизвестен
+    """
+    block_type = block_data.get("type")
+    block_class = BLOCK_TYPES.get(block_type)
+    if block_class is None:
+        raise ValueError(f"Unknown block type: {block_type}")
+    return block_class(str(block_data["id"]), block_data.get("params", {}), context)
+
+
+def needs_rendering(project_data: Dict[str, Any]) -> bool:
+    """
+    Проверяет, есть ли в проекте блоки, которым нужен QtWebEngine.
+
+    Args:
+        project_data: Данные проекта (полные или только секция "data")
+
+    Returns:
+        True если хотя бы один блок загрузки использует рендеринг
+    """
+    data = project_data.get("data", project_data)
+    return any(
+        block.get("type") == FetchBlock.block_type and block.get("params", {}).get("render")
+        for block in data.get("blocks", [])
+    )
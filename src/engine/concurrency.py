@@ -0,0 +1,294 @@
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+
+class HostState:
+
+    def __init__(self, host: str, initial_limit: float, window: int):
+        """
+        Состояние AIMD-регулятора для одного хоста.
+
+        Args:
+            host: Имя хоста
+            initial_limit: Начальное число одновременных запросов
+            window: Размер окна для оценки задержки и ошибок
+        """
+        self.host = host
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)
+        self.errors = deque(maxlen=window)
+        self.base_latency: Optional[float] = None
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.total_requests = 0
+        self.total_errors = 0
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Возвращает перцентиль задержки по текущему окну.
+
+        Args:
+            fraction: Доля от 0 до 1 (например, 0.95)
+
+        Returns:
+            Значение задержки в секундах или None если данных нет
+        """
+        if not self.latencies:
+            return None
+
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+    def error_rate(self) -> float:
+        if not self.errors:
+            return 0.0
+        return sum(self.errors) / len(self.errors)
+
+
+class AdaptiveConcurrencyController:
+
+    def __init__(self, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 32,
+                 additive_step: float = 1.0, decrease_factor: float = 0.5,
+                 window: int = 50, spike_ratio: float = 2.0,
+                 max_error_rate: float = 0.1, decrease_cooldown: float = 1.0):
+        """
+        Регулятор параллельности запросов по хостам (AIMD).
+
+        Пока p95 задержки и доля ошибок в норме, лимит растет аддитивно
+        (примерно на additive_step за каждое "окно" ответов). При ответах
+        429/503, сетевых ошибках или всплеске задержки лимит умножается
+        на decrease_factor, а заголовок Retry-After приостанавливает хост.
+
+        Args:
+            initial_limit: Начальный лимит одновременных запросов на хост
+            min_limit: Минимальный лимит
+            max_limit: Максимальный лимит
+            additive_step: Шаг аддитивного увеличения
+            decrease_factor: Множитель уменьшения лимита
+            window: Размер окна статистики задержек и ошибок
+            spike_ratio: Во сколько раз p95 может превысить базовую задержку
+            max_error_rate: Допустимая доля ошибок в окне
+            decrease_cooldown: Минимальный интервал между уменьшениями (сек)
+        """
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_step = additive_step
+        self.decrease_factor = decrease_factor
+        self.window = window
+        self.spike_ratio = spike_ratio
+        self.max_error_rate = max_error_rate
+        self.decrease_cooldown = decrease_cooldown
+
+        self._hosts: Dict[str, HostState] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, host: str, timeout: float = None) -> bool:
+        """
+        Занимает слот для запроса к хосту, ожидая освобождения при необходимости.
+
+        Args:
+            host: Имя хоста
+            timeout: Максимальное время ожидания в секундах (None - без ограничения)
+
+        Returns:
+            True если слот получен, False если истек таймаут
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            state = self._get_state(host)
+            while True:
+                now = time.monotonic()
+                wait_for = self._slot_wait_time(state, now)
+                if wait_for == 0.0:
+                    state.in_flight += 1
+                    return True
+
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait_for = min(wait_for, deadline - now) if wait_for else deadline - now
+
+                # None означает "ждать освобождения слота"
+                self._condition.wait(wait_for)
+
+    def try_acquire(self, host: str) -> bool:
+        """
+        Занимает слот без ожидания (для вызовов из GUI-потока).
+
+        Args:
+            host: Имя хоста
+
+        Returns:
+            True если слот получен
+        """
+        with self._condition:
+            state = self._get_state(host)
+            if self._slot_wait_time(state, time.monotonic()) == 0.0:
+                state.in_flight += 1
+                return True
+            return False
+
+    def release(self, host: str, latency: float, status: int = None,
+                error: bool = False, retry_after: Optional[str] = None) -> None:
+        """
+        Освобождает слот и обновляет лимит хоста по результату запроса.
+
+        Args:
+            host: Имя хоста
+            latency: Время выполнения запроса в секундах
+            status: HTTP статус ответа (None если ответа не было)
+            error: True если запрос завершился сетевой ошибкой
+            retry_after: Значение заголовка Retry-After, если есть
+        """
+        with self._condition:
+            state = self._get_state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.total_requests += 1
+            now = time.monotonic()
+
+            throttled = status in (429, 503)
+            failed = error or throttled
+            state.errors.append(1 if failed else 0)
+            if failed:
+                state.total_errors += 1
+            else:
+                state.latencies.append(latency)
+                self._update_base_latency(state)
+
+            delay = self.parse_retry_after(retry_after) if retry_after else None
+            if delay:
+                state.blocked_until = max(state.blocked_until, now + delay)
+
+            if failed or self._is_latency_spike(state, latency):
+                self._decrease(state, now)
+            elif self._is_healthy(state) and state.in_flight + 1 >= int(state.limit):
+                # Аддитивный рост: +additive_step примерно за каждые limit ответов,
+                # и только если текущий лимит действительно используется
+                state.limit = min(self.max_limit, state.limit + self.additive_step / state.limit)
+
+            self._condition.notify_all()
+
+    def get_limit(self, host: str) -> int:
+        with self._condition:
+            return int(self._get_state(host).limit)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Возвращает текущее состояние всех хостов для отображения.
+
+        Returns:
+            Словарь {хост: {limit, in_flight, p50_ms, p95_ms, error_rate, blocked_for, requests}}
+        """
+        with self._condition:
+            now = time.monotonic()
+            result = {}
+            for host, state in self._hosts.items():
+                p50 = state.percentile(0.5)
+                p95 = state.percentile(0.95)
+                result[host] = {
+                    "limit": int(state.limit),
+                    "in_flight": state.in_flight,
+                    "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                    "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                    "error_rate": round(state.error_rate(), 3),
+                    "blocked_for": round(max(0.0, state.blocked_until - now), 2),
+                    "requests": state.total_requests
+                }
+            return result
+
+    def format_snapshot(self) -> str:
+        """
+        Формирует короткую строку состояния хостов (для статус-бара и логов).
+
+        Returns:
+            Строка вида "host: 4 (2 акт.), p95 120 мс; ..."
+        """
+        parts = []
+        for host, info in sorted(self.snapshot().items()):
+            p95 = info["p95_ms"]
+            part = f"{host}: {info['limit']} ({info['in_flight']} акт.)"
+            if p95 is not None:
+                part += f", p95 {p95:.0f} мс"
+            if info["blocked_for"]:
+                part += f", пауза {info['blocked_for']:.0f} с"
+            parts.append(part)
+        return "; ".join(parts)
+
+    @staticmethod
+    def parse_retry_after(value: str) -> Optional[float]:
+        """
+        Разбирает заголовок Retry-After.
+
+        Args:
+            value: Число секунд или HTTP-дата
+
+        Returns:
+            Задержка в секундах или None если значение не распознано
+        """
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at is None:
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def _get_state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(host, self.initial_limit, self.window)
+            self._hosts[host] = state
+        return state
+
+    def _slot_wait_time(self, state: HostState, now: float) -> Optional[float]:
+        """
+        Возвращает 0.0 если слот свободен, время до конца паузы хоста
+        или None если нужно ждать освобождения слота.
+        """
+        if now < state.blocked_until:
+            return state.blocked_until - now
+        if state.in_flight < max(self.min_limit, int(state.limit)):
+            return 0.0
+        return None
+
+    def _update_base_latency(self, state: HostState) -> None:
+        if len(state.latencies) < min(10, self.window):
+            return
+
+        p50 = state.percentile(0.5)
+        if state.base_latency is None or p50 < state.base_latency:
+            state.base_latency = p50
+        else:
+            # Медленно подтягиваем базу вверх, чтобы не застрять на случайном минимуме
+            state.base_latency += (p50 - state.base_latency) * 0.01
+
+    def _is_latency_spike(self, state: HostState, latency: float) -> bool:
+        if state.base_latency is None:
+            return False
+
+        threshold = state.base_latency * self.spike_ratio
+        p95 = state.percentile(0.95)
+        return latency > threshold and p95 is not None and p95 > threshold
+
+    def _is_healthy(self, state: HostState) -> bool:
+        return state.error_rate() <= self.max_error_rate
+
+    def _decrease(self, state: HostState, now: float) -> None:
+        # Не уменьшаем повторно от ответов, отправленных до предыдущего уменьшения
+        if now - state.last_decrease < self.decrease_cooldown:
+            return
+
+        state.limit = max(float(self.min_limit), state.limit * self.decrease_factor)
+        state.last_decrease = now
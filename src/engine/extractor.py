@@ -0,0 +1,286 @@
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, Any, List, Optional
+
+
+# Элементы без закрывающего тега
+_VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                  "link", "meta", "param", "source", "track", "wbr"}
+
+_SIMPLE_SELECTOR_RE = re.compile(
+    r"(?P<tag>[a-zA-Z][\w-]*|\*)?"
+    r"(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[^\]]+\]|:nth-of-type\(\d+\))*)"
+)
+_PART_RE = re.compile(r"#([\w-]+)|\.([\w-]+)|\[([^\]=]+)(?:=\"?([^\]\"]*)\"?)?\]|:nth-of-type\((\d+)\)")
+
+
+class Node:
+
+    __slots__ = ("tag", "attrs", "children", "parent", "text_parts", "classes", "type_index")
+
+    def __init__(self, tag: str, attrs: Dict[str, str] = None, parent: "Node" = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children: List["Node"] = []
+        self.parent = parent
+        self.text_parts: List[str] = []
+        self.classes = set(self.attrs.get("class", "").split())
+        self.type_index = 0
+
+    def text(self) -> str:
+        """Возвращает весь текст элемента и его потомков"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            parts.extend(node.text_parts)
+            stack.extend(reversed(node.children))
+        return " ".join(p.strip() for p in parts if p.strip())
+
+    def iter_descendants(self):
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def nth_of_type(self) -> int:
+        """Номер элемента среди соседей с тем же тегом (с 1)"""
+        if self.parent is None:
+            return 1
+        if not self.type_index:
+            # Нумеруем всех соседей за один проход, иначе селекторы по длинным спискам квадратичны
+            counters: Dict[str, int] = {}
+            for sibling in self.parent.children:
+                counters[sibling.tag] = counters.get(sibling.tag, 0) + 1
+                sibling.type_index = counters[sibling.tag]
+        return self.type_index
+
+
+class _TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self._current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: v or "" for k, v in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in _VOID_ELEMENTS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {k: v or "" for k, v in attrs}, self._current)
+        self._current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # Закрываем до ближайшего открытого элемента с этим тегом (терпимо к ошибкам разметки)
+        node = self._current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.text_parts.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """
+    Строит упрощенное DOM-дерево страницы.
+
+    Args:
+        html: HTML код страницы
+
+    Returns:
+        Корневой узел документа
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def select(root: Node, selector: str) -> List[Node]:
+    """
+    Находит элементы по CSS селектору.
+
+    Поддерживаются теги, #id, .class, [attr], [attr=value], :nth-of-type(n),
+    комбинаторы " " и ">", а также списки через запятую.
+
+    Args:
+        root: Узел, в котором выполняется поиск
+        selector: CSS селектор
+
+    Returns:
+        Список найденных элементов в порядке документа
+    """
+    groups = [steps for steps in (_parse_selector(g.strip()) for g in selector.split(",")) if steps]
+    return [node for node in root.iter_descendants()
+            if any(_matches_chain(node, steps, len(steps) - 1) for steps in groups)]
+
+
+def select_one(root: Node, selector: str) -> Optional[Node]:
+    matches = select(root, selector)
+    return matches[0] if matches else None
+
+
+def generate_selector(node: Node) -> str:
+    """
+    Строит уникальный CSS селектор элемента.
+
+    Как и XPath в режиме инспектора, путь обрывается на ближайшем предке с id.
+
+    Args:
+        node: Элемент документа
+
+    Returns:
+        CSS селектор
+    """
+    parts = []
+    current = node
+    while current is not None and current.parent is not None:
+        element_id = current.attrs.get("id")
+        if element_id and re.fullmatch(r"[A-Za-z][\w-]*", element_id):
+            parts.append(f"#{element_id}")
+            break
+        parts.append(f"{current.tag}:nth-of-type({current.nth_of_type()})")
+        current = current.parent
+    return " > ".join(reversed(parts))
+
+
+def generate_xpath(node: Node) -> str:
+    """
+    Строит XPath элемента так же, как режим инспектора в браузере.
+
+    Args:
+        node: Элемент документа
+
+    Returns:
+        XPath вида //*[@id="x"] или /html/body[1]/div[2]
+    """
+    if node.attrs.get("id"):
+        return f'//*[@id="{node.attrs["id"]}"]'
+
+    path = []
+    current = node
+    while current is not None and current.parent is not None and current.tag != "html":
+        path.append(f"{current.tag}[{current.nth_of_type()}]")
+        current = current.parent
+    return "/html/" + "/".join(reversed(path)) if path else "/html"
+
+
+class Extractor:
+
+    def __init__(self, fields: Dict[str, Dict[str, Any]], item_selector: str = None):
+        """
+        Извлечение данных со страницы по набору правил.
+
+        Args:
+            fields: Правила полей {имя: {"selector": css, "attr": "text" или имя атрибута,
+                    "all": True для списка значений}}
+            item_selector: Селектор повторяющихся элементов (карточек); если задан,
+                    поля извлекаются относительно каждого элемента
+        """
+        self.fields = fields
+        self.item_selector = item_selector
+
+    def extract(self, html: str) -> List[Dict[str, Any]]:
+        """
+        Извлекает записи со страницы.
+
+        Args:
+            html: HTML код страницы
+
+        Returns:
+            Список записей (одна запись, если item_selector не задан)
+        """
+        root = parse_html(html)
+        scopes = select(root, self.item_selector) if self.item_selector else [root]
+        return [self._extract_fields(scope) for scope in scopes]
+
+    def _extract_fields(self, scope: Node) -> Dict[str, Any]:
+        record = {}
+        for name, rule in self.fields.items():
+            attr = rule.get("attr", "text")
+            matches = select(scope, rule["selector"])
+            values = [m.text() if attr == "text" else m.attrs.get(attr, "") for m in matches]
+            if rule.get("all"):
+                record[name] = values
+            else:
+                record[name] = values[0] if values else None
+        return record
+
+
+@lru_cache(maxsize=256)
+def _parse_selector(selector: str) -> List[tuple]:
+    """Разбирает селектор в список шагов (комбинатор, простой селектор)"""
+    tokens = re.split(r"\s*(>)\s*|\s+", selector)
+    steps = []
+    combinator = " "
+    for token in tokens:
+        if not token:
+            continue
+        if token == ">":
+            combinator = ">"
+            continue
+        match = _SIMPLE_SELECTOR_RE.fullmatch(token)
+        if not match:
+            return []
+        tag = match.group("tag")
+        conditions = []
+        for part in _PART_RE.finditer(match.group("rest") or ""):
+            element_id, cls, attr, value, nth = part.groups()
+            if element_id:
+                conditions.append(("id", element_id))
+            elif cls:
+                conditions.append(("class", cls))
+            elif attr:
+                conditions.append(("attr", (attr.strip(), value)))
+            elif nth:
+                conditions.append(("nth", int(nth)))
+        steps.append((combinator, None if tag in (None, "*") else tag.lower(), conditions))
+        combinator = " "
+    return steps
+
+
+def _matches_simple(node: Node, tag: Optional[str], conditions: List[tuple]) -> bool:
+    if tag is not None and node.tag != tag:
+        return False
+    for kind, value in conditions:
+        if kind == "id":
+            if node.attrs.get("id") != value:
+                return False
+        elif kind == "class":
+            if value not in node.classes:
+                return False
+        elif kind == "attr":
+            name, expected = value
+            if name not in node.attrs:
+                return False
+            if expected is not None and node.attrs[name] != expected:
+                return False
+        elif kind == "nth":
+            if node.nth_of_type() != value:
+                return False
+    return True
+
+
+def _matches_chain(node: Node, steps: List[tuple], index: int) -> bool:
+    combinator, tag, conditions = steps[index]
+    if not _matches_simple(node, tag, conditions):
+        return False
+    if index == 0:
+        return True
+
+    parent = node.parent
+    if combinator == ">":
+        return parent is not None and parent.parent is not None and _matches_chain(parent, steps, index - 1)
+
+    while parent is not None and parent.parent is not None:
+        if _matches_chain(parent, steps, index - 1):
+            return True
+        parent = parent.parent
+    return False
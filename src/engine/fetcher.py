@@ -0,0 +1,168 @@
+import gzip
+import http.client
+import socket
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from .concurrency import AdaptiveConcurrencyController
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; ParserBot/1.0)"
+
+
+class FetchResponse:
+
+    def __init__(self, url: str, status: Optional[int] = None, headers: Dict[str, str] = None,
+                 body: bytes = b"", elapsed: float = 0.0, error: Optional[str] = None,
+                 final_url: str = None):
+        """
+        Результат загрузки страницы.
+
+        Args:
+            url: Запрошенный URL
+            status: HTTP статус (None если ответа не было)
+            headers: Заголовки ответа (ключи в нижнем регистре)
+            body: Тело ответа (уже распакованное)
+            elapsed: Время загрузки в секундах
+            error: Текст сетевой ошибки, если была
+            final_url: URL после редиректов
+        """
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+        self.elapsed = elapsed
+        self.error = error
+        self.final_url = final_url or url
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 400
+
+    def text(self, encoding: str = None) -> str:
+        """
+        Декодирует тело ответа в строку.
+
+        Args:
+            encoding: Кодировка (если None, берется из Content-Type или utf-8)
+
+        Returns:
+            Текст ответа
+        """
+        if encoding is None:
+            content_type = self.headers.get("content-type", "")
+            encoding = "utf-8"
+            for part in content_type.split(";"):
+                part = part.strip()
+                if part.lower().startswith("charset="):
+                    encoding = part.split("=", 1)[1].strip("\"' ") or encoding
+        return self.body.decode(encoding, errors="replace")
+
+
+class Fetcher:
+
+    def __init__(self, controller: AdaptiveConcurrencyController = None,
+                 timeout: float = 30.0, user_agent: str = DEFAULT_USER_AGENT):
+        """
+        Быстрая HTTP-загрузка страниц без рендеринга.
+
+        Число одновременных запросов к каждому хосту регулируется
+        AdaptiveConcurrencyController, поэтому fetch() можно безопасно
+        вызывать из любого количества рабочих потоков.
+
+        Args:
+            controller: Регулятор параллельности (если None, создается новый)
+            timeout: Таймаут одного запроса в секундах
+            user_agent: Заголовок User-Agent
+        """
+        self.controller = controller or AdaptiveConcurrencyController()
+        self.timeout = timeout
+        self.user_agent = user_agent
+
+    def fetch(self, url: str, headers: Dict[str, str] = None) -> FetchResponse:
+        """
+        Загружает URL, дожидаясь свободного слота для его хоста.
+
+        Args:
+            url: Адрес страницы
+            headers: Дополнительные заголовки запроса
+
+        Returns:
+            FetchResponse (ошибки не выбрасываются, а записываются в ответ)
+        """
+        host = self.get_host(url)
+        self.controller.acquire(host)
+
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._perform_request(url, headers)
+            response.elapsed = time.perf_counter() - start
+        finally:
+            if response is None:
+                # Непредвиденная ошибка: слот хоста все равно освобождается, иначе хост встанет
+                self.controller.release(host, time.perf_counter() - start, error=True)
+            else:
+                self.controller.release(
+                    host,
+                    response.elapsed,
+                    status=response.status,
+                    error=response.error is not None,
+                    retry_after=response.headers.get("retry-after")
+                )
+        return response
+
+    def stats(self) -> str:
+        """Возвращает строку с текущей параллельностью и задержкой по хостам"""
+        return self.controller.format_snapshot()
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        return (urlsplit(url).hostname or "").lower()
+
+    def _perform_request(self, url: str, headers: Dict[str, str] = None) -> FetchResponse:
+        request_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate"
+        }
+        if headers:
+            request_headers.update(headers)
+
+        request = Request(url, headers=request_headers)
+
+        try:
+            with urlopen(request, timeout=self.timeout) as raw:
+                response_headers = {k.lower(): v for k, v in raw.headers.items()}
+                body = self._decode_body(raw.read(), response_headers)
+                return FetchResponse(url, raw.status, response_headers, body, final_url=raw.geturl())
+
+        except HTTPError as e:
+            response_headers = {k.lower(): v for k, v in (e.headers or {}).items()}
+            try:
+                body = self._decode_body(e.read(), response_headers)
+            except (OSError, http.client.HTTPException, EOFError, zlib.error):
+                body = b""
+            return FetchResponse(url, e.code, response_headers, body)
+
+        except (URLError, socket.timeout, OSError, ValueError, zlib.error,
+                http.client.HTTPException, EOFError) as e:
+            # HTTPException - обрыв ответа (IncompleteRead), EOFError - обрезанный gzip
+            reason = getattr(e, "reason", e)
+            return FetchResponse(url, error=str(reason))
+
+    @staticmethod
+    def _decode_body(body: bytes, headers: Dict[str, str]) -> bytes:
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # Некоторые серверы отдают deflate без zlib-заголовка
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
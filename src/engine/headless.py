@@ -0,0 +1,327 @@
+"""
+Запуск проекта без графического интерфейса (cron, контейнеры, серверы без дисплея).
+
+Проекты без рендеринга выполняются без импорта Qt. Если в проекте есть блоки
+с рендерингом, QtWebEngine запускается на платформе offscreen, без окон,
+меню и тем.
+
+Коды возврата:
+    0 - проект выполнен без ошибок
+    1 - проект выполнен, но часть заданий завершилась ошибкой
+    2 - неверные аргументы или файл проекта
+    130 - выполнение прервано (SIGINT/SIGTERM)
+"""
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+from .blocks import needs_rendering
+from .fetcher import Fetcher
+from .resilience import ResilientFetcher, DeadLetterQueue
+from .run_engine import RunEngine, RunContext, DEFAULT_QUEUE_SIZE
+from .sinks import open_sink, available_formats
+
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Выполнение проекта Parser Bot без интерфейса")
+    parser.add_argument("project", help="файл проекта (.json)")
+    parser.add_argument("-o", "--output", default="-", help="файл результатов или '-' для stdout")
+    parser.add_argument("--format", choices=available_formats(),
+                        help="формат результатов (по умолчанию по расширению файла, иначе jsonl)")
+    parser.add_argument("--static", action="store_true",
+                        help="не запускать QtWebEngine, блоки с рендерингом завершатся ошибкой")
+    parser.add_argument("--render-pages", type=int, default=2, help="число страниц пула рендеринга")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="WARC", help="записать загруженные страницы в архив")
+    archive.add_argument("--replay", metavar="WARC", help="воспроизвести страницы из архива без сети")
+    parser.add_argument("--dead-letters", metavar="FILE", help="сохранять неудавшиеся задания в файл")
+    parser.add_argument("--retry-dead-letters", action="store_true",
+                        help="выполнить проект заново для URL из файла --dead-letters вместо URL источника")
+    parser.add_argument("--profile-json", metavar="FILE", help="сохранить профиль блоков в JSON")
+    parser.add_argument("--flamegraph", metavar="FILE", help="сохранить профиль в формате collapsed stacks")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="емкость очереди между блоками (0 - без ограничения)")
+    parser.add_argument("--progress", type=float, default=10.0,
+                        help="период вывода прогресса в секундах (0 - не выводить)")
+    args = parser.parse_args(argv)
+    if args.retry_dead_letters and not args.dead_letters:
+        parser.error("--retry-dead-letters требует --dead-letters")
+    return args
+
+
+class HeadlessRunner:
+
+    def __init__(self, args, on_progress: Callable[[RunEngine], None] = None, sink=None):
+        """
+        Выполнение одного проекта без интерфейса.
+
+        Args:
+            args: Аргументы командной строки (см. parse_args)
+            on_progress: Обработчик прогресса (если None, прогресс печатается в stderr)
+            sink: Приемник результатов (если None, открывается по args.output и args.format)
+        """
+        self.args = args
+        self.on_progress = on_progress
+        self.engine: Optional[RunEngine] = None
+        self.summary: Dict[str, Any] = {}
+        self.sink = sink
+        self.interrupted = False
+        self._archive_files = []
+        self._result: Dict[str, Any] = {}
+        self._error: Optional[Exception] = None
+        self._output_closed = False
+
+    def run(self, project_data: Dict[str, Any]) -> int:
+        use_qt = needs_rendering(project_data) and not self.args.static
+        profile = bool(self.args.profile_json or self.args.flamegraph)
+
+        stdout = sys.stdout
+        if self.sink is None:
+            self.sink = open_sink(self.args.output, self.args.format)
+            if self.args.output == "-":
+                # Сообщения модулей печатаются через print и не должны смешиваться с результатами
+                sys.stdout = sys.stderr
+
+        retry_entries = []
+        try:
+            fetcher = self._create_fetcher()
+            if self.args.retry_dead_letters:
+                retry_entries = fetcher.dead_letters.entries()
+                project_data = self._retry_project(project_data, retry_entries)
+            if use_qt:
+                summary = self._run_with_qt(project_data, fetcher, profile)
+            else:
+                context = RunContext(fetcher, on_result=self._write_result)
+                self.engine = RunEngine(project_data, context, profile=profile,
+                                   queue_size=self.args.queue_size)
+                summary = self._run_plain()
+        finally:
+            self._close_sink()
+            for archive_file in self._archive_files:
+                archive_file.close()
+            sys.stdout = stdout
+
+        if retry_entries:
+            self._finish_retry(fetcher.dead_letters, retry_entries, summary)
+        self.summary = summary
+        self._export_profile(summary)
+        self._print_summary(summary)
+
+        if self.interrupted:
+            return EXIT_INTERRUPTED
+        if summary["errors"] or summary["dead_letters"]:
+            return EXIT_FAILURES
+        return EXIT_OK
+
+    @staticmethod
+    def _retry_project(project_data: Dict[str, Any], entries) -> Dict[str, Any]:
+        from .batch import replace_source_urls
+
+        # Порядок сохраняется, повторы одного URL загружаются один раз
+        urls = list(dict.fromkeys(entry["url"] for entry in entries))
+        print(f"Повтор неудавшихся заданий: {len(urls)}", file=sys.stderr)
+        return replace_source_urls(project_data, urls)
+
+    def _finish_retry(self, dead_letters: DeadLetterQueue, entries, summary: Dict[str, Any]) -> None:
+        # Задание удаляется из очереди только после записи результатов: неудача повтора
+        # добавляет новое задание, а после прерванного запуска остаются и прежние
+        retried = {id(entry) for entry in entries}
+        failed_again = {entry["url"] for entry in dead_letters.entries() if id(entry) not in retried}
+        if not (self.interrupted or self._output_closed or summary["stopped"]):
+            dead_letters.remove(entries)
+        else:
+            dead_letters.remove([entry for entry in entries if entry["url"] in failed_again])
+
+    def _write_result(self, record: Any) -> None:
+        if self._output_closed:
+            return
+        try:
+            self.sink.write(record)
+        except BrokenPipeError:
+            # Читатель закрыл конвейер (например, head) - дальше выполнять нечего
+            self._output_closed = True
+            self.engine.stop()
+
+    def _close_sink(self) -> None:
+        try:
+            self.sink.close()
+        except BrokenPipeError:
+            self._output_closed = True
+        if self._output_closed:
+            # Иначе интерпретатор сообщит об ошибке при сбросе stdout на выходе
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.__stdout__.fileno())
+
+    def _create_fetcher(self) -> ResilientFetcher:
+        dead_letters = DeadLetterQueue(self.args.dead_letters)
+
+        if self.args.record:
+            from .archive import ArchiveWriter, RecordingFetcher
+            writer = ArchiveWriter(self.args.record)
+            self._archive_files.append(writer)
+            return ResilientFetcher(RecordingFetcher(writer), dead_letters=dead_letters)
+        if self.args.replay:
+            from .archive import ArchiveReader, ReplayFetcher
+            reader = ArchiveReader(self.args.replay)
+            self._archive_files.append(reader)
+            return ResilientFetcher(ReplayFetcher(reader), dead_letters=dead_letters)
+        return ResilientFetcher(Fetcher(), dead_letters=dead_letters)
+
+    def _run_plain(self) -> Dict[str, Any]:
+        self._install_signal_handlers()
+        thread = self._start_engine()
+
+        interval = self.args.progress if self.args.progress > 0 else None
+        while thread.is_alive():
+            thread.join(interval)
+            if thread.is_alive():
+                self._report_progress()
+        return self._take_result()
+
+    def _start_engine(self, on_done=None) -> threading.Thread:
+        self._result = {}
+        self._error = None
+
+        def run_engine():
+            try:
+                self._result = self.engine.run()
+            except Exception as e:
+                self._error = e
+            finally:
+                if on_done:
+                    on_done()
+
+        thread = threading.Thread(target=run_engine, name="project-run", daemon=True)
+        thread.start()
+        return thread
+
+    def _take_result(self) -> Dict[str, Any]:
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _run_with_qt(self, project_data: Dict[str, Any], fetcher: ResilientFetcher,
+                     profile: bool) -> Dict[str, Any]:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        # Песочница Chromium не запускается от root (типичный случай в контейнерах)
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            os.environ.setdefault("QTWEBENGINE_DISABLE_SANDBOX", "1")
+
+        # Модули QtWebEngine должны быть импортированы до создания приложения
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtGui import QGuiApplication
+        from .render_pool import RenderPool
+        from .render_bridge import RenderBridge
+
+        # В пакетном режиме процесс выполняет несколько проектов подряд с одним приложением
+        app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+        app.setApplicationName("Parser Bot")
+
+        pool = RenderPool(size=self.args.render_pages, controller=fetcher.fetcher.controller,
+                          retry_policy=fetcher.retry_policy, breaker=fetcher.breaker,
+                          dead_letters=fetcher.dead_letters)
+        bridge = RenderBridge(pool)
+        bridge.finished.connect(app.quit)
+
+        interceptor = None
+        if self.args.record or self.args.replay:
+            from .archive import ArchiveServer
+            from .archive_interceptor import install_archive
+            if self.args.record:
+                server = ArchiveServer("record", writer=fetcher.fetcher.writer,
+                                       fetcher=Fetcher(controller=fetcher.fetcher.controller))
+            else:
+                server = ArchiveServer("replay", reader=fetcher.fetcher.reader)
+            interceptor = install_archive(pool.profile, server)
+
+        context = RunContext(fetcher, renderer=bridge.render, on_result=self._write_result)
+        self.engine = RunEngine(project_data, context, profile=profile,
+                                queue_size=self.args.queue_size)
+
+        self._install_signal_handlers()
+
+        # Обработчики сигналов Python выполняются только когда интерпретатор получает управление
+        signal_timer = QTimer()
+        signal_timer.timeout.connect(lambda: None)
+        signal_timer.start(200)
+
+        progress_timer = QTimer()
+        if self.args.progress > 0:
+            progress_timer.timeout.connect(self._report_progress)
+            progress_timer.start(int(self.args.progress * 1000))
+
+        self._start_engine(on_done=bridge.finished.emit)
+        app.exec()
+
+        if interceptor is not None:
+            interceptor.server.stop()
+        return self._take_result()
+
+    def _install_signal_handlers(self) -> None:
+        def handle(signum, frame):
+            self.interrupted = True
+            self.engine.stop()
+
+        signal.signal(signal.SIGINT, handle)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, handle)
+
+    def _report_progress(self) -> None:
+        if self.on_progress is not None:
+            self.on_progress(self.engine)
+            return
+
+        context = self.engine.context
+        print(f"[{time.strftime('%H:%M:%S')}] записей: {context.result_count}, "
+              f"неудач: {context.fetcher.dead_letters.added_count}", file=sys.stderr)
+        stats = context.fetcher.fetcher.stats()
+        if stats:
+            print(stats, file=sys.stderr)
+
+    def _export_profile(self, summary: Dict[str, Any]) -> None:
+        profiler = self.engine.profiler if self.engine else None
+        if profiler is None:
+            return
+        try:
+            if self.args.profile_json:
+                profiler.export_json(self.args.profile_json,
+                                     {k: v for k, v in summary.items() if k != "blocks"})
+            if self.args.flamegraph:
+                profiler.export_collapsed(self.args.flamegraph)
+        except OSError as e:
+            print(f"Ошибка сохранения профиля: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _print_summary(summary: Dict[str, Any]) -> None:
+        print(f"Готово за {summary.get('elapsed_s', 0.0):.1f} с: записей {summary.get('records', 0)}, "
+              f"ошибок {summary.get('errors', 0)}, неудач {summary.get('dead_letters', 0)}"
+              + (" (прервано)" if summary.get("stopped") else ""), file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    from ..core.project_manager import ProjectManager
+
+    try:
+        project_data = ProjectManager.load_project_data(args.project)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка открытия проекта: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    runner = HeadlessRunner(args)
+    try:
+        return runner.run(project_data)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка запуска проекта: {e}", file=sys.stderr)
+        return EXIT_USAGE
@@ -0,0 +1,559 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+from urllib.parse import urlsplit, parse_qs, quote
+
+
+STATE_PENDING = "pending"
+STATE_LEASED = "leased"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+# Заголовок с ключом запроса: повтор POST с тем же ключом получает сохраненный ответ
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Число последних ответов, которые сервер хранит для повторов
+REPLY_CACHE_SIZE = 4096
+
+
+class Job:
+
+    def __init__(self, job_id: int, payload: Dict[str, Any], attempts: int, lease_expires: float):
+        """
+        Задание, выданное рабочему узлу в аренду.
+
+        Args:
+            job_id: Идентификатор задания
+            payload: Данные задания (например, {"urls": [...]})
+            attempts: Номер текущей попытки (с 1)
+            lease_expires: Время окончания аренды (time.time())
+        """
+        self.job_id = job_id
+        self.payload = payload
+        self.attempts = attempts
+        self.lease_expires = lease_expires
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"job_id": self.job_id, "payload": self.payload,
+                "attempts": self.attempts, "lease_expires": self.lease_expires}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        return cls(data["job_id"], data["payload"], data["attempts"], data["lease_expires"])
+
+
+class JobQueue(ABC):
+    """
+    Общая очередь заданий с арендой (доставка не менее одного раза).
+
+    Узел берет задания в аренду на lease_seconds и продлевает ее сигналами
+    heartbeat. Если аренда истекла (узел упал), задание снова выдается
+    другому узлу. Результаты сдаются вместе с завершением задания: повторная
+    сдача того же задания заменяет его результаты, поэтому повторная доставка
+    не приводит к дублированию записей.
+    """
+
+    @abstractmethod
+    def put_many(self, payloads: List[Dict[str, Any]]) -> List[int]:
+        ...
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float = 60.0, limit: int = 1) -> List[Job]:
+        ...
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = 60.0) -> bool:
+        ...
+
+    @abstractmethod
+    def complete(self, job_id: int, worker_id: str, records: List[Any],
+                 summary: Dict[str, Any] = None) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        ...
+
+    @abstractmethod
+    def results(self, after_id: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def set_meta(self, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def get_meta(self, key: str) -> Any:
+        ...
+
+    def put(self, payload: Dict[str, Any]) -> int:
+        return self.put_many([payload])[0]
+
+    def is_drained(self) -> bool:
+        """True если не осталось ожидающих и арендованных заданий"""
+        stats = self.stats()
+        return stats.get(STATE_PENDING, 0) == 0 and stats.get(STATE_LEASED, 0) == 0
+
+
+class SQLiteJobQueue(JobQueue):
+
+    def __init__(self, file_path: str, max_attempts: int = 5, retry_delay: float = 5.0):
+        """
+        Очередь заданий в файле SQLite для нескольких процессов одного хоста.
+
+        Args:
+            file_path: Путь к файлу базы
+            max_attempts: Число попыток, после которого задание считается неудачным
+            retry_delay: Базовая задержка перед повтором после ошибки в секундах
+        """
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.file_path), timeout=30.0,
+                                           isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        with self._lock:
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    error TEXT,
+                    summary TEXT,
+                    updated_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, available_at);
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id INTEGER NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS results_job ON results (job_id);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def put_many(self, payloads: List[Dict[str, Any]]) -> List[int]:
+        now = time.time()
+        with self._lock, self._transaction() as cursor:
+            ids = []
+            for payload in payloads:
+                cursor.execute("INSERT INTO jobs (payload, updated_at) VALUES (?, ?)",
+                               (json.dumps(payload, ensure_ascii=False), now))
+                ids.append(cursor.lastrowid)
+            return ids
+
+    def lease(self, worker_id: str, lease_seconds: float = 60.0, limit: int = 1) -> List[Job]:
+        now = time.time()
+        expires = now + lease_seconds
+        with self._lock, self._transaction() as cursor:
+            # Истекшая аренда - узел не подтвердил задание вовремя, задание выдается повторно
+            self._expire_leases(cursor, now)
+            rows = cursor.execute(
+                "SELECT id, payload, attempts FROM jobs WHERE state = ? AND available_at <= ? "
+                "ORDER BY id LIMIT ?", (STATE_PENDING, now, limit)
+            ).fetchall()
+
+            jobs = []
+            for job_id, payload, attempts in rows:
+                cursor.execute(
+                    "UPDATE jobs SET state = ?, attempts = ?, lease_owner = ?, lease_expires = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (STATE_LEASED, attempts + 1, worker_id, expires, now, job_id)
+                )
+                jobs.append(Job(job_id, json.loads(payload), attempts + 1, expires))
+            return jobs
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = 60.0) -> bool:
+        now = time.time()
+        with self._lock, self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, STATE_LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, records: List[Any],
+                 summary: Dict[str, Any] = None) -> bool:
+        now = time.time()
+        with self._lock, self._transaction() as cursor:
+            # Сдать задание может только текущий арендатор; после истечения аренды
+            # результат принимается, если задание еще никем не завершено
+            row = cursor.execute("SELECT state, lease_owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row[0] == STATE_DONE:
+                return False
+            if row[0] == STATE_LEASED and row[1] != worker_id:
+                return False
+
+            cursor.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+            cursor.executemany(
+                "INSERT INTO results (job_id, data) VALUES (?, ?)",
+                ((job_id, json.dumps(record, ensure_ascii=False, default=str)) for record in records)
+            )
+            cursor.execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, error = NULL, "
+                "summary = ?, updated_at = ? WHERE id = ?",
+                (STATE_DONE, json.dumps(summary or {}), now, job_id)
+            )
+            return True
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        now = time.time()
+        with self._lock, self._transaction() as cursor:
+            row = cursor.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND state = ? AND lease_owner = ?",
+                (job_id, STATE_LEASED, worker_id)
+            ).fetchone()
+            if row is None:
+                return False
+            self._release(cursor, job_id, row[0], error, now)
+            return True
+
+    def results(self, after_id: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, job_id, data FROM results WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, limit)
+            ).fetchall()
+        return [{"id": row[0], "job_id": row[1], "record": json.loads(row[2])} for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+            result_count = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        stats = {STATE_PENDING: 0, STATE_LEASED: 0, STATE_DONE: 0, STATE_FAILED: 0}
+        stats.update(dict(rows))
+        stats["results"] = result_count
+        return stats
+
+    def set_meta(self, key: str, value: Any) -> None:
+        with self._lock, self._transaction() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                           (key, json.dumps(value, ensure_ascii=False)))
+
+    def get_meta(self, key: str) -> Any:
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _expire_leases(self, cursor, now: float) -> None:
+        rows = cursor.execute(
+            "SELECT id, attempts FROM jobs WHERE state = ? AND lease_expires < ?",
+            (STATE_LEASED, now)
+        ).fetchall()
+        for job_id, attempts in rows:
+            self._release(cursor, job_id, attempts, "lease expired", now)
+
+    def _release(self, cursor, job_id: int, attempts: int, error: str, now: float) -> None:
+        if attempts >= self.max_attempts:
+            state, available_at = STATE_FAILED, now
+        else:
+            state, available_at = STATE_PENDING, now + self.retry_delay * (2 ** (attempts - 1))
+        cursor.execute(
+            "UPDATE jobs SET state = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL, "
+            "error = ?, updated_at = ? WHERE id = ?",
+            (state, available_at, error, now, job_id)
+        )
+
+    def _transaction(self):
+        return _Transaction(self._connection)
+
+
+class _Transaction:
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.cursor = None
+
+    def __enter__(self) -> sqlite3.Cursor:
+        # IMMEDIATE берет блокировку записи сразу, чтобы два процесса не арендовали одно задание
+        self.cursor = self.connection.cursor()
+        self.cursor.execute("BEGIN IMMEDIATE")
+        return self.cursor
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.cursor.execute("COMMIT")
+        else:
+            self.cursor.execute("ROLLBACK")
+        self.cursor.close()
+
+
+class HttpJobQueue(JobQueue):
+
+    def __init__(self, base_url: str, timeout: float = 30.0, retries: int = 5):
+        """
+        Клиент сетевой очереди заданий (JobQueueServer или совместимый сервис).
+
+        Args:
+            base_url: Адрес сервера, например http://queue-host:8700
+            timeout: Таймаут запроса в секундах
+            retries: Число повторов при сетевых ошибках; повторный POST передает тот же
+                ключ IDEMPOTENCY_HEADER, и сервер не выполняет изменение второй раз
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+
+    def put_many(self, payloads: List[Dict[str, Any]]) -> List[int]:
+        return self._call("POST", "/jobs", {"payloads": payloads})["ids"]
+
+    def lease(self, worker_id: str, lease_seconds: float = 60.0, limit: int = 1) -> List[Job]:
+        response = self._call("POST", "/lease", {"worker_id": worker_id,
+                                                 "lease_seconds": lease_seconds, "limit": limit})
+        return [Job.from_dict(job) for job in response["jobs"]]
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = 60.0) -> bool:
+        return self._call("POST", "/heartbeat", {"job_id": job_id, "worker_id": worker_id,
+                                                 "lease_seconds": lease_seconds})["ok"]
+
+    def complete(self, job_id: int, worker_id: str, records: List[Any],
+                 summary: Dict[str, Any] = None) -> bool:
+        return self._call("POST", "/complete", {"job_id": job_id, "worker_id": worker_id,
+                                                "records": records, "summary": summary})["ok"]
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        return self._call("POST", "/fail", {"job_id": job_id, "worker_id": worker_id,
+                                            "error": error})["ok"]
+
+    def results(self, after_id: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        return self._call("GET", f"/results?after={after_id}&limit={limit}")["results"]
+
+    def stats(self) -> Dict[str, int]:
+        return self._call("GET", "/stats")
+
+    def set_meta(self, key: str, value: Any) -> None:
+        self._call("POST", "/meta", {"key": key, "value": value})
+
+    def get_meta(self, key: str) -> Any:
+        return self._call("GET", f"/meta?key={quote(key, safe='')}")["value"]
+
+    def _call(self, method: str, path: str, body: Dict[str, Any] = None) -> Dict[str, Any]:
+        data = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8') if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if method == "POST":
+            # Ответ мог потеряться после выполнения запроса: повтор не должен поставить задания
+            # второй раз или сдать уже сданное задание
+            headers[IDEMPOTENCY_HEADER] = uuid.uuid4().hex
+        request = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+
+        for attempt in range(self.retries + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read().decode('utf-8'))
+            except urllib.error.HTTPError:
+                # Ответ сервера с ошибкой повторять бесполезно
+                raise
+            except (urllib.error.URLError, OSError):
+                # Сервер очереди временно недоступен - аренда переживет короткий перерыв
+                if attempt == self.retries:
+                    raise
+                time.sleep(min(10.0, 0.5 * (2 ** attempt)))
+
+
+class JobQueueServer:
+
+    def __init__(self, queue: JobQueue, host: str = "127.0.0.1", port: int = 0):
+        """
+        HTTP сервер очереди заданий поверх локальной очереди.
+
+        Используется как сетевая очередь для нескольких машин и как локальная
+        замена внешнего сервиса при проверке HttpJobQueue.
+
+        Args:
+            queue: Очередь, в которой хранятся задания (обычно SQLiteJobQueue)
+            host: Адрес для прослушивания ("0.0.0.0" - все интерфейсы)
+            port: Порт (0 - выбрать свободный)
+        """
+        self.queue = queue
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+        # Ключ запроса -> ответ (последние REPLY_CACHE_SIZE запросов)
+        self._replies: "OrderedDict[str, _Reply]" = OrderedDict()
+        self._replies_lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        host = self._server.server_address[0]
+        if host == "0.0.0.0":
+            host = "127.0.0.1"
+        return f"http://{host}:{self.port}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _reply_once(self, key: str, handle: Callable[[], Any]) -> Any:
+        """
+        Выполняет запрос один раз для ключа; повтор с тем же ключом получает тот же ответ.
+
+        Повтор, пришедший во время выполнения исходного запроса, ждет его завершения.
+        """
+        if not key:
+            return handle()
+        with self._replies_lock:
+            reply = self._replies.get(key)
+            owner = reply is None
+            if owner:
+                reply = self._replies[key] = _Reply()
+                while len(self._replies) > REPLY_CACHE_SIZE:
+                    self._replies.popitem(last=False)
+            else:
+                self._replies.move_to_end(key)
+
+        if not owner:
+            reply.done.wait()
+            if reply.ok:
+                return reply.data
+            # Исходный запрос завершился ошибкой и ничего не изменил
+            return handle()
+        try:
+            reply.data = handle()
+            reply.ok = True
+            return reply.data
+        finally:
+            reply.done.set()
+
+    def _create_handler(self):
+        queue = self.queue
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if url.path == "/stats":
+                    self._reply(queue.stats())
+                elif url.path == "/results":
+                    self._reply({"results": queue.results(int(query.get("after", 0)),
+                                                          int(query.get("limit", 1000)))})
+                elif url.path == "/meta":
+                    self._reply({"value": queue.get_meta(query.get("key", ""))})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length).decode('utf-8')) if length else {}
+                except ValueError:
+                    self.send_error(400, "invalid JSON")
+                    return
+
+                path = urlsplit(self.path).path
+                data = server._reply_once(self.headers.get(IDEMPOTENCY_HEADER), lambda: self._post(path, body))
+                if data is None:
+                    self.send_error(404)
+                else:
+                    self._reply(data)
+
+            def _post(self, path: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                if path == "/jobs":
+                    return {"ids": queue.put_many(body["payloads"])}
+                if path == "/lease":
+                    jobs = queue.lease(body["worker_id"], body.get("lease_seconds", 60.0), body.get("limit", 1))
+                    return {"jobs": [job.to_dict() for job in jobs]}
+                if path == "/heartbeat":
+                    return {"ok": queue.heartbeat(body["job_id"], body["worker_id"],
+                                                  body.get("lease_seconds", 60.0))}
+                if path == "/complete":
+                    return {"ok": queue.complete(body["job_id"], body["worker_id"],
+                                                 body.get("records", []), body.get("summary"))}
+                if path == "/fail":
+                    return {"ok": queue.fail(body["job_id"], body["worker_id"], body.get("error", ""))}
+                if path == "/meta":
+                    queue.set_meta(body["key"], body["value"])
+                    return {"ok": True}
+                return None
+
+            def _reply(self, data: Dict[str, Any]) -> None:
+                payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class _Reply:
+
+    __slots__ = ("done", "ok", "data")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+        self.data = None
+
+
+def open_job_queue(address: str) -> JobQueue:
+    """
+    Открывает очередь по адресу.
+
+    Args:
+        address: http(s)://host:port для сетевой очереди или путь к файлу SQLite
+
+    Returns:
+        Очередь заданий
+    """
+    if address.startswith(("http://", "https://")):
+        return HttpJobQueue(address)
+    return SQLiteJobQueue(address)
+
+
+def new_worker_id() -> str:
+    """Возвращает уникальный идентификатор рабочего узла"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
@@ -0,0 +1,159 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, List
+
+
+class BlockStats:
+
+    __slots__ = ("block_id", "block_type", "wall_ns", "cpu_ns", "queue_wait_ns",
+                 "blocked_ns", "items_in", "items_out", "errors")
+
+    def __init__(self, block_id: str, block_type: str):
+        """
+        Счетчики одного рабочего потока блока.
+
+        Каждый поток пишет только в свой объект, поэтому блокировки
+        при обработке элементов не нужны.
+        """
+        self.block_id = block_id
+        self.block_type = block_type
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.queue_wait_ns = 0
+        self.blocked_ns = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+
+
+class BlockProfiler:
+
+    def __init__(self):
+        """
+        Профилировщик выполнения блоков проекта.
+
+        Собирает по каждому блоку время выполнения (общее и процессорное),
+        число входящих и исходящих элементов, время ожидания в очереди
+        и время простоя из-за заполненной очереди следующего блока.
+        """
+        self._stats: List[BlockStats] = []
+        self._stacks: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def create_stats(self, block_id: str, block_type: str) -> BlockStats:
+        """
+        Создает счетчики для очередного рабочего потока блока.
+
+        Args:
+            block_id: Идентификатор блока
+            block_type: Тип блока
+
+        Returns:
+            Объект счетчиков, принадлежащий вызывающему потоку
+        """
+        stats = BlockStats(block_id, block_type)
+        with self._lock:
+            self._stats.append(stats)
+        return stats
+
+    def set_stack(self, block_id: str, stack: List[str]) -> None:
+        """
+        Задает путь блока в графе (от источника) для flamegraph.
+
+        Args:
+            block_id: Идентификатор блока
+            stack: Идентификаторы блоков от источника до данного блока включительно
+        """
+        self._stacks[block_id] = list(stack)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Сводит счетчики всех потоков по блокам.
+
+        Значения читаются без блокировки рабочих потоков, поэтому во время
+        выполнения отчет может отставать на один элемент.
+
+        Returns:
+            Список словарей {block_id, block_type, wall_ms, cpu_ms, queue_wait_ms,
+            blocked_ms, items_in, items_out, errors, workers}
+        """
+        with self._lock:
+            all_stats = list(self._stats)
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for stats in all_stats:
+            row = merged.setdefault(stats.block_id, {
+                "block_id": stats.block_id,
+                "block_type": stats.block_type,
+                "wall_ns": 0, "cpu_ns": 0, "queue_wait_ns": 0, "blocked_ns": 0,
+                "items_in": 0, "items_out": 0, "errors": 0, "workers": 0
+            })
+            row["wall_ns"] += stats.wall_ns
+            row["cpu_ns"] += stats.cpu_ns
+            row["queue_wait_ns"] += stats.queue_wait_ns
+            row["blocked_ns"] += stats.blocked_ns
+            row["items_in"] += stats.items_in
+            row["items_out"] += stats.items_out
+            row["errors"] += stats.errors
+            row["workers"] += 1
+
+        report = []
+        for row in merged.values():
+            report.append({
+                "block_id": row["block_id"],
+                "block_type": row["block_type"],
+                "wall_ms": row.pop("wall_ns") / 1e6,
+                "cpu_ms": row.pop("cpu_ns") / 1e6,
+                "queue_wait_ms": row.pop("queue_wait_ns") / 1e6,
+                "blocked_ms": row.pop("blocked_ns") / 1e6,
+                **{k: row[k] for k in ("items_in", "items_out", "errors", "workers")}
+            })
+        return report
+
+    def export_json(self, file_path: str, extra: Dict[str, Any] = None) -> None:
+        """
+        Сохраняет отчет в JSON.
+
+        Args:
+            file_path: Путь к файлу
+            extra: Дополнительные сведения о запуске (время, число записей и т.п.)
+        """
+        data = {"blocks": self.report()}
+        if extra:
+            data.update(extra)
+        self._write(file_path, json.dumps(data, ensure_ascii=False, indent=2))
+
+    def export_collapsed(self, file_path: str, root: str = "run") -> None:
+        """
+        Сохраняет отчет в формате collapsed stacks для flamegraph.pl / speedscope.
+
+        Каждая строка - путь блока в графе и его собственное время в микросекундах.
+
+        Args:
+            file_path: Путь к файлу
+            root: Имя корневого кадра
+        """
+        self._write(file_path, "\n".join(self.collapsed_lines(root)) + "\n")
+
+    def collapsed_lines(self, root: str = "run") -> List[str]:
+        lines = []
+        for row in self.report():
+            stack = self._stacks.get(row["block_id"], [row["block_id"]])
+            frames = [root] + [self._frame_name(block_id) for block_id in stack]
+            value = int(row["wall_ms"] * 1000)
+            if value > 0:
+                lines.append(f"{';'.join(frames)} {value}")
+        return lines
+
+    def _frame_name(self, block_id: str) -> str:
+        # Символы ';' и пробел разделяют кадры и значение в формате collapsed stacks
+        return block_id.replace(";", "_").replace(" ", "_")
+
+    @staticmethod
+    def _write(file_path: str, content: str) -> None:
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
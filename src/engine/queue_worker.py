@@ -0,0 +1,269 @@
+"""
+Распределенное выполнение проекта через общую очередь заданий.
+
+Пример (одна машина - очередь в SQLite, несколько процессов):
+    python run_queue.py submit queue.db project.json --urls urls.txt --chunk-size 200
+    python run_queue.py work queue.db          # запускается на каждом узле/процессе
+    python run_queue.py collect queue.db -o results.jsonl
+
+Пример (несколько машин - сетевая очередь):
+    python run_queue.py serve queue.db --host 0.0.0.0 --port 8700
+    python run_queue.py work http://queue-host:8700
+"""
+import argparse
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Any, List
+
+from .batch import read_source_urls, replace_source_urls
+from .headless import EXIT_OK, EXIT_USAGE, EXIT_INTERRUPTED
+from .job_queue import Job, JobQueue, JobQueueServer, SQLiteJobQueue, open_job_queue, new_worker_id
+from .sinks import MemorySink, open_sink, available_formats
+
+
+PROJECT_META_KEY = "project"
+
+
+def submit_project(queue: JobQueue, project_data: Dict[str, Any], urls: List[str] = None,
+                   chunk_size: int = 100) -> int:
+    """
+    Ставит проект в очередь: данные проекта сохраняются один раз, задания содержат части списка URL.
+
+    Args:
+        queue: Очередь заданий
+        project_data: Данные проекта с одним блоком-источником URL
+        urls: Список URL (если None, берется из блока-источника проекта)
+        chunk_size: Число URL в одном задании
+
+    Returns:
+        Число поставленных заданий
+    """
+    from .blocks import UrlListBlock
+
+    data = project_data.get("data", project_data)
+    if urls is None:
+        sources = [block for block in data.get("blocks", []) if block.get("type") == UrlListBlock.block_type]
+        if len(sources) != 1:
+            raise ValueError(f"Project must have exactly one URL source block, found {len(sources)}")
+        urls = read_source_urls(sources[0])
+
+    # Узлы получают проект из очереди, поэтому список URL в нем не нужен
+    queue.set_meta(PROJECT_META_KEY, replace_source_urls(project_data, []))
+
+    payloads = [{"urls": urls[start:start + chunk_size]} for start in range(0, len(urls), chunk_size)]
+    for start in range(0, len(payloads), 500):
+        queue.put_many(payloads[start:start + 500])
+    return len(payloads)
+
+
+class QueueWorker:
+
+    def __init__(self, queue: JobQueue, worker_id: str = None, lease_seconds: float = 120.0,
+                 poll_interval: float = 2.0, exit_when_drained: bool = True, runner_options: List[str] = None):
+        """
+        Рабочий узел: берет задания из очереди, выполняет проект и сдает результаты.
+
+        Args:
+            queue: Очередь заданий (SQLite или сетевая)
+            worker_id: Идентификатор узла (если None, генерируется)
+            lease_seconds: Длительность аренды задания; продлевается каждые lease_seconds / 3
+            poll_interval: Пауза между запросами к пустой очереди
+            exit_when_drained: Завершаться, когда в очереди не осталось заданий
+            runner_options: Дополнительные аргументы HeadlessRunner (например, ["--static"])
+        """
+        self.queue = queue
+        self.worker_id = worker_id or new_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.exit_when_drained = exit_when_drained
+        self.runner_options = runner_options or []
+
+        self.completed = 0
+        self.failed = 0
+        self._project = None
+        self._stop_event = threading.Event()
+        self._runner = None
+
+    def run(self) -> int:
+        """
+        Обрабатывает задания до опустошения очереди или вызова stop().
+
+        Returns:
+            Число выполненных заданий
+        """
+        self._project = self.queue.get_meta(PROJECT_META_KEY)
+        if self._project is None:
+            raise ValueError("Queue has no project, submit one first")
+
+        while not self._stop_event.is_set():
+            jobs = self.queue.lease(self.worker_id, self.lease_seconds)
+            if not jobs:
+                if self.exit_when_drained and self.queue.is_drained():
+                    break
+                self._stop_event.wait(self.poll_interval)
+                continue
+
+            for job in jobs:
+                self._process(job)
+        return self.completed
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._runner is not None and self._runner.engine is not None:
+            self._runner.engine.stop()
+
+    def _process(self, job: Job) -> None:
+        from .headless import parse_args, HeadlessRunner
+
+        sink = MemorySink()
+        self._runner = HeadlessRunner(parse_args(["-", "--progress", "0"] + self.runner_options), sink=sink)
+
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, heartbeat_stop),
+                                     name=f"heartbeat-{job.job_id}", daemon=True)
+        heartbeat.start()
+
+        # HeadlessRunner перехватывает SIGINT и SIGTERM на время задания
+        signals = [signal.SIGINT] + ([signal.SIGTERM] if hasattr(signal, "SIGTERM") else [])
+        handlers = {signum: signal.getsignal(signum) for signum in signals}
+        try:
+            exit_code = self._runner.run(replace_source_urls(self._project, job.payload.get("urls", [])))
+        except Exception as e:
+            exit_code = EXIT_USAGE
+            error = str(e)
+        else:
+            error = None
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+            for signum, handler in handlers.items():
+                # None - обработчик установлен не из Python
+                signal.signal(signum, handler if handler is not None else signal.SIG_DFL)
+
+        if exit_code == EXIT_INTERRUPTED:
+            self._stop_event.set()
+
+        if exit_code == EXIT_INTERRUPTED or error is not None:
+            # Задание вернется в очередь и будет выдано повторно
+            self.queue.fail(job.job_id, self.worker_id, error or "interrupted")
+            self.failed += 1
+            return
+
+        summary = {k: v for k, v in self._runner.summary.items() if k != "blocks"}
+        summary["worker_id"] = self.worker_id
+        if self.queue.complete(job.job_id, self.worker_id, sink.records, summary):
+            self.completed += 1
+        else:
+            print(f"Задание {job.job_id} уже сдано другим узлом, результат отброшен", file=sys.stderr)
+
+    def _heartbeat(self, job: Job, stop_event: threading.Event) -> None:
+        interval = self.lease_seconds / 3
+        while not stop_event.wait(interval):
+            try:
+                if not self.queue.heartbeat(job.job_id, self.worker_id, self.lease_seconds):
+                    print(f"Аренда задания {job.job_id} потеряна", file=sys.stderr)
+                    return
+            except OSError as e:
+                print(f"Ошибка продления аренды задания {job.job_id}: {e}", file=sys.stderr)
+
+
+def collect_results(queue: JobQueue, target: str = "-", sink_format: str = None,
+                    batch_size: int = 5000) -> int:
+    """
+    Выгружает результаты из очереди в приемник.
+
+    Returns:
+        Число выгруженных записей
+    """
+    sink = open_sink(target, sink_format)
+    after_id = 0
+    try:
+        while True:
+            rows = queue.results(after_id, batch_size)
+            if not rows:
+                break
+            for row in rows:
+                sink.write(row["record"])
+            after_id = rows[-1]["id"]
+    finally:
+        sink.close()
+    return sink.count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Распределенное выполнение проектов Parser Bot")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="поставить проект в очередь")
+    submit.add_argument("queue", help="файл SQLite или адрес сервера очереди")
+    submit.add_argument("project", help="файл проекта (.json)")
+    submit.add_argument("--urls", metavar="FILE", help="файл URL вместо источника проекта")
+    submit.add_argument("--chunk-size", type=int, default=100, help="число URL в одном задании")
+
+    work = commands.add_parser("work", help="выполнять задания из очереди")
+    work.add_argument("queue", help="файл SQLite или адрес сервера очереди")
+    work.add_argument("--lease", type=float, default=120.0, help="длительность аренды в секундах")
+    work.add_argument("--forever", action="store_true", help="ждать новых заданий после опустошения очереди")
+    work.add_argument("--static", action="store_true", help="не запускать QtWebEngine")
+    work.add_argument("--render-pages", type=int, default=2, help="число страниц рендеринга")
+
+    serve = commands.add_parser("serve", help="сетевой сервер очереди поверх файла SQLite")
+    serve.add_argument("database", help="файл SQLite")
+    serve.add_argument("--host", default="127.0.0.1", help="адрес для прослушивания")
+    serve.add_argument("--port", type=int, default=8700, help="порт")
+
+    collect = commands.add_parser("collect", help="выгрузить результаты")
+    collect.add_argument("queue", help="файл SQLite или адрес сервера очереди")
+    collect.add_argument("-o", "--output", default="-", help="файл результатов или '-' для stdout")
+    collect.add_argument("--format", choices=available_formats(), help="формат результатов")
+
+    status = commands.add_parser("status", help="состояние очереди")
+    status.add_argument("queue", help="файл SQLite или адрес сервера очереди")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    try:
+        if args.command == "serve":
+            server = JobQueueServer(SQLiteJobQueue(args.database), args.host, args.port)
+            print(f"Очередь заданий: {server.base_url}", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            return EXIT_OK
+
+        queue = open_job_queue(args.queue)
+
+        if args.command == "submit":
+            from ..core.project_manager import ProjectManager
+            project_data = ProjectManager.load_project_data(args.project)
+            urls = read_source_urls({"params": {"file": args.urls}}) if args.urls else None
+            count = submit_project(queue, project_data, urls, args.chunk_size)
+            print(f"Поставлено заданий: {count}", file=sys.stderr)
+        elif args.command == "work":
+            options = ["--render-pages", str(args.render_pages)] + (["--static"] if args.static else [])
+            worker = QueueWorker(queue, lease_seconds=args.lease,
+                                 exit_when_drained=not args.forever, runner_options=options)
+            start = time.perf_counter()
+            try:
+                worker.run()
+            except KeyboardInterrupt:
+                worker.stop()
+                return EXIT_INTERRUPTED
+            print(f"Узел {worker.worker_id}: выполнено заданий {worker.completed}, "
+                  f"возвращено в очередь {worker.failed} за {time.perf_counter() - start:.1f} с", file=sys.stderr)
+        elif args.command == "collect":
+            count = collect_results(queue, args.output, args.format)
+            print(f"Выгружено записей: {count}", file=sys.stderr)
+        elif args.command == "status":
+            for key, value in queue.stats().items():
+                print(f"{key}: {value}")
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    return EXIT_OK
@@ -0,0 +1,59 @@
+import threading
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .render_pool import RenderPool, RenderResult
+
+
+class _RenderWaiter:
+
+    def __init__(self, url: str):
+        self.url = url
+        self.html: Optional[str] = None
+        self.event = threading.Event()
+
+    def done(self, result: RenderResult) -> None:
+        self.html = result.html if result.ok else None
+        self.event.set()
+
+
+class RenderBridge(QObject):
+
+    # Сигналы испускаются из рабочих потоков движка и обрабатываются в GUI-потоке
+    _requested = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, pool: RenderPool, parent=None):
+        """
+        Доступ к пулу рендеринга из рабочих потоков движка.
+
+        RenderPool живет в GUI-потоке, а блоки выполняются в своих потоках:
+        мост передает задание в GUI-поток через сигнал и блокирует только
+        вызвавший поток до получения результата.
+
+        Args:
+            pool: Пул страниц QWebEngine
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.pool = pool
+        self._requested.connect(self._submit)
+
+    def render(self, url: str) -> Optional[str]:
+        """
+        Рендерит страницу (вызывается из рабочего потока, не из GUI-потока).
+
+        Args:
+            url: Адрес страницы
+
+        Returns:
+            HTML страницы или None, если задание ушло в очередь неудач
+        """
+        waiter = _RenderWaiter(url)
+        self._requested.emit(waiter)
+        waiter.event.wait()
+        return waiter.html
+
+    def _submit(self, waiter: _RenderWaiter) -> None:
+        self.pool.submit(waiter.url, callback=waiter.done, on_failure=waiter.done)
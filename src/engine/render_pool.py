@@ -0,0 +1,241 @@
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineLoadingInfo
+
+from .concurrency import AdaptiveConcurrencyController
+from .fetcher import Fetcher
+from .resilience import (RetryPolicy, CircuitBreaker, DeadLetterQueue,
+                         OUTCOME_OK, OUTCOME_FATAL)
+
+
+class RenderResult:
+
+    def __init__(self, url: str, html: str = "", status: Optional[int] = None,
+                 elapsed: float = 0.0, error: Optional[str] = None, attempts: int = 1):
+        """
+        Результат рендеринга страницы.
+
+        Args:
+            url: Запрошенный URL
+            html: HTML после выполнения скриптов страницы
+            status: HTTP статус (если известен)
+            elapsed: Время загрузки в секундах
+            error: Текст ошибки, если была
+            attempts: Число сделанных попыток
+        """
+        self.url = url
+        self.html = html
+        self.status = status
+        self.elapsed = elapsed
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _RenderJob:
+
+    def __init__(self, url: str, callback: Optional[Callable[[RenderResult], None]],
+                 on_failure: Optional[Callable[[RenderResult], None]] = None):
+        self.url = url
+        self.host = Fetcher.get_host(url)
+        self.callback = callback
+        self.on_failure = on_failure
+        self.attempts = 0
+        self.started = 0.0
+        self.token = 0
+
+
+class RenderPool(QObject):
+
+    result_ready = pyqtSignal(object)
+    idle = pyqtSignal()
+
+    def __init__(self, size: int = 2, profile: QWebEngineProfile = None,
+                 controller: AdaptiveConcurrencyController = None,
+                 retry_policy: RetryPolicy = None, breaker: CircuitBreaker = None,
+                 dead_letters: DeadLetterQueue = None, load_timeout: float = 30.0,
+                 parent=None):
+        """
+        Пул страниц QWebEngine для загрузки с выполнением JavaScript.
+
+        Пул работает в GUI-потоке и не блокирует его: задания ставятся
+        в очередь, а свободные страницы берут их по мере освобождения.
+        Параллельность, повторы и выключатель по хостам общие с HTTP-загрузкой.
+
+        Args:
+            size: Число одновременно используемых страниц
+            profile: Профиль QWebEngine (если None, создается отдельный профиль в памяти)
+            controller: Регулятор параллельности по хостам
+            retry_policy: Политика повторов
+            breaker: Выключатель по хостам
+            dead_letters: Очередь неудавшихся заданий
+            load_timeout: Таймаут загрузки одной страницы в секундах
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.profile = profile or QWebEngineProfile(self)
+        self.controller = controller or AdaptiveConcurrencyController()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.dead_letters = dead_letters if dead_letters is not None else DeadLetterQueue()
+        self.load_timeout = load_timeout
+
+        self._pending = deque()
+        self._active = {}
+        self._free_pages = []
+        self._timers = {}
+        self._pump_scheduled = False
+        self._scheduled_retries = 0
+
+        for _ in range(size):
+            page = QWebEnginePage(self.profile, self)
+            page.loadingChanged.connect(lambda info, p=page: self._on_loading_changed(p, info))
+
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda p=page: self._on_timeout(p))
+            self._timers[page] = timer
+
+            self._free_pages.append(page)
+
+    def submit(self, url: str, callback: Callable[[RenderResult], None] = None,
+               on_failure: Callable[[RenderResult], None] = None) -> None:
+        """
+        Ставит страницу в очередь на рендеринг.
+
+        Args:
+            url: Адрес страницы
+            callback: Функция, которая получит RenderResult при успехе
+            on_failure: Функция, которая получит RenderResult, когда задание ушло в очередь неудач
+        """
+        self._pending.append(_RenderJob(url, callback, on_failure))
+        self._pump()
+
+    def pending_count(self) -> int:
+        return len(self._pending) + len(self._active) + self._scheduled_retries
+
+    def retry_dead_letters(self) -> int:
+        """
+        Возвращает задания рендеринга из очереди неудач в пул.
+
+        Returns:
+            Число заданий, поставленных в очередь
+        """
+        entries = self.dead_letters.drain(kind="render")
+        for entry in entries:
+            self._pending.append(_RenderJob(entry["url"], None))
+        self._pump()
+        return len(entries)
+
+    def _pump(self) -> None:
+        """Раздает задания свободным страницам"""
+        self._pump_scheduled = False
+        waiting = deque()
+
+        while self._pending and self._free_pages:
+            job = self._pending.popleft()
+
+            # Хост недоступен - не тратим на него страницу
+            if not self.breaker.allow_request(job.host):
+                self._dead_letter(job, "circuit_open", None)
+                continue
+
+            if not self.controller.try_acquire(job.host):
+                self.breaker.cancel_probe(job.host)
+                waiting.append(job)
+                continue
+
+            self._start(self._free_pages.pop(), job)
+
+        self._pending.extendleft(reversed(waiting))
+
+        if self._pending and not self._pump_scheduled:
+            # Ждем освобождения слотов у регулятора параллельности
+            self._pump_scheduled = True
+            QTimer.singleShot(100, self._pump)
+        elif self.pending_count() == 0:
+            self.idle.emit()
+
+    def _start(self, page: QWebEnginePage, job: _RenderJob) -> None:
+        job.attempts += 1
+        job.token += 1
+        job.started = time.perf_counter()
+        self._active[page] = job
+        self._timers[page].start(int(self.load_timeout * 1000))
+        page.load(QUrl(job.url))
+
+    def _on_loading_changed(self, page: QWebEnginePage, info: QWebEngineLoadingInfo) -> None:
+        job = self._active.get(page)
+        if job is None:
+            return
+
+        status = info.status()
+        if status == QWebEngineLoadingInfo.LoadStatus.LoadSucceededStatus:
+            token = job.token
+            page.toHtml(lambda html, p=page, j=job, t=token: self._finish(p, j, t, 200, None, html))
+        elif status in (QWebEngineLoadingInfo.LoadStatus.LoadFailedStatus,
+                        QWebEngineLoadingInfo.LoadStatus.LoadStoppedStatus):
+            http_status = None
+            if info.errorDomain() == QWebEngineLoadingInfo.ErrorDomain.HttpStatusCodeDomain:
+                http_status = info.errorCode()
+            error = None if http_status else (info.errorString() or "load failed")
+            self._finish(page, job, job.token, http_status, error, "")
+
+    def _on_timeout(self, page: QWebEnginePage) -> None:
+        job = self._active.get(page)
+        if job is None:
+            return
+        # Останавливаем загрузку до освобождения страницы, чтобы не прервать следующее задание
+        token = job.token
+        page.triggerAction(QWebEnginePage.WebAction.Stop)
+        self._finish(page, job, token, None, "timeout", "")
+
+    def _finish(self, page: QWebEnginePage, job: _RenderJob, token: int,
+                status: Optional[int], error: Optional[str], html: str) -> None:
+        # Результат устаревшей попытки (например, после таймаута)
+        if self._active.get(page) is not job or job.token != token:
+            return
+
+        del self._active[page]
+        self._timers[page].stop()
+        self._free_pages.append(page)
+
+        elapsed = time.perf_counter() - job.started
+        self.controller.release(job.host, elapsed, status=status, error=error is not None)
+
+        outcome = self.retry_policy.classify(status, error)
+        if outcome == OUTCOME_OK:
+            self.breaker.record_success(job.host)
+            result = RenderResult(job.url, html, status, elapsed, None, job.attempts)
+            if job.callback:
+                job.callback(result)
+            self.result_ready.emit(result)
+        elif outcome == OUTCOME_FATAL:
+            self.breaker.record_success(job.host)
+            self._dead_letter(job, f"HTTP {status}", status)
+        else:
+            self.breaker.record_failure(job.host)
+            if job.attempts < self.retry_policy.max_attempts:
+                delay = self.retry_policy.backoff_delay(job.attempts)
+                self._scheduled_retries += 1
+                QTimer.singleShot(int(delay * 1000), lambda j=job: self._requeue(j))
+            else:
+                self._dead_letter(job, error or f"HTTP {status}", status)
+
+        self._pump()
+
+    def _dead_letter(self, job: _RenderJob, reason: str, status: Optional[int]) -> None:
+        self.dead_letters.put(job.url, "render", reason, job.attempts, status)
+        if job.on_failure:
+            job.on_failure(RenderResult(job.url, "", status, 0.0, reason, job.attempts))
+
+    def _requeue(self, job: _RenderJob) -> None:
+        self._scheduled_retries -= 1
+        self._pending.append(job)
+        self._pump()
@@ -0,0 +1,370 @@
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .concurrency import AdaptiveConcurrencyController
+from .fetcher import Fetcher, FetchResponse
+
+
+# Классы результата загрузки
+OUTCOME_OK = "ok"
+OUTCOME_RETRY = "retry"
+OUTCOME_FATAL = "fatal"
+
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 30.0, retryable_statuses=None):
+        """
+        Политика повторов с экспоненциальной задержкой и полным джиттером.
+
+        Args:
+            max_attempts: Максимальное число попыток (включая первую)
+            base_delay: Базовая задержка в секундах
+            max_delay: Максимальная задержка в секундах
+            retryable_statuses: HTTP статусы, после которых имеет смысл повторить
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_statuses = set(retryable_statuses or RETRYABLE_STATUSES)
+
+    def classify(self, status: Optional[int], error: Optional[str] = None) -> str:
+        """
+        Определяет, что делать с результатом загрузки.
+
+        Args:
+            status: HTTP статус (None если ответа не было)
+            error: Текст сетевой ошибки
+
+        Returns:
+            OUTCOME_OK, OUTCOME_RETRY или OUTCOME_FATAL
+        """
+        if error is not None or status is None:
+            return OUTCOME_RETRY
+        if status in self.retryable_statuses:
+            return OUTCOME_RETRY
+        if status >= 400:
+            return OUTCOME_FATAL
+        return OUTCOME_OK
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Вычисляет задержку перед следующей попыткой.
+
+        Args:
+            attempt: Номер неудачной попытки, начиная с 1
+            retry_after: Значение заголовка Retry-After, если есть
+
+        Returns:
+            Задержка в секундах
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+
+        if retry_after:
+            requested = AdaptiveConcurrencyController.parse_retry_after(retry_after)
+            if requested:
+                delay = max(delay, min(requested, self.max_delay))
+
+        return delay
+
+
+class CircuitBreaker:
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_reset_timeout: float = 600.0):
+        """
+        Автоматический выключатель по хостам.
+
+        После failure_threshold неудач подряд хост "размыкается" на reset_timeout
+        секунд: запросы к нему не выполняются. Затем пропускается один пробный
+        запрос; при неудаче время размыкания удваивается.
+
+        Args:
+            failure_threshold: Число неудач подряд до размыкания
+            reset_timeout: Начальное время размыкания в секундах
+            max_reset_timeout: Максимальное время размыкания в секундах
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def allow_request(self, host: str) -> bool:
+        """
+        Проверяет, можно ли сейчас отправлять запрос к хосту.
+
+        Args:
+            host: Имя хоста
+
+        Returns:
+            True если запрос разрешен
+        """
+        with self._lock:
+            state = self._get_state(host)
+            if state["state"] == self.CLOSED:
+                return True
+
+            if state["state"] == self.OPEN:
+                if time.monotonic() < state["open_until"]:
+                    return False
+                state["state"] = self.HALF_OPEN
+                state["probe_in_flight"] = False
+
+            # Полуоткрытое состояние: пропускаем только один пробный запрос
+            if state["probe_in_flight"]:
+                return False
+            state["probe_in_flight"] = True
+            return True
+
+    def cancel_probe(self, host: str) -> None:
+        """Отменяет выданное разрешение на пробный запрос, если он так и не был отправлен"""
+        with self._lock:
+            self._get_state(host)["probe_in_flight"] = False
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            state = self._get_state(host)
+            state["state"] = self.CLOSED
+            state["failures"] = 0
+            state["timeout"] = self.reset_timeout
+            state["probe_in_flight"] = False
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            state = self._get_state(host)
+            state["failures"] += 1
+
+            if state["state"] == self.HALF_OPEN:
+                state["timeout"] = min(self.max_reset_timeout, state["timeout"] * 2)
+                self._open(state)
+            elif state["failures"] >= self.failure_threshold:
+                self._open(state)
+
+    def get_state(self, host: str) -> str:
+        with self._lock:
+            return self._get_state(host)["state"]
+
+    def retry_in(self, host: str) -> float:
+        """Возвращает число секунд до следующей пробной попытки (0 если хост доступен)"""
+        with self._lock:
+            state = self._get_state(host)
+            if state["state"] != self.OPEN:
+                return 0.0
+            return max(0.0, state["open_until"] - time.monotonic())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    "state": state["state"],
+                    "failures": state["failures"],
+                    "retry_in": round(max(0.0, state["open_until"] - now), 1)
+                }
+                for host, state in self._hosts.items()
+            }
+
+    def _get_state(self, host: str) -> Dict[str, Any]:
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                "state": self.CLOSED,
+                "failures": 0,
+                "open_until": 0.0,
+                "timeout": self.reset_timeout,
+                "probe_in_flight": False
+            }
+            self._hosts[host] = state
+        return state
+
+    @staticmethod
+    def _open(state: Dict[str, Any]) -> None:
+        state["state"] = CircuitBreaker.OPEN
+        state["open_until"] = time.monotonic() + state["timeout"]
+        state["probe_in_flight"] = False
+
+
+class DeadLetterQueue:
+
+    def __init__(self, file_path: str = None):
+        """
+        Очередь заданий, которые не удалось выполнить.
+
+        Args:
+            file_path: JSON файл для сохранения очереди между запусками (необязательно)
+        """
+        self.file_path = Path(file_path) if file_path else None
+        self._entries: List[Dict[str, Any]] = []
+        # Число заданий, добавленных с момента создания (без загруженных из файла)
+        self.added_count = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def put(self, url: str, kind: str, reason: str, attempts: int = 0,
+            status: Optional[int] = None) -> None:
+        """
+        Добавляет неудавшееся задание.
+
+        Args:
+            url: Адрес страницы
+            kind: Тип загрузки ("http" или "render")
+            reason: Причина неудачи
+            attempts: Сколько попыток было сделано
+            status: Последний HTTP статус, если был
+        """
+        entry = {
+            "url": url,
+            "kind": kind,
+            "reason": reason,
+            "attempts": attempts,
+            "status": status,
+            "failed_at": time.time()
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self.added_count += 1
+            self._save()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def drain(self, kind: str = None) -> List[Dict[str, Any]]:
+        """
+        Извлекает задания из очереди для повторного запуска.
+
+        Args:
+            kind: Извлечь только задания указанного типа (None - все)
+
+        Returns:
+            Список извлеченных заданий
+        """
+        with self._lock:
+            if kind is None:
+                drained, self._entries = self._entries, []
+            else:
+                drained = [e for e in self._entries if e["kind"] == kind]
+                self._entries = [e for e in self._entries if e["kind"] != kind]
+            self._save()
+            return drained
+
+    def remove(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Удаляет из очереди задания, полученные из entries().
+
+        Args:
+            entries: Удаляемые задания (сравниваются как объекты, а не по URL)
+        """
+        removed = {id(entry) for entry in entries}
+        with self._lock:
+            self._entries = [entry for entry in self._entries if id(entry) not in removed]
+            self._save()
+
+    def _load(self) -> None:
+        if not self.file_path or not self.file_path.exists():
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка чтения очереди неудачных заданий: {e}")
+
+    def _save(self) -> None:
+        if not self.file_path:
+            return
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.file_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        except IOError as e:
+            print(f"Ошибка сохранения очереди неудачных заданий: {e}")
+
+
+class ResilientFetcher:
+
+    def __init__(self, fetcher: Fetcher = None, retry_policy: RetryPolicy = None,
+                 breaker: CircuitBreaker = None, dead_letters: DeadLetterQueue = None):
+        """
+        Обертка над Fetcher с повторами, выключателем по хостам и очередью неудач.
+
+        Args:
+            fetcher: HTTP загрузчик (если None, создается новый)
+            retry_policy: Политика повторов
+            breaker: Выключатель по хостам (общий с пулом рендеринга)
+            dead_letters: Очередь неудавшихся заданий
+        """
+        self.fetcher = fetcher or Fetcher()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.dead_letters = dead_letters if dead_letters is not None else DeadLetterQueue()
+
+    def fetch(self, url: str, headers: Dict[str, str] = None) -> Optional[FetchResponse]:
+        """
+        Загружает URL с повторами.
+
+        Args:
+            url: Адрес страницы
+            headers: Дополнительные заголовки запроса
+
+        Returns:
+            Успешный FetchResponse или None, если задание ушло в очередь неудач
+        """
+        response, failure = self._fetch_with_retries(url, headers)
+        if failure:
+            self.dead_letters.put(url, "http", **failure)
+        return response
+
+    def _fetch_with_retries(self, url: str, headers: Dict[str, str] = None):
+        """
+        Выполняет попытки загрузки.
+
+        Returns:
+            Кортеж (ответ или None, описание неудачи для очереди или None)
+        """
+        host = Fetcher.get_host(url)
+        attempt = 0
+        response = None
+
+        while attempt < self.retry_policy.max_attempts:
+            # Хост недоступен - не занимаем рабочий слот и сразу откладываем задание
+            if not self.breaker.allow_request(host):
+                status = response.status if response else None
+                return None, {"reason": "circuit_open", "attempts": attempt, "status": status}
+
+            attempt += 1
+            response = self.fetcher.fetch(url, headers)
+            outcome = self.retry_policy.classify(response.status, response.error)
+
+            if outcome == OUTCOME_OK:
+                self.breaker.record_success(host)
+                return response, None
+
+            if outcome == OUTCOME_FATAL:
+                # Ошибка клиента (404 и т.п.) не говорит о проблемах хоста
+                self.breaker.record_success(host)
+                break
+
+            self.breaker.record_failure(host)
+            if attempt < self.retry_policy.max_attempts:
+                time.sleep(self.retry_policy.backoff_delay(attempt, response.headers.get("retry-after")))
+
+        reason = response.error or f"HTTP {response.status}"
+        return None, {"reason": reason, "attempts": attempt, "status": response.status}
@@ -0,0 +1,333 @@
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Optional, Callable
+
+from .blocks import Block, create_block
+from .profiler import BlockProfiler, BlockStats
+from .resilience import ResilientFetcher
+
+
+# Признак конца потока элементов для рабочего потока блока
+_DONE = object()
+
+# Емкость входной очереди блока по умолчанию (0 - без ограничения)
+DEFAULT_QUEUE_SIZE = 100
+
+# Период проверки остановки, пока производитель ждет места в заполненной очереди
+_PUT_POLL_SECONDS = 0.1
+
+
+class RunContext:
+
+    def __init__(self, fetcher: ResilientFetcher = None,
+                 renderer: Callable[[str], Optional[str]] = None,
+                 on_result: Callable[[Any], None] = None):
+        """
+        Общие ресурсы одного запуска проекта.
+
+        Args:
+            fetcher: HTTP загрузчик с повторами (если None, создается новый)
+            renderer: Функция рендеринга url -> html (None если рендеринг недоступен)
+            on_result: Обработчик итоговых записей (если None, записи копятся в results)
+        """
+        self.fetcher = fetcher or ResilientFetcher()
+        self.renderer = renderer
+        self.on_result = on_result
+        self.results: List[Any] = []
+        self.result_count = 0
+        self._lock = threading.Lock()
+
+    def render(self, url: str) -> Optional[str]:
+        if self.renderer is None:
+            raise RuntimeError("Rendering is not available in this run (QtWebEngine is not set up)")
+        return self.renderer(url)
+
+    def emit_result(self, record: Any) -> None:
+        with self._lock:
+            self.result_count += 1
+            if self.on_result is None:
+                self.results.append(record)
+                return
+        self.on_result(record)
+
+
+class _Node:
+
+    def __init__(self, block: Block, queue_size: int):
+        self.block = block
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.downstream: List["_Node"] = []
+        self.upstream_count = 0
+        self.upstream_remaining = 0
+        self.active_workers = 0
+        self.lock = threading.Lock()
+
+
+class RunEngine:
+
+    def __init__(self, project_data: Dict[str, Any], context: RunContext = None,
+                 profile: bool = False, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Выполнение графа блоков проекта.
+
+        Каждый блок работает в своих потоках (по числу workers) и получает
+        элементы через очередь; результат блока передается всем блокам,
+        соединенным с ним.
+
+        Очереди ограничены: если следующий блок отстает (например, медленная
+        запись результатов), предыдущий ждет освобождения места, и так до
+        источника URL. Поэтому объем данных в памяти не зависит от скорости
+        загрузки страниц.
+
+        Args:
+            project_data: Данные проекта (полные или только секция "data")
+            context: Ресурсы запуска (если None, создаются по умолчанию)
+            profile: Собирать статистику по блокам
+            queue_size: Емкость входной очереди каждого блока (параметр блока
+                "queue_size" переопределяет ее, 0 - без ограничения)
+
+        Raises:
+            ValueError: Если граф содержит неизвестные блоки, связи или циклы
+        """
+        data = project_data.get("data", project_data)
+        self.context = context or RunContext()
+        self.profiler = BlockProfiler() if profile else None
+        self.queue_size = queue_size
+
+        self._nodes: Dict[str, _Node] = {}
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._errors = 0
+        self._errors_lock = threading.Lock()
+        self.elapsed = 0.0
+
+        self._build_graph(data.get("blocks", []), data.get("connections", []))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Выполняет граф и ждет завершения всех блоков.
+
+        Returns:
+            Сводка запуска {elapsed_s, records, errors, dead_letters, stopped, blocks}
+        """
+        start = time.perf_counter()
+
+        for node in self._nodes.values():
+            node.active_workers = node.block.workers
+            node.upstream_remaining = node.upstream_count
+            target = self._source_worker if node.block.is_source else self._worker
+            for index in range(node.block.workers):
+                thread = threading.Thread(
+                    target=target, args=(node,),
+                    name=f"block-{node.block.block_id}-{index}", daemon=True
+                )
+                self._threads.append(thread)
+
+        for thread in self._threads:
+            thread.start()
+
+        # Блок без входящих связей, не являющийся источником, сразу получает конец потока
+        for node in self._nodes.values():
+            if not node.block.is_source and node.upstream_count == 0:
+                self._finish_input(node)
+        for thread in self._threads:
+            thread.join()
+
+        self.elapsed = time.perf_counter() - start
+        return self.summary()
+
+    def stop(self) -> None:
+        """Прерывает выполнение: источники перестают выдавать элементы, очереди закрываются"""
+        self._stop_event.set()
+        for node in self._nodes.values():
+            for _ in range(node.block.workers):
+                # В заполненную очередь признак не нужен: рабочие потоки ждут элементы
+                # с таймаутом и проверяют остановку сами
+                try:
+                    node.queue.put_nowait(_DONE)
+                except queue.Full:
+                    break
+
+    def is_stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "elapsed_s": self.elapsed,
+            "records": self.context.result_count,
+            "errors": self._errors,
+            # Только неудачи этого запуска: файл очереди может хранить задания прежних запусков
+            "dead_letters": self.context.fetcher.dead_letters.added_count,
+            "stopped": self.is_stopped(),
+            "blocks": self.profiler.report() if self.profiler else []
+        }
+
+    def _build_graph(self, blocks: List[Dict[str, Any]], connections: List[Dict[str, Any]]) -> None:
+        for block_data in blocks:
+            block = create_block(block_data, self.context)
+            queue_size = int(block.params.get("queue_size", self.queue_size))
+            self._nodes[block.block_id] = _Node(block, max(0, queue_size))
+
+        for connection in connections:
+            source = self._nodes.get(str(connection.get("from")))
+            target = self._nodes.get(str(connection.get("to")))
+            if source is None or target is None:
+                raise ValueError(f"Connection refers to unknown block: {connection}")
+            source.downstream.append(target)
+            target.upstream_count += 1
+
+        order = self._topological_order()
+        if self.profiler:
+            self._assign_stacks(order)
+
+    def _topological_order(self) -> List[_Node]:
+        remaining = {node_id: node.upstream_count for node_id, node in self._nodes.items()}
+        ready = [node for node_id, node in self._nodes.items() if remaining[node_id] == 0]
+        order = []
+
+        while ready:
+            node = ready.pop()
+            order.append(node)
+            for child in node.downstream:
+                remaining[child.block.block_id] -= 1
+                if remaining[child.block.block_id] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self._nodes):
+            raise ValueError("Block graph contains a cycle")
+        return order
+
+    def _assign_stacks(self, order: List[_Node]) -> None:
+        # Путь блока для flamegraph - первая цепочка от источника
+        stacks: Dict[str, List[str]] = {}
+        for node in order:
+            block_id = node.block.block_id
+            stacks.setdefault(block_id, [block_id])
+            for child in node.downstream:
+                child_id = child.block.block_id
+                if child_id not in stacks:
+                    stacks[child_id] = stacks[block_id] + [child_id]
+            self.profiler.set_stack(block_id, stacks[block_id])
+
+    def _source_worker(self, node: _Node) -> None:
+        block = node.block
+        stats = self._create_stats(block)
+
+        try:
+            if stats is None:
+                for item in block.generate():
+                    if self._stop_event.is_set():
+                        break
+                    self._emit(node, [item])
+            else:
+                iterator = iter(block.generate())
+                while not self._stop_event.is_set():
+                    start, cpu_start = time.perf_counter_ns(), time.thread_time_ns()
+                    item = next(iterator, _DONE)
+                    stats.wall_ns += time.perf_counter_ns() - start
+                    stats.cpu_ns += time.thread_time_ns() - cpu_start
+                    if item is _DONE:
+                        break
+                    stats.items_out += 1
+                    self._emit(node, [item], stats)
+        except Exception as e:
+            self._record_error(block, stats, e)
+        finally:
+            self._worker_finished(node)
+
+    def _worker(self, node: _Node) -> None:
+        block = node.block
+        stats = self._create_stats(block)
+
+        try:
+            while True:
+                try:
+                    entry = node.queue.get(timeout=_PUT_POLL_SECONDS)
+                except queue.Empty:
+                    if self._stop_event.is_set():
+                        break
+                    continue
+                if entry is _DONE or self._stop_event.is_set():
+                    break
+
+                enqueued_ns, item = entry
+                try:
+                    if stats is None:
+                        outputs = block.process(item)
+                    else:
+                        start, cpu_start = time.perf_counter_ns(), time.thread_time_ns()
+                        stats.queue_wait_ns += start - enqueued_ns
+                        stats.items_in += 1
+                        outputs = block.process(item)
+                        stats.wall_ns += time.perf_counter_ns() - start
+                        stats.cpu_ns += time.thread_time_ns() - cpu_start
+                        stats.items_out += len(outputs)
+                except Exception as e:
+                    self._record_error(block, stats, e)
+                    continue
+
+                if outputs:
+                    self._emit(node, outputs, stats)
+        finally:
+            self._worker_finished(node)
+
+    def _create_stats(self, block: Block) -> Optional[BlockStats]:
+        if self.profiler is None:
+            return None
+        return self.profiler.create_stats(block.block_id, block.block_type)
+
+    def _emit(self, node: _Node, outputs: List[Any], stats: Optional[BlockStats] = None) -> None:
+        now = time.perf_counter_ns()
+        for child in node.downstream:
+            for item in outputs:
+                try:
+                    child.queue.put_nowait((now, item))
+                except queue.Full:
+                    if not self._put_blocking(child, item, stats):
+                        return
+                    now = time.perf_counter_ns()
+
+    def _put_blocking(self, node: _Node, item: Any, stats: Optional[BlockStats]) -> bool:
+        """Ждет места в очереди блока; возвращает False если выполнение остановлено"""
+        start = time.perf_counter_ns()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    node.queue.put((time.perf_counter_ns(), item), timeout=_PUT_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            if stats is not None:
+                stats.blocked_ns += time.perf_counter_ns() - start
+
+    def _worker_finished(self, node: _Node) -> None:
+        with node.lock:
+            node.active_workers -= 1
+            finished = node.active_workers == 0
+
+        if finished:
+            for child in node.downstream:
+                with child.lock:
+                    child.upstream_remaining -= 1
+                    last_upstream = child.upstream_remaining == 0
+                if last_upstream:
+                    self._finish_input(child)
+
+    def _finish_input(self, node: _Node) -> None:
+        for _ in range(node.block.workers):
+            while not self._stop_event.is_set():
+                try:
+                    node.queue.put(_DONE, timeout=_PUT_POLL_SECONDS)
+                    break
+                except queue.Full:
+                    continue
+
+    def _record_error(self, block: Block, stats: Optional[BlockStats], error: Exception) -> None:
+        with self._errors_lock:
+            self._errors += 1
+        if stats is not None:
+            stats.errors += 1
+        print(f"Ошибка в блоке {block.block_id} ({block.block_type}): {error}")
@@ -0,0 +1,139 @@
+import csv
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any, TextIO, List
+
+
+class JsonLinesSink:
+
+    def __init__(self, stream: TextIO, close_stream: bool = True):
+        """
+        Запись результатов в формате JSON Lines (одна запись в строке).
+
+        Args:
+            stream: Текстовый поток для записи
+            close_stream: Закрывать поток при close()
+        """
+        self.stream = stream
+        self.close_stream = close_stream
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, record: Any) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.count += 1
+            # Читатель конвейера (например, jq) получает записи по мере появления
+            if not self.close_stream:
+                self.stream.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self.stream.flush()
+            if self.close_stream:
+                self.stream.close()
+
+
+class CsvSink:
+
+    def __init__(self, stream: TextIO, close_stream: bool = True):
+        """
+        Запись результатов в CSV.
+
+        Колонки определяются по первой записи; поля, появившиеся позже,
+        не записываются. Списки объединяются через "; ".
+
+        Args:
+            stream: Текстовый поток для записи (открытый с newline='')
+            close_stream: Закрывать поток при close()
+        """
+        self.stream = stream
+        self.close_stream = close_stream
+        self.count = 0
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def write(self, record: Any) -> None:
+        if not isinstance(record, dict):
+            record = {"value": record}
+        row = {key: self._format_value(value) for key, value in record.items()}
+
+        with self._lock:
+            if self._writer is None:
+                self._writer = csv.DictWriter(self.stream, fieldnames=list(row), extrasaction='ignore')
+                self._writer.writeheader()
+            self._writer.writerow(row)
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self.stream.flush()
+            if self.close_stream:
+                self.stream.close()
+
+    @staticmethod
+    def _format_value(value: Any) -> Any:
+        if isinstance(value, list):
+            return "; ".join(str(item) for item in value)
+        if isinstance(value, dict):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+
+
+class MemorySink:
+
+    def __init__(self):
+        """Накопление результатов в памяти (для передачи одним пакетом)"""
+        self.records: List[Any] = []
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, record: Any) -> None:
+        with self._lock:
+            self.records.append(record)
+            self.count += 1
+
+    def close(self) -> None:
+        pass
+
+
+SINK_FORMATS = {
+    "jsonl": JsonLinesSink,
+    "csv": CsvSink
+}
+
+
+def open_sink(target: str = "-", sink_format: str = None):
+    """
+    Открывает приемник результатов.
+
+    Args:
+        target: Путь к файлу или "-" для стандартного вывода
+        sink_format: "jsonl" или "csv" (если None, определяется по расширению файла)
+
+    Returns:
+        Приемник с методами write(record) и close()
+
+    Raises:
+        ValueError: Если формат неизвестен
+    """
+    if sink_format is None:
+        sink_format = "csv" if target != "-" and Path(target).suffix.lower() == ".csv" else "jsonl"
+
+    sink_class = SINK_FORMATS.get(sink_format)
+    if sink_class is None:
+        raise ValueError(f"Unknown sink format: {sink_format}")
+
+    if target == "-":
+        return sink_class(sys.stdout, close_stream=False)
+
+    path = Path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return sink_class(open(path, 'w', encoding='utf-8', newline=''))
+
+
+def available_formats() -> List[str]:
+    return sorted(SINK_FORMATS)
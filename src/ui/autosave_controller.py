@@ -0,0 +1,114 @@
+import time
+from pathlib import Path
+from PyQt6.QtCore import QObject, QTimer
+
+
+class AutosaveController(QObject):
+
+    def __init__(self, debounce_ms: int = 2000, max_delay_ms: int = 30000, parent=None):
+        """
+        Автосохранение в файл восстановления по изменениям проекта.
+
+        Серия изменений объединяется: запись начинается через debounce_ms
+        после последнего изменения, но не позже max_delay_ms после первого.
+        В потоке интерфейса снимается только снимок, запись идет в фоне.
+
+        Args:
+            debounce_ms: Пауза после последнего изменения
+            max_delay_ms: Максимальная задержка при непрерывных изменениях
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        from ..core.autosave import AutosaveWriter
+        from ..core.title_manager import _TITLE_MANAGER
+
+        self.debounce_ms = debounce_ms
+        self.max_delay_ms = max_delay_ms
+        self.writer = AutosaveWriter()
+        self._first_change_at = None
+        self._recovery_path: Path = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.save_now)
+
+        _TITLE_MANAGER.add_listener(self._on_project_event)
+
+    def is_enabled(self) -> bool:
+        from ..core.app_settings_manager import _APP_SETTINGS
+        return bool(_APP_SETTINGS.get_setting("auto_save", True))
+
+    def save_now(self) -> None:
+        """Снимает снимок текущего проекта и передает его на запись"""
+        from ..core.autosave import snapshot_project, recovery_path_for
+        from ..core.project_manager import _PROJECT_MANAGER
+        from ..core.title_manager import _TITLE_MANAGER
+
+        self._timer.stop()
+        self._first_change_at = None
+        if not self.is_enabled() or not _TITLE_MANAGER.has_unsaved_changes():
+            return
+
+        project_data = _PROJECT_MANAGER.current_project_data
+        if project_data is None:
+            return
+
+        self._recovery_path = recovery_path_for(_TITLE_MANAGER.get_project_path(),
+                                                _TITLE_MANAGER.get_project_name())
+        self.writer.submit(snapshot_project(project_data), self._recovery_path)
+
+    def discard_recovery(self, include_current: bool = True) -> None:
+        """
+        Удаляет файлы восстановления (после сохранения или отказа от изменений).
+
+        Args:
+            include_current: Удалить и файл восстановления проекта, открытого сейчас
+        """
+        from ..core.autosave import recovery_path_for
+        from ..core.title_manager import _TITLE_MANAGER
+
+        self._timer.stop()
+        self._first_change_at = None
+        paths = set()
+        if self._recovery_path is not None:
+            paths.add(self._recovery_path)
+        if include_current:
+            paths.add(recovery_path_for(_TITLE_MANAGER.get_project_path(), _TITLE_MANAGER.get_project_name()))
+        for path in paths:
+            self.writer.discard(path)
+        self._recovery_path = None
+
+    def shutdown(self, keep_recovery: bool = False) -> None:
+        """Останавливает автосохранение при закрытии окна"""
+        from ..core.title_manager import _TITLE_MANAGER
+
+        _TITLE_MANAGER.remove_listener(self._on_project_event)
+        self._timer.stop()
+        if not keep_recovery:
+            self.discard_recovery()
+        self.writer.close()
+
+    def _on_project_event(self, event: str) -> None:
+        if event == "modified":
+            self._schedule()
+        elif event == "save":
+            self.discard_recovery()
+        else:
+            # Другой проект открывается только после сохранения или отказа от изменений прежнего;
+            # файл восстановления нового проекта (после сбоя) остается, чтобы его можно было открыть
+            self.discard_recovery(include_current=False)
+
+    def _schedule(self) -> None:
+        if not self.is_enabled():
+            return
+
+        now = time.monotonic()
+        if self._first_change_at is None:
+            self._first_change_at = now
+
+        # Таймер перезапускается при каждом изменении, пока не истекла максимальная задержка
+        remaining_ms = self.max_delay_ms - (now - self._first_change_at) * 1000
+        if remaining_ms <= 0:
+            self.save_now()
+            return
+        self._timer.start(int(min(self.debounce_ms, remaining_ms)))
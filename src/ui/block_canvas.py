@@ -0,0 +1,1204 @@
+"""
+Холст графа блоков проекта.
+
+Блоки и связи секции "data" проекта отображаются элементами QGraphicsScene.
+Сцена индексируется BSP-деревом, поэтому отрисовка и поиск под курсором
+затрагивают только элементы в видимой области; блоки кэшируют свою
+отрисовку в растр, а представление перерисовывает только измененные
+области окна.
+
+При отдалении блоки рисуются упрощенно (без подписей и портов, затем
+одним прямоугольником), а связи - общим набором прямых линий вместо
+отдельных кривых, поэтому обзор большого проекта рисуется так же быстро,
+как небольшого.
+
+Блоки, порты и отрезки связей дополнительно лежат в пространственном
+индексе (CanvasIndex): по нему находятся связь и порт под курсором и
+прокладываются связи в обход блоков.
+
+Сцена сообщает области, в которых изменились блоки (contents_changed):
+по ним мини-карта (CanvasMinimap) перерисовывает только измененные части.
+
+Холст не хранит собственную копию проекта: после изменений в истории
+(EditHistory) элементы сверяются с данными проекта по идентичности
+объектов блоков, и пересоздаются только замененные блоки.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsPathItem
+from PyQt6.QtCore import Qt, QRectF, QPointF, QLineF, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter, QPainterPath, QColor, QPen, QBrush, QFont, QFontMetrics, QKeySequence
+from ..core.theme_manager import _THEME
+from .canvas_grid import GridRenderer
+from .canvas_index import CanvasIndex, Rect
+
+
+BLOCK_WIDTH = 160
+BLOCK_HEIGHT = 60
+HEADER_HEIGHT = 22
+PORT_RADIUS = 5
+CORNER_RADIUS = 6
+
+# Раскладка блоков без сохраненной позиции
+AUTO_LAYOUT_COLUMNS = 20
+AUTO_LAYOUT_STEP_X = 220
+AUTO_LAYOUT_STEP_Y = 100
+
+# Запас вокруг блоков в области прокрутки сцены
+SCENE_MARGIN = 2000
+
+MIN_ZOOM = 0.05
+MAX_ZOOM = 4.0
+WHEEL_ZOOM_STEP = 1.15
+MENU_ZOOM_STEP = 1.25
+
+# Связи перемещаемых блоков перестраиваются после паузы в движении мыши
+DRAG_SETTLE_MS = 120
+
+# Чужие связи, на которые легли массово вставленные блоки, перестраиваются после паузы,
+# не больше CROSSING_ROUTE_BATCH связей за один проход цикла событий
+CROSSING_SETTLE_MS = DRAG_SETTLE_MS
+CROSSING_ROUTE_BATCH = 300
+
+# Начиная с этого числа перетаскиваемых блоков индекс сцены отключается на время перетаскивания
+DRAG_NO_INDEX_ITEMS = 200
+
+# Расстояние в пикселях экрана, на котором курсор "попадает" в связь или порт
+WIRE_HIT_PIXELS = 5
+PORT_HIT_PIXELS = 8
+
+# Сдвиг каждой следующей вставки тех же блоков относительно оригинала
+PASTE_OFFSET = 40
+
+# Уровни детализации: ниже DETAIL_FULL_ZOOM нет подписей и портов,
+# ниже DETAIL_SIMPLE_ZOOM блок - один прямоугольник цвета заголовка
+DETAIL_FULL_ZOOM = 0.5
+DETAIL_SIMPLE_ZOOM = 0.3
+
+# Ниже этого масштаба связи рисуются одним набором прямых линий
+WIRE_MERGE_ZOOM = 0.5
+
+_BLOCK_RECT = QRectF(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT)
+_BOUNDING_RECT = QRectF(-PORT_RADIUS - 1, -1, BLOCK_WIDTH + 2 * PORT_RADIUS + 2, BLOCK_HEIGHT + 2)
+_TEXT_WIDTH = BLOCK_WIDTH - 12
+
+# Значения перечислений Qt извлекаются заранее, а не при каждом обращении.
+# Блоки перемещает холст (пакетом), поэтому уведомления Qt об изменении геометрии не нужны
+_BLOCK_FLAGS = QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
+_ELIDE_RIGHT = Qt.TextElideMode.ElideRight
+_DEVICE_CACHE = QGraphicsItem.CacheMode.DeviceCoordinateCache
+_NO_CONTENTS = QGraphicsItem.GraphicsItemFlag.ItemHasNoContents
+
+
+class CanvasColors:
+
+    def __init__(self):
+        """Перья и кисти холста текущей темы (создаются один раз, а не при каждой отрисовке)"""
+        self.header_brushes: Dict[str, QBrush] = {}
+        self.load()
+
+    def load(self) -> None:
+        colors = _THEME.get_all_colors("canvas")
+        self.block_brush = QBrush(QColor(colors.get("block_background", "#2D2D30")))
+        self.block_pen = QPen(QColor(colors.get("block_border", "#464647")), 1)
+        self.selected_pen = QPen(QColor(colors.get("block_selected", "#007ACC")), 2)
+        self.selected_brush = QBrush(self.selected_pen.color())
+        self.text_color = QColor(colors.get("block_text", "#FFFFFF"))
+        self.secondary_text_color = QColor(colors.get("block_secondary_text", "#9DA0A6"))
+        self.port_brush = QBrush(QColor(colors.get("port", "#CCCCCC")))
+        self.wire_pen = QPen(QColor(colors.get("wire", "#8C8C8C")), 1.5)
+        self.wire_pen.setCosmetic(True)
+        self.wire_hover_pen = QPen(QColor(colors.get("wire_hover", "#007ACC")), 2.5)
+        self.wire_hover_pen.setCosmetic(True)
+        self.preview_pen = QPen(self.wire_hover_pen.color(), 1.5, Qt.PenStyle.DashLine)
+        self.preview_pen.setCosmetic(True)
+        self.default_header = QBrush(QColor(colors.get("header_default", "#555555")))
+        self.header_brushes = {
+            key[len("header_"):]: QBrush(QColor(value))
+            for key, value in colors.items() if key.startswith("header_")
+        }
+
+    def header_brush(self, block_type: str) -> QBrush:
+        return self.header_brushes.get(block_type, self.default_header)
+
+
+def block_position(block: Dict[str, Any], index: int) -> Tuple[float, float]:
+    """Позиция блока из данных проекта ("x", "y") или место в автоматической раскладке"""
+    try:
+        return float(block["x"]), float(block["y"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        # Ранние версии холста хранили позицию списком "pos": [x, y]
+        x, y = block["pos"]
+        return float(x), float(y)
+    except (KeyError, TypeError, ValueError):
+        pass
+    return ((index % AUTO_LAYOUT_COLUMNS) * AUTO_LAYOUT_STEP_X,
+            (index // AUTO_LAYOUT_COLUMNS) * AUTO_LAYOUT_STEP_Y)
+
+
+class BlockItem(QGraphicsItem):
+
+    _title_font = None
+    _text_font = None
+    _title_metrics = None
+    _text_metrics = None
+    # Заголовки повторяются (типы блоков), поэтому обрезанные варианты кэшируются
+    _elided_titles: Dict[str, str] = {}
+
+    def __init__(self, block: Dict[str, Any], index: int, colors: CanvasColors):
+        """
+        Блок на холсте.
+
+        Args:
+            block: Словарь блока из секции "blocks"
+            index: Индекс блока (для автоматической раскладки)
+            colors: Общие цвета холста
+        """
+        super().__init__()
+        self.colors = colors
+        self.wires: List["WireItem"] = []
+        self.block: Dict[str, Any] = None
+        self.block_id = ""
+        self.setFlags(_BLOCK_FLAGS)
+        # Отрисовка кэшируется в растр; при панорамировании блок только копируется
+        self.setCacheMode(_DEVICE_CACHE)
+        self.set_block(block, index)
+
+    @classmethod
+    def _fonts(cls) -> Tuple[QFont, QFont]:
+        if cls._title_font is None:
+            cls._title_font = QFont()
+            cls._title_font.setPointSize(9)
+            cls._title_font.setBold(True)
+            cls._text_font = QFont()
+            cls._text_font.setPointSize(8)
+            cls._title_metrics = QFontMetrics(cls._title_font)
+            cls._text_metrics = QFontMetrics(cls._text_font)
+        return cls._title_font, cls._text_font
+
+    def set_block(self, block: Dict[str, Any], index: int) -> None:
+        """Обновляет элемент по новой версии блока"""
+        self.block = block
+        self.block_id = str(block.get("id"))
+        self.block_type = str(block.get("type", ""))
+        self._has_input = not _is_source_type(self.block_type)
+        # Индекс и связи обновляет сцена, одним проходом по всем измененным блокам
+        self.setPos(*block_position(block, index))
+
+        # Обрезанные подписи вычисляются один раз, а не при каждой отрисовке
+        self._fonts()
+        params = block.get("params") or {}
+        title = str(params.get("name") or self.block_type or "?")
+        elided = self._elided_titles.get(title)
+        if elided is None:
+            elided = self._title_metrics.elidedText(title, _ELIDE_RIGHT, _TEXT_WIDTH)
+            if len(self._elided_titles) < 10000:
+                self._elided_titles[title] = elided
+        self._title = elided
+        self._subtitle = self._text_metrics.elidedText(self.block_id, _ELIDE_RIGHT, _TEXT_WIDTH)
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        return _BOUNDING_RECT
+
+    def input_port(self) -> QPointF:
+        return self.pos() + QPointF(0, BLOCK_HEIGHT / 2)
+
+    def output_port(self) -> QPointF:
+        return self.pos() + QPointF(BLOCK_WIDTH, BLOCK_HEIGHT / 2)
+
+    def update_index(self, index: CanvasIndex) -> None:
+        x, y = self.x(), self.y()
+        middle = y + BLOCK_HEIGHT / 2
+        index.set_block(self.block_id, (x, y, x + BLOCK_WIDTH, y + BLOCK_HEIGHT),
+                        (x, middle) if self._has_input else None, (x + BLOCK_WIDTH, middle))
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:
+        colors = self.colors
+        detail = option.levelOfDetailFromTransform(painter.worldTransform())
+
+        if detail < DETAIL_SIMPLE_ZOOM:
+            painter.fillRect(_BLOCK_RECT, colors.selected_brush if self.isSelected()
+                             else colors.header_brush(self.block_type))
+            return
+
+        painter.setPen(colors.selected_pen if self.isSelected() else colors.block_pen)
+        painter.setBrush(colors.block_brush)
+        painter.drawRoundedRect(_BLOCK_RECT, CORNER_RADIUS, CORNER_RADIUS)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(colors.header_brush(self.block_type))
+        painter.drawRoundedRect(QRectF(1, 1, BLOCK_WIDTH - 2, HEADER_HEIGHT), CORNER_RADIUS - 1, CORNER_RADIUS - 1)
+
+        # Подписи и порты при таком масштабе не различить
+        if detail < DETAIL_FULL_ZOOM:
+            return
+
+        title_font, text_font = self._fonts()
+        painter.setFont(title_font)
+        painter.setPen(colors.text_color)
+        painter.drawText(QRectF(6, 1, _TEXT_WIDTH, HEADER_HEIGHT),
+                         Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, self._title)
+        painter.setFont(text_font)
+        painter.setPen(colors.secondary_text_color)
+        painter.drawText(QRectF(6, HEADER_HEIGHT + 2, _TEXT_WIDTH, BLOCK_HEIGHT - HEADER_HEIGHT - 4),
+                         Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, self._subtitle)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(colors.port_brush)
+        if self._has_input:
+            painter.drawEllipse(QPointF(0, BLOCK_HEIGHT / 2), PORT_RADIUS, PORT_RADIUS)
+        painter.drawEllipse(QPointF(BLOCK_WIDTH, BLOCK_HEIGHT / 2), PORT_RADIUS, PORT_RADIUS)
+
+    def move_to(self, x: float, y: float) -> None:
+        """Перемещает блок вместе с его связями"""
+        if x == self.x() and y == self.y():
+            return
+        self.setPos(x, y)
+        scene = self.scene()
+        if scene is not None:
+            scene.blocks_moved([self])
+
+
+class WireItem(QGraphicsPathItem):
+
+    def __init__(self, source: BlockItem, target: BlockItem, colors: CanvasColors):
+        """
+        Связь между выходом одного блока и входом другого.
+
+        Args:
+            source: Блок-источник
+            target: Блок-получатель
+            colors: Общие цвета холста
+        """
+        super().__init__()
+        self.source = source
+        self.target = target
+        self.key = (source.block_id, target.block_id)
+        self.colors = colors
+        self.setPen(colors.wire_pen)
+        # Связи рисуются под блоками
+        self.setZValue(-1)
+        source.wires.append(self)
+        target.wires.append(self)
+
+    def update_path(self) -> None:
+        """Прокладывает связь по текущим позициям блоков (в обход блоков, если сцена известна)"""
+        start = self.source.output_port()
+        end = self.target.input_port()
+        scene = self.scene()
+        if scene is None:
+            curved, points = True, None
+        else:
+            curved, points = scene.index.route((start.x(), start.y()), (end.x(), end.y()), self.key)
+            scene.index.set_wire(self.key, points)
+
+        path = QPainterPath(start)
+        if curved:
+            offset = max(40.0, abs(end.x() - start.x()) / 2)
+            path.cubicTo(start + QPointF(offset, 0), end - QPointF(offset, 0), end)
+        else:
+            for x, y in points[1:]:
+                path.lineTo(x, y)
+        self.setPath(path)
+
+    def set_hovered(self, hovered: bool) -> None:
+        self.setPen(self.colors.wire_hover_pen if hovered else self.colors.wire_pen)
+
+    def detach(self) -> None:
+        for block_item in (self.source, self.target):
+            if self in block_item.wires:
+                block_item.wires.remove(self)
+
+
+def _removal_commands(section: str, items: List[Any], remove: List[bool]) -> list:
+    """
+    Команды удаления отмеченных элементов списка: по одной на каждый подряд идущий участок.
+
+    Участки удаляются с конца, поэтому индексы следующих команд остаются верными.
+    """
+    from ..core.edit_history import RemoveItemsCommand
+    commands = []
+    index = len(items) - 1
+    while index >= 0:
+        if not remove[index]:
+            index -= 1
+            continue
+        end = index + 1
+        while index >= 0 and remove[index]:
+            index -= 1
+        commands.append(RemoveItemsCommand(section, index + 1, items[index + 1:end]))
+    return commands
+
+
+def _is_source_type(block_type: str) -> bool:
+    from ..engine.blocks import BLOCK_TYPES
+    block_class = BLOCK_TYPES.get(block_type)
+    return block_class is not None and block_class.is_source
+
+
+class BlockScene(QGraphicsScene):
+
+    # Область сцены, в которой изменились блоки (пустой прямоугольник - вся сцена)
+    contents_changed = pyqtSignal(QRectF)
+
+    def __init__(self, parent=None):
+        """Сцена графа блоков с индексом BSP-дерева"""
+        super().__init__(parent)
+        self.colors = CanvasColors()
+        self.block_items: Dict[str, BlockItem] = {}
+        self.wire_items: Dict[Tuple[str, str], WireItem] = {}
+        self.index = CanvasIndex()
+        # Уровень детализации задает представление по своему масштабу
+        self.wires_merged = False
+        self.blocks_batched = False
+        self._wire_lines: Optional[List[QLineF]] = None
+        self._block_rects: Optional[Dict[str, List[QRectF]]] = None
+        # Перетаскиваемые блоки: в общий набор не входят и рисуются отдельно на каждом кадре
+        self._dragged: Optional[List[BlockItem]] = None
+        # Отложенная перестройка чужих связей после массовой вставки: блоки, затем ключи связей
+        self._crossing_blocks: Dict[str, BlockItem] = {}
+        self._crossing_wires: List[Tuple[str, str]] = []
+        self._crossing_timer = QTimer(self)
+        self._crossing_timer.setSingleShot(True)
+        self._crossing_timer.timeout.connect(self._settle_crossing)
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.selectionChanged.connect(self._on_selection_changed)
+
+    def clear_blocks(self) -> None:
+        self._crossing_timer.stop()
+        self._crossing_blocks.clear()
+        self._crossing_wires.clear()
+        self.clear()
+        self.block_items.clear()
+        self.wire_items.clear()
+        self.index.clear()
+        self.invalidate_overview()
+        self.mark_changed(None)
+
+    def mark_changed(self, rect: Optional[Rect]) -> None:
+        """
+        Сообщает об изменении блоков в области сцены.
+
+        Args:
+            rect: (левый x, верхний y, правый x, нижний y) или None - вся сцена
+        """
+        if rect is None:
+            self.contents_changed.emit(QRectF())
+        else:
+            self.contents_changed.emit(QRectF(rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1]))
+
+    def _mark_rects(self, rects: List[Rect]) -> None:
+        # Одно уведомление на пакет изменений - общая граница прямоугольников
+        if rects:
+            self.mark_changed((min(r[0] for r in rects), min(r[1] for r in rects),
+                               max(r[2] for r in rects), max(r[3] for r in rects)))
+
+    def contents_rect(self) -> QRectF:
+        """Граница блоков: область сцены без запаса для прокрутки"""
+        if not self.block_items:
+            return QRectF()
+        return self.sceneRect().adjusted(SCENE_MARGIN, SCENE_MARGIN, -SCENE_MARGIN, -SCENE_MARGIN)
+
+    def blocks_in(self, rect: Rect) -> List[BlockItem]:
+        """
+        Блоки, пересекающие область (по индексу).
+
+        Перетаскиваемые блоки индекс знает на прежнем месте, поэтому они
+        добавляются по текущим позициям.
+        """
+        items = [self.block_items[key] for key in self.index.blocks.query(rect) if key in self.block_items]
+        if self._dragged:
+            left, top, right, bottom = rect
+            found = set(items)
+            for item in self._dragged:
+                if item not in found and (item.x() <= right and item.x() + BLOCK_WIDTH >= left
+                                          and item.y() <= bottom and item.y() + BLOCK_HEIGHT >= top):
+                    items.append(item)
+        return items
+
+    def blocks_moved(self, items: List[BlockItem], new_wires: List[WireItem] = (),
+                     crossing: bool = True) -> None:
+        """
+        Обновляет индекс после перемещения блоков и перестраивает затронутые связи.
+
+        Каждая связь прокладывается один раз, сколько бы ее блоков ни изменилось.
+
+        Args:
+            items: Перемещенные или добавленные блоки
+            new_wires: Добавленные связи
+            crossing: Перестроить и чужие связи, которые теперь проходят через блоки
+        """
+        blocks = self.index.blocks
+        rects = []
+        for item in items:
+            old = blocks.rect(item.block_id)
+            if old is not None:
+                rects.append(old)
+            item.update_index(self.index)
+            rects.append(blocks.rect(item.block_id))
+        self._mark_rects(rects)
+        wires = {wire.key: wire for wire in new_wires}
+        for item in items:
+            for wire in item.wires:
+                wires[wire.key] = wire
+        if crossing:
+            for key in self.wires_crossing(items):
+                wire = self.wire_items.get(key)
+                if wire is not None:
+                    wires[key] = wire
+        for wire in wires.values():
+            wire.update_path()
+        self.invalidate_overview()
+
+    def defer_crossing(self, items: List[BlockItem]) -> None:
+        """
+        Откладывает перестройку чужих связей, на которые легли блоки.
+
+        Как и при перетаскивании, связи перестраиваются после паузы, а не
+        в том же действии: массовая вставка сразу показывает блоки и их
+        собственные связи, а чужие связи прокладываются пакетами по
+        CROSSING_ROUTE_BATCH между событиями окна.
+        """
+        for item in items:
+            self._crossing_blocks[item.block_id] = item
+        self._crossing_timer.start(CROSSING_SETTLE_MS)
+
+    def _settle_crossing(self) -> None:
+        if self._crossing_blocks:
+            # Блоки, удаленные или замененные за время паузы, пропускаются
+            items = [item for block_id, item in self._crossing_blocks.items()
+                     if self.block_items.get(block_id) is item]
+            self._crossing_blocks.clear()
+            known = set(self._crossing_wires)
+            self._crossing_wires.extend(key for key in self.wires_crossing(items) if key not in known)
+
+        batch = self._crossing_wires[:CROSSING_ROUTE_BATCH]
+        del self._crossing_wires[:CROSSING_ROUTE_BATCH]
+        for key in batch:
+            wire = self.wire_items.get(key)
+            if wire is not None:
+                wire.update_path()
+        if batch:
+            self.invalidate_overview()
+        if self._crossing_wires:
+            self._crossing_timer.start(0)
+
+    def wires_crossing(self, items: List[BlockItem]) -> set:
+        """Ключи связей, отрезки которых проходят через блоки (по индексу, с запасом)"""
+        from .canvas_index import ROUTE_MARGIN
+        keys = set()
+        for item in items:
+            rect = self.index.blocks.rect(item.block_id)
+            if rect is None:
+                continue
+            area = (rect[0] - ROUTE_MARGIN, rect[1] - ROUTE_MARGIN, rect[2] + ROUTE_MARGIN, rect[3] + ROUTE_MARGIN)
+            for key, _ in self.index.segments.query(area):
+                if item.block_id not in key:
+                    keys.add(key)
+        return keys
+
+    def set_detail_level(self, zoom: float) -> None:
+        """
+        Переключает детализацию для масштаба представления.
+
+        При отдалении связи скрываются и рисуются общим набором прямых линий,
+        а еще дальше блоки перестают рисоваться по одному (флаг
+        ItemHasNoContents: выделение и поиск под курсором продолжают работать)
+        и рисуются прямоугольниками одним вызовом на тип блока.
+        """
+        wires_merged = zoom < WIRE_MERGE_ZOOM
+        if wires_merged != self.wires_merged:
+            self.wires_merged = wires_merged
+            for wire in self.wire_items.values():
+                wire.setVisible(not wires_merged)
+            self.update()
+
+        blocks_batched = zoom < DETAIL_SIMPLE_ZOOM
+        if blocks_batched != self.blocks_batched:
+            self.blocks_batched = blocks_batched
+            for item in self.block_items.values():
+                item.setFlag(_NO_CONTENTS, blocks_batched)
+            self.update()
+
+    def set_dragged_items(self, items: Optional[List[BlockItem]]) -> None:
+        """
+        Отмечает перетаскиваемые блоки (None - перетаскивание закончено).
+
+        Общий набор прямоугольников и линий обзора строится один раз без них,
+        поэтому кадр перетаскивания пересчитывает только сдвигаемые блоки.
+        Связи перетаскиваемых блоков до конца перетаскивания не рисуются.
+        """
+        self._dragged = items
+        self._wire_lines = None
+        self._block_rects = None
+        if self.wires_merged or self.blocks_batched:
+            self.update()
+
+    def invalidate_overview(self) -> None:
+        """Сбрасывает общий набор линий и прямоугольников (блоки или связи изменились)"""
+        if self._dragged is not None:
+            # Общий набор не содержит перетаскиваемых блоков и остается верным
+            if self.blocks_batched:
+                self.update()
+            return
+        if self._wire_lines is None and self._block_rects is None:
+            return
+        self._wire_lines = None
+        self._block_rects = None
+        if self.wires_merged or self.blocks_batched:
+            self.update()
+
+    def drawBackground(self, painter: QPainter, rect: QRectF) -> None:
+        # Фон (сетку) рисует представление; здесь - связи и блоки обзорного уровня детализации
+        dragged = set(self._dragged) if self._dragged else ()
+        if self.wires_merged and self.wire_items:
+            if self._wire_lines is None:
+                self._wire_lines = [QLineF(wire.source.output_port(), wire.target.input_port())
+                                    for wire in self.wire_items.values()
+                                    if wire.source not in dragged and wire.target not in dragged]
+            painter.setPen(self.colors.wire_pen)
+            painter.drawLines(self._wire_lines)
+
+        if self.blocks_batched and self.block_items:
+            if self._block_rects is None:
+                self._block_rects = {}
+                for item in self.block_items.values():
+                    if item not in dragged:
+                        self._block_rects.setdefault(item.block_type, []).append(
+                            _BLOCK_RECT.translated(item.pos()))
+            painter.setPen(Qt.PenStyle.NoPen)
+            for block_type, rects in self._block_rects.items():
+                painter.setBrush(self.colors.header_brush(block_type))
+                painter.drawRects(rects)
+            if dragged:
+                moving: Dict[str, List[QRectF]] = {}
+                for item in self._dragged:
+                    moving.setdefault(item.block_type, []).append(_BLOCK_RECT.translated(item.pos()))
+                for block_type, rects in moving.items():
+                    painter.setBrush(self.colors.header_brush(block_type))
+                    painter.drawRects(rects)
+            selected = [_BLOCK_RECT.translated(item.pos()) for item in self.selectedItems()]
+            if selected:
+                painter.setBrush(self.colors.selected_brush)
+                painter.drawRects(selected)
+
+    def _on_selection_changed(self) -> None:
+        if self.blocks_batched:
+            self.update()
+
+    def sync(self, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Приводит элементы сцены в соответствие с секцией "data" проекта.
+
+        Блоки сверяются по идентичности объектов: неизмененный блок (тот же
+        словарь) не перерисовывается. Массовое добавление и удаление идут без
+        индекса, который затем строится один раз; пустой проект очищает сцену
+        целиком.
+
+        Args:
+            data: Секция "data" проекта
+        """
+        data = data or {}
+        blocks = data.get("blocks") or []
+        connections = data.get("connections") or []
+
+        if not blocks:
+            if self.block_items or self.wire_items:
+                self.clear_blocks()
+                self.update_scene_rect()
+            return
+
+        bulk = len(blocks) - len(self.block_items) > 100
+        had_wires = bool(self.wire_items)
+        if bulk:
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+        changed = []
+        moved = []
+        # Области измененных и удаленных блоков, которые остались на месте (перемещенные сообщает blocks_moved)
+        dirty = []
+        seen = set()
+        for index, block in enumerate(blocks):
+            if not isinstance(block, dict) or "id" not in block:
+                continue
+            block_id = str(block["id"])
+            seen.add(block_id)
+            item = self.block_items.get(block_id)
+            if item is None:
+                item = BlockItem(block, index, self.colors)
+                if self.blocks_batched:
+                    item.setFlag(_NO_CONTENTS, True)
+                self._block_rects = None
+                self.block_items[block_id] = item
+                self.addItem(item)
+                changed.append(item)
+                moved.append(item)
+            elif item.block is not block:
+                # Блок, уже стоящий на месте (например, после перетаскивания), не переиндексируется
+                geometry = (item.x(), item.y(), item._has_input)
+                item.set_block(block, index)
+                changed.append(item)
+                if (item.x(), item.y(), item._has_input) != geometry:
+                    moved.append(item)
+                elif block_id in self.index.blocks:
+                    dirty.append(self.index.blocks.rect(block_id))
+
+        stale = [b for b in self.block_items if b not in seen] if len(seen) < len(self.block_items) else []
+        if len(stale) > 100 and not bulk:
+            bulk = True
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        for block_id in stale:
+            item = self.block_items.pop(block_id)
+            if block_id in self.index.blocks:
+                dirty.append(self.index.blocks.rect(block_id))
+            self.index.remove_block(block_id)
+            self.invalidate_overview()
+            for wire in list(item.wires):
+                self._remove_wire(wire)
+            self.removeItem(item)
+
+        wanted = set()
+        new_wires = []
+        for connection in connections:
+            key = (str(connection.get("from")), str(connection.get("to")))
+            source = self.block_items.get(key[0])
+            target = self.block_items.get(key[1])
+            if source is None or target is None:
+                continue
+            wanted.add(key)
+            wire = self.wire_items.get(key)
+            if wire is None:
+                wire = WireItem(source, target, self.colors)
+                wire.setVisible(not self.wires_merged)
+                self.wire_items[key] = wire
+                self.addItem(wire)
+                new_wires.append(wire)
+        for key in [k for k in self.wire_items if k not in wanted]:
+            self._remove_wire(self.wire_items[key])
+
+        # Блоки индексируются, а связи прокладываются после того, как известны все блоки.
+        # Прежние связи, на которые легли блоки, перестраиваются, только если они были,
+        # а после массовой вставки - отложенно, как после перетаскивания
+        if moved or new_wires:
+            self.blocks_moved(moved, new_wires, crossing=had_wires and not bulk)
+            if had_wires and bulk and moved:
+                self.defer_crossing(moved)
+        self._mark_rects(dirty)
+
+        if bulk:
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+            self.update_scene_rect()
+        else:
+            self.extend_scene_rect(changed)
+
+    def update_scene_rect(self) -> None:
+        # Явная область сцены: иначе Qt пересчитывает границы всех элементов при каждом изменении
+        bounds = self.itemsBoundingRect() if self.block_items else QRectF(0, 0, 0, 0)
+        self.setSceneRect(bounds.adjusted(-SCENE_MARGIN, -SCENE_MARGIN, SCENE_MARGIN, SCENE_MARGIN))
+
+    def extend_scene_rect(self, items: List[QGraphicsItem]) -> None:
+        """Расширяет область сцены до элементов (без обхода всей сцены)"""
+        rect = self.sceneRect()
+        for item in items:
+            bounds = item.sceneBoundingRect()
+            if not rect.contains(bounds):
+                rect = rect.united(bounds.adjusted(-SCENE_MARGIN, -SCENE_MARGIN, SCENE_MARGIN, SCENE_MARGIN))
+        if rect != self.sceneRect():
+            self.setSceneRect(rect)
+
+    def apply_theme(self) -> None:
+        self.colors.load()
+        for wire in self.wire_items.values():
+            wire.setPen(self.colors.wire_pen)
+        # update() сбрасывает растровый кэш блоков
+        for item in self.block_items.values():
+            item.update()
+
+    def _remove_wire(self, wire: WireItem) -> None:
+        wire.detach()
+        self.invalidate_overview()
+        self.wire_items.pop(wire.key, None)
+        self.index.remove_wire(wire.key)
+        if wire.scene() is self:
+            self.removeItem(wire)
+
+
+class BlockCanvas(QGraphicsView):
+
+    def __init__(self, parent=None):
+        """
+        Представление графа блоков текущего проекта.
+
+        Колесо мыши масштабирует относительно курсора, средняя кнопка
+        панорамирует, левая выделяет рамкой и перемещает блоки, а от
+        выходного порта протягивает новую связь.
+        """
+        super().__init__(parent)
+        from ..core.edit_history import _EDIT_HISTORY
+        from ..core.title_manager import _TITLE_MANAGER
+
+        self.block_scene = BlockScene(self)
+        self.setScene(self.block_scene)
+
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        # Перерисовываются только измененные области, а не все окно
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing, True)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
+        self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
+        self.setRubberBandSelectionMode(Qt.ItemSelectionMode.IntersectsItemShape)
+
+        self._pan_start: Optional[QPointF] = None
+        self._drag = None
+        self._drag_start = QPointF()
+        self._drag_settle_timer = QTimer(self)
+        self._drag_settle_timer.setSingleShot(True)
+        self._drag_settle_timer.timeout.connect(self._settle_drag)
+        self._hover_wire: Optional[WireItem] = None
+        self._connect_from: Optional[str] = None
+        self._connect_preview: Optional[QGraphicsPathItem] = None
+        # Номер следующей вставки тех же данных буфера (для сдвига вставляемых блоков)
+        self._paste_count = 1
+        self.setMouseTracking(True)
+        self.grid = GridRenderer()
+        self.snap_to_grid = True
+        self.apply_settings()
+
+        from .canvas_minimap import CanvasMinimap
+        self.minimap = CanvasMinimap(self)
+
+        _EDIT_HISTORY.add_listener(self._on_history_command)
+        _TITLE_MANAGER.add_listener(self._on_project_event)
+        self.reload()
+
+    def zoom(self) -> float:
+        return self.transform().m11()
+
+    def set_zoom(self, zoom: float) -> None:
+        zoom = max(MIN_ZOOM, min(MAX_ZOOM, zoom))
+        factor = zoom / self.zoom()
+        if abs(factor - 1.0) > 1e-6:
+            self.scale(factor, factor)
+            self.block_scene.set_detail_level(self.zoom())
+            self.minimap.update()
+
+    def zoom_in(self) -> None:
+        self._zoom_at_center(self.zoom() * MENU_ZOOM_STEP)
+
+    def zoom_out(self) -> None:
+        self._zoom_at_center(self.zoom() / MENU_ZOOM_STEP)
+
+    def reset_zoom(self) -> None:
+        self._zoom_at_center(1.0)
+
+    def _zoom_at_center(self, zoom: float) -> None:
+        # Команды меню масштабируют относительно центра, а не курсора
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
+        self.set_zoom(zoom)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+
+    def reload(self) -> None:
+        """Перестраивает сцену по текущему проекту (после открытия или создания)"""
+        # Элементы сцены удаляются вместе со ссылками на них
+        self._hover_wire = None
+        self._connect_from = None
+        self._connect_preview = None
+        self.block_scene.clear_blocks()
+        self._sync()
+        self.block_scene.update_scene_rect()
+        if self.block_scene.block_items:
+            self.centerOn(self.block_scene.itemsBoundingRect().center())
+
+    def apply_theme(self) -> None:
+        self.block_scene.apply_theme()
+        self.grid.set_theme()
+        self.minimap.apply_theme()
+        self.viewport().update()
+
+    def apply_settings(self) -> None:
+        """Применяет настройки сетки (show_grid, snap_to_grid)"""
+        from ..core.app_settings_manager import _APP_SETTINGS
+        visible = bool(_APP_SETTINGS.get_setting("show_grid", True))
+        self.snap_to_grid = bool(_APP_SETTINGS.get_setting("snap_to_grid", True))
+        if visible != self.grid.visible:
+            self.grid.visible = visible
+            self.viewport().update()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.minimap.place()
+        self.minimap.update()
+
+    def drawBackground(self, painter: QPainter, rect: QRectF) -> None:
+        # Фон и сетка - копирование готовых фрагментов, без рисования линий на каждом кадре
+        self.grid.draw(painter, rect, self.zoom())
+        super().drawBackground(painter, rect)
+
+    def shutdown(self) -> None:
+        from ..core.edit_history import _EDIT_HISTORY
+        from ..core.title_manager import _TITLE_MANAGER
+        _EDIT_HISTORY.remove_listener(self._on_history_command)
+        _TITLE_MANAGER.remove_listener(self._on_project_event)
+
+    def _project_data(self) -> Optional[Dict[str, Any]]:
+        from ..core.project_manager import _PROJECT_MANAGER
+        project_data = _PROJECT_MANAGER.current_project_data
+        return project_data.get("data") if project_data is not None else None
+
+    def _sync(self) -> None:
+        scene = self.block_scene
+        scene.sync(self._project_data())
+        # Удаленная связь (в том числе при очистке сцены) больше не подсвечивается
+        if self._hover_wire is not None and scene.wire_items.get(self._hover_wire.key) is not self._hover_wire:
+            self._hover_wire = None
+
+    def _on_history_command(self, command, action: str) -> None:
+        self._sync()
+
+    def _on_project_event(self, event: str) -> None:
+        if event in ("new", "open"):
+            # Данные нового проекта становятся текущими после события заголовка
+            QTimer.singleShot(0, self.reload)
+
+    def wheelEvent(self, event) -> None:
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.set_zoom(self.zoom() * WHEEL_ZOOM_STEP ** steps)
+        event.accept()
+
+    def selected_blocks(self) -> List[BlockItem]:
+        return [item for item in self.block_scene.selectedItems() if isinstance(item, BlockItem)]
+
+    def copy_selection(self) -> bool:
+        """Копирует выделенные блоки и связи между ними в буфер обмена"""
+        from PyQt6.QtWidgets import QApplication
+        from .block_clipboard import make_payload, encode_mime
+
+        items = {item.block_id: item for item in self.selected_blocks()}
+        data = self._project_data()
+        if not items or data is None:
+            return False
+        # Блоки копируются в порядке проекта
+        blocks = []
+        for block in data.get("blocks") or []:
+            item = items.get(str(block.get("id"))) if isinstance(block, dict) else None
+            if item is None:
+                continue
+            # Позиция берется с холста: у блока в данных ее может не быть (автоматическая раскладка)
+            if block.get("x") != item.x() or block.get("y") != item.y():
+                block = {**block, "x": item.x(), "y": item.y()}
+            blocks.append(block)
+        QApplication.clipboard().setMimeData(encode_mime(make_payload(blocks, data.get("connections") or [])))
+        self._paste_count = 1
+        return True
+
+    def cut_selection(self) -> None:
+        if self.copy_selection():
+            self.delete_selection()
+            # Первая вставка вырезанных блоков - на прежнее место
+            self._paste_count = 0
+
+    def paste(self) -> None:
+        """Вставляет блоки из буфера обмена одной командой истории и выделяет их"""
+        from PyQt6.QtWidgets import QApplication
+        from ..core.edit_history import _EDIT_HISTORY, InsertItemsCommand, CompositeCommand
+        from .block_clipboard import decode_mime, remap_payload
+
+        payload = decode_mime(QApplication.clipboard().mimeData())
+        if not payload or not payload["blocks"]:
+            return
+        data = self._project_data() or {}
+        existing = data.get("blocks") or []
+        used_ids = {str(block.get("id")) for block in existing if isinstance(block, dict)}
+
+        blocks, connections = remap_payload(payload, used_ids, self._paste_offset(payload["blocks"]))
+        self._paste_count += 1
+        commands = [InsertItemsCommand("blocks", len(existing), blocks)]
+        if connections:
+            commands.append(InsertItemsCommand("connections", len(data.get("connections") or []), connections))
+        _EDIT_HISTORY.execute(CompositeCommand(commands, "paste"))
+
+        scene = self.block_scene
+        scene.clearSelection()
+        for block in blocks:
+            item = scene.block_items.get(block["id"])
+            if item is not None:
+                item.setSelected(True)
+
+    def _paste_offset(self, blocks: List[Dict[str, Any]]) -> Tuple[float, float]:
+        from .canvas_grid import GRID_SIZE
+
+        offset = PASTE_OFFSET * self._paste_count
+        xs = [block["x"] for block in blocks if isinstance(block.get("x"), (int, float))]
+        ys = [block["y"] for block in blocks if isinstance(block.get("y"), (int, float))]
+        if not xs or not ys:
+            return 0.0, 0.0
+        bounds = QRectF(min(xs), min(ys), max(xs) - min(xs) + BLOCK_WIDTH, max(ys) - min(ys) + BLOCK_HEIGHT)
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        if visible.intersects(bounds.translated(offset, offset)):
+            return float(offset), float(offset)
+        # Оригинал не виден: блоки вставляются в центр видимой области (по сетке)
+        delta = visible.center() - bounds.center()
+        return (round(delta.x() / GRID_SIZE) * GRID_SIZE + offset,
+                round(delta.y() / GRID_SIZE) * GRID_SIZE + offset)
+
+    def select_all(self) -> None:
+        """Выделяет все блоки (одно уведомление об изменении выделения)"""
+        scene = self.block_scene
+        if not scene.block_items:
+            return
+        path = QPainterPath()
+        path.addRect(scene.sceneRect())
+        scene.setSelectionArea(path, Qt.ItemSelectionOperation.ReplaceSelection,
+                               Qt.ItemSelectionMode.IntersectsItemBoundingRect)
+
+    def clear_workspace(self) -> None:
+        """Удаляет все блоки и связи одной командой истории"""
+        from ..core.edit_history import _EDIT_HISTORY, RemoveItemsCommand, CompositeCommand
+
+        data = self._project_data()
+        if not data:
+            return
+        commands = [RemoveItemsCommand(section, 0, data[section])
+                    for section in ("connections", "blocks") if data.get(section)]
+        if commands:
+            _EDIT_HISTORY.execute(CompositeCommand(commands, "clear"))
+
+    def delete_selection(self) -> None:
+        """Удаляет выделенные блоки и их связи одной командой истории"""
+        from ..core.edit_history import _EDIT_HISTORY, CompositeCommand
+
+        data = self._project_data()
+        ids = {item.block_id for item in self.selected_blocks()}
+        if not ids or not data:
+            return
+        blocks = data.get("blocks") or []
+        connections = data.get("connections") or []
+        commands = _removal_commands("blocks", blocks, [
+            isinstance(block, dict) and str(block.get("id")) in ids for block in blocks])
+        commands.extend(_removal_commands("connections", connections, [
+            str(connection.get("from")) in ids or str(connection.get("to")) in ids for connection in connections]))
+        if commands:
+            _EDIT_HISTORY.execute(CompositeCommand(commands, "delete"))
+
+    def keyPressEvent(self, event) -> None:
+        if event.matches(QKeySequence.StandardKey.Copy):
+            self.copy_selection()
+        elif event.matches(QKeySequence.StandardKey.Cut):
+            self.cut_selection()
+        elif event.matches(QKeySequence.StandardKey.Paste):
+            self.paste()
+        elif event.matches(QKeySequence.StandardKey.Delete):
+            self.delete_selection()
+        elif event.matches(QKeySequence.StandardKey.SelectAll):
+            self.select_all()
+        else:
+            super().keyPressEvent(event)
+            return
+        event.accept()
+
+    def block_at(self, view_pos) -> Optional[BlockItem]:
+        """Блок под точкой окна представления"""
+        for item in self.items(view_pos):
+            if isinstance(item, BlockItem):
+                return item
+        return None
+
+    def port_at(self, scene_pos: QPointF, kind: str = None) -> Optional[Tuple[str, str]]:
+        """Порт под точкой сцены: (id блока, "in" | "out") или None"""
+        radius = max(PORT_RADIUS + 2, PORT_HIT_PIXELS / self.zoom())
+        return self.block_scene.index.port_at(scene_pos.x(), scene_pos.y(), radius, kind)
+
+    def wire_at(self, scene_pos: QPointF) -> Optional[WireItem]:
+        """Видимая связь под точкой сцены (не закрытая блоком) или None"""
+        scene = self.block_scene
+        x, y = scene_pos.x(), scene_pos.y()
+        if scene.wires_merged or scene.index.blocks.query_point(x, y):
+            return None
+        key = scene.index.wire_at(x, y, WIRE_HIT_PIXELS / self.zoom())
+        wire = scene.wire_items.get(key) if key is not None else None
+        return wire if wire is not None and wire.isVisible() else None
+
+    def _update_hover(self, scene_pos: QPointF) -> None:
+        wire = self.wire_at(scene_pos)
+        if wire is not self._hover_wire:
+            if self._hover_wire is not None and self._hover_wire.scene() is self.block_scene:
+                self._hover_wire.set_hovered(False)
+            self._hover_wire = wire
+            if wire is not None:
+                wire.set_hovered(True)
+        if self.port_at(scene_pos, "out") is not None:
+            self.viewport().setCursor(Qt.CursorShape.CrossCursor)
+        else:
+            self.viewport().unsetCursor()
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self._pan_start = event.position()
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+            event.accept()
+            return
+
+        if event.button() == Qt.MouseButton.LeftButton:
+            scene_pos = self.mapToScene(event.position().toPoint())
+            port = self.port_at(scene_pos, "out")
+            if port is not None:
+                self._start_connection(port[0], scene_pos)
+                event.accept()
+                return
+            item = self.block_at(event.position().toPoint())
+            if item is not None:
+                self._start_drag(item, event)
+                event.accept()
+                return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if self._pan_start is not None:
+            delta = event.position() - self._pan_start
+            self._pan_start = event.position()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - int(delta.x()))
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - int(delta.y()))
+            event.accept()
+            return
+
+        if self._drag is not None:
+            delta = self.mapToScene(event.position().toPoint()) - self._drag_start
+            if not self._drag.moved:
+                self.block_scene.set_dragged_items(self._drag.items)
+            self._drag.move_to(delta.x(), delta.y())
+            self.block_scene.invalidate_overview()
+            # Связи перестраиваются, когда мышь остановится
+            self._drag_settle_timer.start(DRAG_SETTLE_MS)
+            event.accept()
+            return
+
+        scene_pos = self.mapToScene(event.position().toPoint())
+        if self._connect_from is not None:
+            self._update_connection(scene_pos)
+            event.accept()
+            return
+        if event.buttons() == Qt.MouseButton.NoButton:
+            self._update_hover(scene_pos)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event) -> None:
+        if event.button() == Qt.MouseButton.MiddleButton and self._pan_start is not None:
+            self._pan_start = None
+            self.unsetCursor()
+            event.accept()
+            return
+
+        if event.button() == Qt.MouseButton.LeftButton and self._drag is not None:
+            self._finish_drag()
+            event.accept()
+            return
+        if event.button() == Qt.MouseButton.LeftButton and self._connect_from is not None:
+            self._finish_connection(self.mapToScene(event.position().toPoint()))
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def _start_connection(self, block_id: str, scene_pos: QPointF) -> None:
+        self._connect_from = block_id
+        self._connect_preview = QGraphicsPathItem()
+        self._connect_preview.setPen(self.block_scene.colors.preview_pen)
+        self._connect_preview.setZValue(2)
+        self.block_scene.addItem(self._connect_preview)
+        self._update_connection(scene_pos)
+
+    def _connection_target(self, scene_pos: QPointF) -> Optional[str]:
+        """Блок, на вход которого можно бросить новую связь"""
+        port = self.port_at(scene_pos, "in")
+        if port is None or port[0] == self._connect_from:
+            return None
+        if (self._connect_from, port[0]) in self.block_scene.wire_items:
+            return None
+        return port[0]
+
+    def _update_connection(self, scene_pos: QPointF) -> None:
+        index = self.block_scene.index
+        start = QPointF(*index.port_point(self._connect_from, "out"))
+        target = self._connection_target(scene_pos)
+        # Над подходящим входом связь "прилипает" к порту
+        end = QPointF(*index.port_point(target, "in")) if target is not None else scene_pos
+        offset = max(40.0, abs(end.x() - start.x()) / 2)
+        path = QPainterPath(start)
+        path.cubicTo(start + QPointF(offset, 0), end - QPointF(offset, 0), end)
+        self._connect_preview.setPath(path)
+
+    def _finish_connection(self, scene_pos: QPointF) -> None:
+        from ..core.edit_history import _EDIT_HISTORY, InsertItemsCommand
+
+        target = self._connection_target(scene_pos)
+        source, self._connect_from = self._connect_from, None
+        self.block_scene.removeItem(self._connect_preview)
+        self._connect_preview = None
+
+        data = self._project_data()
+        if target is None or data is None:
+            return
+        # В связь записываются исходные id блоков (не обязательно строки)
+        items = self.block_scene.block_items
+        connection = {"from": items[source].block["id"], "to": items[target].block["id"]}
+        connections = data.get("connections") or []
+        _EDIT_HISTORY.execute(InsertItemsCommand("connections", len(connections), [connection]))
+
+    def _start_drag(self, item: BlockItem, event) -> None:
+        from .block_drag import BlockDrag
+        from .canvas_grid import GRID_SIZE
+
+        toggle = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        if toggle and item.isSelected():
+            item.setSelected(False)
+            return
+        if not item.isSelected():
+            if not toggle:
+                self.block_scene.clearSelection()
+            item.setSelected(True)
+
+        items = [i for i in self.block_scene.selectedItems() if isinstance(i, BlockItem)]
+        self._drag = BlockDrag(items, GRID_SIZE if self.snap_to_grid else 0)
+        self._drag_start = self.mapToScene(event.position().toPoint())
+        # Перемещение многих элементов быстрее без индекса, который строится заново после перетаскивания
+        if len(items) >= DRAG_NO_INDEX_ITEMS:
+            self.block_scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    def _settle_drag(self) -> None:
+        if self._drag is not None:
+            self._drag.settle(wires_visible=not self.block_scene.wires_merged)
+
+    def _finish_drag(self) -> None:
+        drag, self._drag = self._drag, None
+        self._drag_settle_timer.stop()
+        drag.settle(wires_visible=not self.block_scene.wires_merged)
+        if drag.moved:
+            self.block_scene.set_dragged_items(None)
+        if self.block_scene.itemIndexMethod() != QGraphicsScene.ItemIndexMethod.BspTreeIndex:
+            self.block_scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self._commit_moves(drag.final_positions())
+
+    def _commit_moves(self, positions: Dict[str, Tuple[float, float]]) -> None:
+        """Записывает новые позиции перемещенных блоков одной командой истории"""
+        from ..core.edit_history import _EDIT_HISTORY, ReplaceItemCommand, CompositeCommand
+
+        data = self._project_data()
+        if not positions or not data or not data.get("blocks"):
+            return
+
+        commands = []
+        for index, block in enumerate(data["blocks"]):
+            position = positions.get(str(block.get("id"))) if isinstance(block, dict) else None
+            if position is None:
+                continue
+            x, y = round(position[0], 1), round(position[1], 1)
+            if block.get("x") != x or block.get("y") != y:
+                # Копия верхнего уровня: параметры блока разделяются с прежней версией
+                commands.append(ReplaceItemCommand("blocks", index, block, {**block, "x": x, "y": y}))
+        if commands:
+            _EDIT_HISTORY.execute(CompositeCommand(commands, "move"))
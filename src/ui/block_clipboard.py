@@ -0,0 +1,170 @@
+"""
+Буфер обмена для выделенных блоков холста.
+
+Выделение кладется в буфер в двух форматах:
+    application/x-parser-blocks - двоичный: MAGIC | длина имени кодека (1 байт) |
+        кодек | сжатые zlib данные, закодированные msgpack (если установлен) или JSON;
+    application/json - компактный JSON тех же данных (для других программ и
+        для копии приложения без msgpack).
+
+Данные - {"version", "blocks", "connections"}: блоки как в проекте и связи
+только между скопированными блоками. При вставке id блоков переназначаются
+за один проход (занятые id получают суффикс), и блоки со связями
+добавляются в проект одной командой истории.
+"""
+import json
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from PyQt6.QtCore import QMimeData, QByteArray
+from ..core.project_container import encode_section, decode_section
+
+
+BLOCKS_MIME = "application/x-parser-blocks"
+JSON_MIME = "application/json"
+
+MAGIC = b"PBCLIP\x00\x01"
+CLIPBOARD_VERSION = 1
+
+# Быстрое сжатие: буфер обмена заполняется при каждом копировании
+COMPRESS_LEVEL = 1
+
+
+def make_payload(blocks: List[Dict[str, Any]], connections: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Данные для буфера обмена.
+
+    Args:
+        blocks: Копируемые блоки (словари проекта, не копируются)
+        connections: Связи проекта; берутся только связи между копируемыми блоками
+    """
+    ids = {str(block.get("id")) for block in blocks}
+    inner = [connection for connection in connections
+             if str(connection.get("from")) in ids and str(connection.get("to")) in ids]
+    return {"version": CLIPBOARD_VERSION, "blocks": blocks, "connections": inner}
+
+
+def encode_mime(payload: Dict[str, Any]) -> QMimeData:
+    """Кладет данные в QMimeData в двоичном формате и в JSON"""
+    codec, data = encode_section(payload)
+    codec_name = codec.encode('ascii')
+    binary = MAGIC + bytes([len(codec_name)]) + codec_name + zlib.compress(data, COMPRESS_LEVEL)
+
+    mime = QMimeData()
+    mime.setData(BLOCKS_MIME, QByteArray(binary))
+    # Для JSON-кодека текст уже готов и повторно не сериализуется
+    text = data if codec == "json" else json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    mime.setData(JSON_MIME, QByteArray(text))
+    return mime
+
+
+def decode_binary(binary: bytes) -> Dict[str, Any]:
+    """
+    Раскодирует двоичный формат.
+
+    Raises:
+        ValueError: Если данные повреждены или кодек недоступен
+    """
+    if not binary.startswith(MAGIC) or len(binary) <= len(MAGIC):
+        raise ValueError("Not a block clipboard payload")
+    offset = len(MAGIC)
+    codec_length = binary[offset]
+    codec = binary[offset + 1:offset + 1 + codec_length].decode('ascii')
+    try:
+        data = zlib.decompress(binary[offset + 1 + codec_length:])
+    except zlib.error as e:
+        raise ValueError(f"Corrupted block clipboard payload: {e}")
+    return decode_section(data, codec)
+
+
+def _validate(payload: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(payload, dict) or not isinstance(payload.get("blocks"), list):
+        return None
+    blocks = [block for block in payload["blocks"] if isinstance(block, dict) and "id" in block]
+    connections = [connection for connection in payload.get("connections") or []
+                   if isinstance(connection, dict)]
+    return {"version": payload.get("version", CLIPBOARD_VERSION), "blocks": blocks, "connections": connections}
+
+
+def decode_mime(mime: QMimeData) -> Optional[Dict[str, Any]]:
+    """
+    Читает блоки из буфера обмена: двоичный формат, иначе JSON (в том числе простой текст).
+
+    Returns:
+        Данные {"version", "blocks", "connections"} или None, если блоков в буфере нет
+    """
+    if mime is None:
+        return None
+    if mime.hasFormat(BLOCKS_MIME):
+        try:
+            return _validate(decode_binary(bytes(mime.data(BLOCKS_MIME))))
+        except ValueError as e:
+            print(f"Ошибка чтения блоков из буфера обмена: {e}")
+
+    for text in (bytes(mime.data(JSON_MIME)).decode('utf-8', 'replace') if mime.hasFormat(JSON_MIME) else "",
+                 mime.text() if mime.hasText() else ""):
+        text = text.strip()
+        if not text.startswith("{"):
+            continue
+        try:
+            return _validate(json.loads(text))
+        except ValueError:
+            continue
+    return None
+
+
+def _free_id(block_id: str, used: Set[str], counters: Dict[str, int]) -> str:
+    if block_id not in used:
+        return block_id
+    number = counters.get(block_id, 1)
+    candidate = f"{block_id}_{number}"
+    while candidate in used:
+        number += 1
+        candidate = f"{block_id}_{number}"
+    counters[block_id] = number + 1
+    return candidate
+
+
+def remap_payload(payload: Dict[str, Any], used_ids: Set[str],
+                  offset: Tuple[float, float] = (0.0, 0.0)) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Готовит вставку: новые id за один проход и сдвиг позиций.
+
+    Свободный id блока сохраняется (вырезанные и вставленные блоки сохраняют
+    свои id), занятый получает суффикс "_N".
+
+    Args:
+        payload: Данные буфера обмена
+        used_ids: Занятые id проекта (дополняется новыми id)
+        offset: Сдвиг позиций вставляемых блоков
+
+    Returns:
+        (блоки, связи) для добавления в проект
+    """
+    dx, dy = offset
+    mapping: Dict[str, str] = {}
+    counters: Dict[str, int] = {}
+    blocks = []
+    for block in payload["blocks"]:
+        old_id = str(block["id"])
+        if old_id in mapping:
+            continue
+        new_id = _free_id(old_id, used_ids, counters)
+        used_ids.add(new_id)
+        mapping[old_id] = new_id
+        # Копия верхнего уровня: параметры разделяются с данными буфера
+        new_block = {**block, "id": new_id}
+        try:
+            new_block["x"] = float(block["x"]) + dx
+            new_block["y"] = float(block["y"]) + dy
+        except (KeyError, TypeError, ValueError):
+            new_block.pop("x", None)
+            new_block.pop("y", None)
+        blocks.append(new_block)
+
+    connections = []
+    for connection in payload["connections"]:
+        source = mapping.get(str(connection.get("from")))
+        target = mapping.get(str(connection.get("to")))
+        if source is not None and target is not None:
+            connections.append({**connection, "from": source, "to": target})
+    return blocks, connections
@@ -0,0 +1,143 @@
+"""
+Перетаскивание выделенных блоков холста.
+
+Позиции всех перетаскиваемых блоков вычисляются одним векторным
+действием над массивом координат (NumPy, если установлен), включая
+привязку к сетке. Связи перемещаемых блоков не перестраиваются на каждое
+движение мыши: они скрываются и перестраиваются, когда перетаскивание
+останавливается. Сцене сообщается только общая граница сдвигаемых блоков
+до и после шага (для мини-карты), а не область каждого блока.
+"""
+from typing import Dict, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def snap_positions(positions, grid_size: float):
+    """
+    Привязывает координаты к сетке.
+
+    Args:
+        positions: Массив N x 2 (NumPy) или список пар координат
+        grid_size: Шаг сетки (0 - без привязки)
+    """
+    if not grid_size:
+        return positions
+    if np is not None and isinstance(positions, np.ndarray):
+        # + 0.0 убирает отрицательный ноль после округления
+        return np.round(positions / grid_size) * grid_size + 0.0
+    return [(round(x / grid_size) * grid_size, round(y / grid_size) * grid_size) for x, y in positions]
+
+
+class BlockDrag:
+
+    def __init__(self, items: Sequence, grid_size: float = 0):
+        """
+        Перетаскивание набора блоков.
+
+        Args:
+            items: Перетаскиваемые BlockItem
+            grid_size: Шаг привязки к сетке (0 - без привязки)
+        """
+        self.items = list(items)
+        self.grid_size = grid_size
+        origins = [(item.x(), item.y()) for item in self.items]
+        self._origins = np.array(origins, dtype=float).reshape(-1, 2) if np is not None else origins
+        self._positions = self._origins
+        self._offset = (0.0, 0.0)
+        self.moved = False
+
+        # Граница всех блоков в начальных позициях (левый x, верхний y, правый x, нижний y)
+        self._bounds = None
+        if self.items:
+            shape = self.items[0].boundingRect()
+            if np is not None:
+                (left, top), (right, bottom) = self._origins.min(axis=0), self._origins.max(axis=0)
+            else:
+                left, top = min(x for x, _ in origins), min(y for _, y in origins)
+                right, bottom = max(x for x, _ in origins), max(y for _, y in origins)
+            self._bounds = (float(left) + shape.left(), float(top) + shape.top(),
+                            float(right) + shape.right(), float(bottom) + shape.bottom())
+
+        wires = {}
+        for item in self.items:
+            for wire in item.wires:
+                wires[id(wire)] = wire
+        self.wires = list(wires.values())
+        self._wires_hidden = False
+
+    def move_to(self, dx: float, dy: float) -> None:
+        """
+        Сдвигает блоки относительно начальных позиций одним пакетом.
+
+        Args:
+            dx, dy: Смещение мыши от начала перетаскивания в координатах сцены
+        """
+        if np is not None:
+            positions = snap_positions(self._origins + (dx, dy), self.grid_size)
+            if np.array_equal(positions, self._positions):
+                return
+            coordinates = positions.tolist()
+        else:
+            positions = snap_positions([(x + dx, y + dy) for x, y in self._origins], self.grid_size)
+            if positions == self._positions:
+                return
+            coordinates = positions
+        self._positions = positions
+        self.moved = True
+
+        if not self._wires_hidden:
+            self._wires_hidden = True
+            for wire in self.wires:
+                wire.hide()
+
+        for item, (x, y) in zip(self.items, coordinates):
+            item.setPos(x, y)
+
+        scene = self.items[0].scene()
+        if scene is not None:
+            scene.mark_changed(self._swept_rect(self._offset, (dx, dy)))
+        self._offset = (dx, dy)
+
+    def _swept_rect(self, before: Tuple[float, float], after: Tuple[float, float]) -> Tuple[float, float, float, float]:
+        # Граница блоков до и после сдвига; привязка к сетке сдвигает блоки не дальше шага сетки
+        left, top, right, bottom = self._bounds
+        margin = self.grid_size
+        return (left + min(before[0], after[0]) - margin, top + min(before[1], after[1]) - margin,
+                right + max(before[0], after[0]) + margin, bottom + max(before[1], after[1]) + margin)
+
+    def settle(self, wires_visible: bool = True) -> None:
+        """
+        Перестраивает связи перемещенных блоков (перетаскивание остановилось).
+
+        Args:
+            wires_visible: Связи показываются отдельными элементами (не в обзорном режиме)
+        """
+        if not self._wires_hidden:
+            return
+        self._wires_hidden = False
+        scene = self.items[0].scene() if self.items else None
+        if scene is not None:
+            # Сцена переиндексирует блоки и проложит их связи и связи, на которые они легли
+            scene.blocks_moved(self.items)
+        else:
+            for wire in self.wires:
+                wire.update_path()
+        if wires_visible:
+            for wire in self.wires:
+                wire.show()
+
+    def final_positions(self) -> Dict[str, Tuple[float, float]]:
+        """Итоговые позиции блоков, которые сдвинулись: {id блока: (x, y)}"""
+        if not self.moved:
+            return {}
+        positions = self._positions.tolist() if np is not None else self._positions
+        origins = self._origins.tolist() if np is not None else self._origins
+        result = {}
+        for item, position, origin in zip(self.items, positions, origins):
+            if tuple(position) != tuple(origin):
+                result[item.block_id] = (position[0], position[1])
+        return result
@@ -0,0 +1,126 @@
+"""
+Фоновая сетка холста блоков.
+
+Сетка периодична, поэтому рисуется не линиями на каждом кадре, а одним
+растровым фрагментом, который копируется по видимой области. Фрагмент
+строится для текущего масштаба и темы и хранится в кэше до изменения
+масштаба, темы или настройки сетки.
+"""
+import math
+from typing import Dict, Tuple
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QPen
+from ..core.theme_manager import _THEME
+
+
+# Шаг сетки в координатах сцены (к нему же привязываются блоки)
+GRID_SIZE = 20
+
+# Каждая MAJOR_EVERY-я линия - основная
+MAJOR_EVERY = 5
+
+# Линии ближе этого расстояния на экране не рисуются: шаг увеличивается в MAJOR_EVERY раз
+MIN_LINE_SPACING = 8
+
+# Примерный размер растрового фрагмента в пикселях экрана
+TILE_PIXELS = 512
+
+# Число масштабов, фрагменты которых хранятся одновременно
+CACHE_SIZE = 4
+
+
+class GridRenderer:
+
+    def __init__(self, grid_size: int = GRID_SIZE):
+        """
+        Отрисовка сетки готовыми фрагментами.
+
+        Args:
+            grid_size: Шаг сетки в координатах сцены
+        """
+        self.grid_size = grid_size
+        self.visible = True
+        self._tiles: Dict[Tuple[float, float], Tuple[float, QPixmap]] = {}
+        self.load_colors()
+
+    def load_colors(self) -> None:
+        colors = _THEME.get_all_colors("canvas")
+        self.background = QColor(colors.get("background", "#1B1B1C"))
+        self.minor_color = QColor(colors.get("grid_minor", "#262628"))
+        self.major_color = QColor(colors.get("grid_major", "#303033"))
+
+    def invalidate(self) -> None:
+        """Сбрасывает кэш фрагментов (смена темы или шага сетки)"""
+        self._tiles.clear()
+
+    def set_theme(self) -> None:
+        self.load_colors()
+        self.invalidate()
+
+    def line_step(self, zoom: float) -> float:
+        """Шаг видимых линий для масштаба: мелкие линии пропускаются при отдалении"""
+        step = float(self.grid_size)
+        while step * zoom < MIN_LINE_SPACING:
+            step *= MAJOR_EVERY
+        return step
+
+    def draw(self, painter: QPainter, rect: QRectF, zoom: float) -> None:
+        """
+        Заливает фон и рисует сетку в области сцены.
+
+        Args:
+            painter: QPainter с преобразованием представления
+            rect: Перерисовываемая область в координатах сцены
+            zoom: Масштаб представления
+        """
+        if not self.visible or zoom <= 0:
+            painter.fillRect(rect, self.background)
+            return
+
+        tile_size, pixmap = self._tile(zoom)
+        source = QRectF(pixmap.rect())
+        left = math.floor(rect.left() / tile_size) * tile_size
+        top = math.floor(rect.top() / tile_size) * tile_size
+        y = top
+        while y < rect.bottom():
+            x = left
+            while x < rect.right():
+                painter.drawPixmap(QRectF(x, y, tile_size, tile_size), pixmap, source)
+                x += tile_size
+            y += tile_size
+
+    def _tile(self, zoom: float) -> Tuple[float, QPixmap]:
+        key = (round(zoom, 6), self.grid_size)
+        cached = self._tiles.get(key)
+        if cached is not None:
+            return cached
+
+        step = self.line_step(zoom)
+        major_step = step * MAJOR_EVERY
+        # Фрагмент - целое число периодов основных линий, около TILE_PIXELS на экране
+        tile_size = major_step * max(1, round(TILE_PIXELS / (major_step * zoom)))
+        pixels = max(1, math.ceil(tile_size * zoom))
+        scale = pixels / tile_size
+
+        pixmap = QPixmap(pixels, pixels)
+        pixmap.fill(self.background)
+        painter = QPainter(pixmap)
+        minor_pen = QPen(self.minor_color, 1)
+        major_pen = QPen(self.major_color, 1)
+        # Линии на левой и верхней границе; правая и нижняя - это границы соседнего фрагмента.
+        # Основные линии рисуются вторыми, чтобы мелкие не перекрывали их в пересечениях
+        line_count = int(round(tile_size / step))
+        for is_major, pen in ((False, minor_pen), (True, major_pen)):
+            painter.setPen(pen)
+            for index in range(line_count):
+                if (index % MAJOR_EVERY == 0) != is_major:
+                    continue
+                position = int(index * step * scale)
+                painter.drawLine(position, 0, position, pixels)
+                painter.drawLine(0, position, pixels, position)
+        painter.end()
+
+        if len(self._tiles) >= CACHE_SIZE:
+            self._tiles.pop(next(iter(self._tiles)))
+        self._tiles[key] = (tile_size, pixmap)
+        return tile_size, pixmap
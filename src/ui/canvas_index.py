@@ -0,0 +1,389 @@
+"""
+Пространственный индекс холста блоков.
+
+Прямоугольники блоков, порты и отрезки связей раскладываются по ячейкам
+равномерной сетки, поэтому поиск под курсором и проверка препятствий при
+прокладке связи просматривают только несколько соседних ячеек, а не все
+элементы проекта. При перемещении блока обновляются только его ячейки и
+отрезки его связей.
+
+Связь прокладывается кривой, если кривая не пересекает блоки; иначе -
+ломаной с горизонтальным участком по свободному коридору между блоками.
+"""
+import math
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+# Размер ячейки индекса в координатах сцены (около размера блока)
+CELL_SIZE = 200
+
+# Прямоугольник (левый x, верхний y, правый x, нижний y)
+Rect = Tuple[float, float, float, float]
+Point = Tuple[float, float]
+
+# Отступ связи от блоков при обходе
+ROUTE_MARGIN = 12
+
+# Длина горизонтального участка у порта перед поворотом
+ROUTE_STUB = 20
+
+# Насколько выше и ниже концов связи ищется свободный коридор
+ROUTE_SEARCH = 300
+
+# Кривая связи приближается отрезками длиной около CURVE_STEP, но не больше CURVE_SEGMENTS
+CURVE_STEP = 60
+CURVE_SEGMENTS = 12
+
+# Отрезки связи хранятся в индексе группами: одна запись - до SEGMENTS_PER_ENTRY отрезков
+SEGMENTS_PER_ENTRY = 4
+
+
+class SpatialGrid:
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        """
+        Индекс прямоугольников по ячейкам сетки.
+
+        Args:
+            cell_size: Размер ячейки в координатах сцены
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._rects: Dict[Hashable, Rect] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rects
+
+    def rect(self, key: Hashable) -> Optional[Rect]:
+        return self._rects.get(key)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._rects.clear()
+
+    def _cell_range(self, rect: Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return int(rect[0] // size), int(rect[1] // size), int(rect[2] // size), int(rect[3] // size)
+
+    def insert(self, key: Hashable, rect: Rect) -> None:
+        """Добавляет или перемещает элемент (затрагиваются только измененные ячейки)"""
+        old = self._rects.get(key)
+        if old is not None:
+            old_range = self._cell_range(old)
+            new_range = self._cell_range(rect)
+            self._rects[key] = rect
+            if old_range == new_range:
+                return
+            self._unlink(key, old_range)
+            self._link(key, new_range)
+            return
+        self._rects[key] = rect
+        self._link(key, self._cell_range(rect))
+
+    def remove(self, key: Hashable) -> None:
+        rect = self._rects.pop(key, None)
+        if rect is not None:
+            self._unlink(key, self._cell_range(rect))
+
+    def query(self, rect: Rect) -> Set[Hashable]:
+        """Элементы, прямоугольники которых пересекают rect"""
+        left, top, right, bottom = rect
+        x1, y1, x2, y2 = self._cell_range(rect)
+        found = set()
+        rects = self._rects
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = self._cells.get((cx, cy))
+                if not cell:
+                    continue
+                for key in cell:
+                    if key in found:
+                        continue
+                    r = rects[key]
+                    if r[0] <= right and r[2] >= left and r[1] <= bottom and r[3] >= top:
+                        found.add(key)
+        return found
+
+    def query_point(self, x: float, y: float, radius: float = 0.0) -> Set[Hashable]:
+        return self.query((x - radius, y - radius, x + radius, y + radius))
+
+    def _link(self, key: Hashable, cell_range: Tuple[int, int, int, int]) -> None:
+        x1, y1, x2, y2 = cell_range
+        cells = self._cells
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = {key}
+                else:
+                    cell.add(key)
+
+    def _unlink(self, key: Hashable, cell_range: Tuple[int, int, int, int]) -> None:
+        x1, y1, x2, y2 = cell_range
+        cells = self._cells
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(key)
+                    if not cell:
+                        del cells[(cx, cy)]
+
+
+def segment_bounds(a: Point, b: Point) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]), max(a[1], b[1]))
+
+
+def point_segment_distance(p: Point, a: Point, b: Point) -> float:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = dx * dx + dy * dy
+    if length == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length))
+    return math.hypot(p[0] - (a[0] + t * dx), p[1] - (a[1] + t * dy))
+
+
+def segment_hits_rect(a: Point, b: Point, rect: Rect) -> bool:
+    """Пересекает ли отрезок прямоугольник (отсечение Лианга-Барски)"""
+    left, top, right, bottom = rect
+    x, y = a
+    dx, dy = b[0] - x, b[1] - y
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x - left), (dx, right - x), (-dy, y - top), (dy, bottom - y)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return t0 <= t1
+
+
+def curve_points(start: Point, end: Point) -> List[Point]:
+    """Точки кривой связи (та же кривая Безье, что рисует WireItem)"""
+    offset = max(40.0, abs(end[0] - start[0]) / 2)
+    c1 = (start[0] + offset, start[1])
+    c2 = (end[0] - offset, end[1])
+    # Длина ломаной опорных точек - оценка длины кривой сверху
+    length = (2 * offset + abs(c2[0] - c1[0]) + abs(end[1] - start[1]))
+    count = max(4, min(CURVE_SEGMENTS, int(length / CURVE_STEP)))
+    points = []
+    for step in range(count + 1):
+        t = step / count
+        u = 1 - t
+        a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+        points.append((a * start[0] + b * c1[0] + c * c2[0] + d * end[0],
+                       a * start[1] + b * c1[1] + c * c2[1] + d * end[1]))
+    return points
+
+
+class CanvasIndex:
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        """
+        Индекс блоков, портов и отрезков связей холста.
+
+        Args:
+            cell_size: Размер ячейки в координатах сцены
+        """
+        self.blocks = SpatialGrid(cell_size)
+        self.ports = SpatialGrid(cell_size)
+        self.segments = SpatialGrid(cell_size)
+        self._port_points: Dict[Tuple[Any, str], Point] = {}
+        self._wire_points: Dict[Hashable, List[Point]] = {}
+
+    def clear(self) -> None:
+        self.blocks.clear()
+        self.ports.clear()
+        self.segments.clear()
+        self._port_points.clear()
+        self._wire_points.clear()
+
+    # --- блоки и порты ---
+
+    def set_block(self, block_id: Any, rect: Rect, input_port: Optional[Point], output_port: Point) -> None:
+        """
+        Добавляет или перемещает блок.
+
+        Args:
+            block_id: Идентификатор блока
+            rect: Прямоугольник блока
+            input_port: Точка входа (None - у блока нет входа)
+            output_port: Точка выхода
+        """
+        self.blocks.insert(block_id, rect)
+        for kind, point in (("in", input_port), ("out", output_port)):
+            key = (block_id, kind)
+            if point is None:
+                self._port_points.pop(key, None)
+                self.ports.remove(key)
+            else:
+                self._port_points[key] = point
+                self.ports.insert(key, (point[0], point[1], point[0], point[1]))
+
+    def remove_block(self, block_id: Any) -> None:
+        self.blocks.remove(block_id)
+        for kind in ("in", "out"):
+            self._port_points.pop((block_id, kind), None)
+            self.ports.remove((block_id, kind))
+
+    def port_at(self, x: float, y: float, radius: float, kind: str = None) -> Optional[Tuple[Any, str]]:
+        """
+        Ближайший порт в радиусе от точки.
+
+        Args:
+            x, y: Точка в координатах сцены
+            radius: Радиус поиска
+            kind: "in" или "out" (None - любой)
+
+        Returns:
+            (id блока, "in" | "out") или None
+        """
+        best, best_distance = None, radius
+        for key in self.ports.query_point(x, y, radius):
+            if kind is not None and key[1] != kind:
+                continue
+            point = self._port_points[key]
+            distance = math.hypot(point[0] - x, point[1] - y)
+            if distance <= best_distance:
+                best, best_distance = key, distance
+        return best
+
+    def port_point(self, block_id: Any, kind: str) -> Optional[Point]:
+        return self._port_points.get((block_id, kind))
+
+    # --- связи ---
+
+    @staticmethod
+    def _entry_count(points: List[Point]) -> int:
+        return (len(points) - 2) // SEGMENTS_PER_ENTRY + 1 if len(points) > 1 else 0
+
+    def set_wire(self, key: Hashable, points: List[Point]) -> None:
+        """Записывает ломаную связи (записи прежней ломаной заменяются)"""
+        old = self._wire_points.get(key)
+        count = self._entry_count(points)
+        if old is not None:
+            for entry in range(count, self._entry_count(old)):
+                self.segments.remove((key, entry))
+        self._wire_points[key] = points
+        step = SEGMENTS_PER_ENTRY
+        for entry in range(count):
+            chunk = points[entry * step:entry * step + step + 1]
+            xs = [p[0] for p in chunk]
+            ys = [p[1] for p in chunk]
+            self.segments.insert((key, entry), (min(xs), min(ys), max(xs), max(ys)))
+
+    def remove_wire(self, key: Hashable) -> None:
+        points = self._wire_points.pop(key, None)
+        if points is not None:
+            for entry in range(self._entry_count(points)):
+                self.segments.remove((key, entry))
+
+    def wire_at(self, x: float, y: float, tolerance: float) -> Optional[Hashable]:
+        """Ближайшая к точке связь не дальше tolerance"""
+        best, best_distance = None, tolerance
+        step = SEGMENTS_PER_ENTRY
+        for key, entry in self.segments.query_point(x, y, tolerance):
+            points = self._wire_points[key]
+            first = entry * step
+            for index in range(first, min(first + step, len(points) - 1)):
+                distance = point_segment_distance((x, y), points[index], points[index + 1])
+                if distance <= best_distance:
+                    best, best_distance = key, distance
+        return best
+
+    def _foreign_rects(self, area: Rect, exclude: Set[Any]) -> List[Rect]:
+        """Прямоугольники чужих блоков в области, расширенные на ROUTE_MARGIN"""
+        margin = ROUTE_MARGIN
+        rects = []
+        for block_id in self.blocks.query(area):
+            if block_id not in exclude:
+                r = self.blocks.rect(block_id)
+                rects.append((r[0] - margin, r[1] - margin, r[2] + margin, r[3] + margin))
+        return rects
+
+    def route(self, start: Point, end: Point, exclude: Iterable[Any] = ()) -> Tuple[bool, List[Point]]:
+        """
+        Прокладывает связь от выхода start ко входу end в обход блоков.
+
+        Коридор ищется не перебором: блоки в полосе между концами связи
+        выбираются одним запросом к индексу, и свободная высота для
+        горизонтального участка вычисляется по их интервалам.
+
+        Args:
+            start: Точка выхода
+            end: Точка входа
+            exclude: Блоки, которые не считаются препятствиями (концы связи)
+
+        Returns:
+            (True, точки кривой) если кривая свободна, иначе (False, точки ломаной).
+            Если свободного коридора нет, возвращается кривая
+        """
+        exclude = set(exclude)
+        curve = curve_points(start, end)
+        # Кривая лежит внутри прямоугольника своих опорных точек
+        offset = max(40.0, abs(end[0] - start[0]) / 2)
+        margin = ROUTE_MARGIN
+        area = (min(start[0], end[0] - offset) - margin, min(start[1], end[1]) - margin,
+                max(start[0] + offset, end[0]) + margin, max(start[1], end[1]) + margin)
+        rects = self._foreign_rects(area, exclude)
+        if not rects:
+            return True, curve
+        blocked = False
+        for index in range(len(curve) - 1):
+            a, b = curve[index], curve[index + 1]
+            left, top, right, bottom = segment_bounds(a, b)
+            for r in rects:
+                if r[0] <= right and r[2] >= left and r[1] <= bottom and r[3] >= top and segment_hits_rect(a, b, r):
+                    blocked = True
+                    break
+            if blocked:
+                break
+        if not blocked:
+            return True, curve
+
+        x1 = start[0] + ROUTE_STUB
+        x2 = end[0] - ROUTE_STUB
+        left, right = min(x1, x2), max(x1, x2)
+        low = min(start[1], end[1]) - ROUTE_SEARCH
+        high = max(start[1], end[1]) + ROUTE_SEARCH
+        rects = self._foreign_rects((left - margin, low, right + margin, high), exclude)
+
+        # Вертикальные участки у портов ограничивают высоту коридора сверху и снизу
+        for x, y in ((x1, start[1]), (x2, end[1])):
+            for r in rects:
+                if r[0] <= x <= r[2]:
+                    if r[1] <= y <= r[3]:
+                        return True, curve
+                    if r[1] > y:
+                        high = min(high, r[1])
+                    else:
+                        low = max(low, r[3])
+
+        # Свободные промежутки между интервалами блоков в полосе горизонтального участка
+        middle = (start[1] + end[1]) / 2
+        best = None
+        cursor = low
+        for top, bottom in sorted((r[1], r[3]) for r in rects) + [(high, high)]:
+            if top > cursor + 2:
+                gap_top, gap_bottom = cursor + 1, min(top, high) - 1
+                if gap_top <= gap_bottom:
+                    y = min(max(middle, gap_top), gap_bottom)
+                    if best is None or abs(y - middle) < abs(best - middle):
+                        best = y
+            cursor = max(cursor, bottom)
+            if cursor >= high:
+                break
+        if best is None:
+            return True, curve
+        return False, [start, (x1, start[1]), (x1, best), (x2, best), (x2, end[1]), end]
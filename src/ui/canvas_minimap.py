@@ -0,0 +1,232 @@
+"""
+Мини-карта холста блоков.
+
+Уменьшенная сцена хранится в растре и не рисуется заново при каждом
+изменении: сцена сообщает области, в которых изменились блоки
+(BlockScene.contents_changed), мини-карта копит их и по таймеру, не чаще
+MINIMAP_UPDATE_MS, перерисовывает в растре только эти области. Блоки
+рисуются прямоугольниками цвета заголовка, без отрисовки самих элементов;
+блоки перерисовываемой области находятся по пространственному индексу
+сцены.
+
+Рамка видимой области рисуется поверх готового растра, поэтому прокрутка
+и масштабирование холста растр не перерисовывают.
+"""
+from typing import Dict, List, Optional
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRectF, QPointF, QSize, QTimer
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QPen, QTransform
+from ..core.theme_manager import _THEME
+from .block_canvas import BLOCK_WIDTH, BLOCK_HEIGHT
+
+
+MINIMAP_WIDTH = 220
+MINIMAP_HEIGHT = 150
+
+# Отступ мини-карты от угла холста
+MINIMAP_MARGIN = 12
+
+# Поле вокруг блоков внутри мини-карты (доля размера)
+CONTENT_PADDING = 0.05
+
+# Изменения сцены переносятся на мини-карту не чаще этого интервала
+MINIMAP_UPDATE_MS = 150
+
+# Если накоплено больше областей, перерисовывается их общая граница
+MAX_DIRTY_RECTS = 16
+
+
+class CanvasMinimap(QWidget):
+
+    def __init__(self, canvas):
+        """
+        Мини-карта в углу холста: уменьшенные блоки и рамка видимой области.
+
+        Нажатие и перетаскивание левой кнопкой по мини-карте перемещают холст.
+
+        Args:
+            canvas: BlockCanvas, поверх которого лежит мини-карта
+        """
+        super().__init__(canvas)
+        self.canvas = canvas
+        self.scene = canvas.block_scene
+        self._pixmap: Optional[QPixmap] = None
+        # Сцена -> координаты мини-карты
+        self._transform = QTransform()
+        self._content = QRectF()
+        self._dirty: List[QRectF] = []
+        self._full = True
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.refresh)
+
+        self.setFixedSize(MINIMAP_WIDTH, MINIMAP_HEIGHT)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.load_colors()
+        self.hide()
+
+        self.scene.contents_changed.connect(self.mark_dirty)
+        self.scene.sceneRectChanged.connect(self._on_scene_rect_changed)
+        for scroll_bar in (canvas.horizontalScrollBar(), canvas.verticalScrollBar()):
+            scroll_bar.valueChanged.connect(self._on_view_changed)
+
+    def load_colors(self) -> None:
+        colors = _THEME.get_all_colors("canvas")
+        self.background = QColor(colors.get("minimap_background", "#141415"))
+        self.border_pen = QPen(QColor(colors.get("block_border", "#464647")), 1)
+        self.viewport_pen = QPen(QColor(colors.get("block_selected", "#007ACC")), 1.5)
+
+    def apply_theme(self) -> None:
+        self.load_colors()
+        self.mark_dirty(QRectF())
+
+    def mark_dirty(self, rect: QRectF) -> None:
+        """
+        Отмечает область сцены для перерисовки (выполняется по таймеру).
+
+        Args:
+            rect: Область сцены; пустой прямоугольник - вся мини-карта
+        """
+        if not self._full:
+            if rect.isNull():
+                self._full = True
+                self._dirty.clear()
+            else:
+                self._dirty.append(rect)
+                if len(self._dirty) > MAX_DIRTY_RECTS:
+                    bounds = self._dirty[0]
+                    for dirty in self._dirty[1:]:
+                        bounds = bounds.united(dirty)
+                    self._dirty = [bounds]
+        if not self._timer.isActive():
+            self._timer.start(MINIMAP_UPDATE_MS)
+
+    def refresh(self) -> None:
+        """Переносит накопленные изменения в растр мини-карты"""
+        self._timer.stop()
+        if not self.scene.block_items:
+            self._full = True
+            self._dirty.clear()
+            self.hide()
+            return
+
+        content = self._content_rect()
+        if self._full or self._pixmap is None or content != self._content:
+            self._content = content
+            self._update_transform()
+            self._render(None)
+            self.update()
+        else:
+            for rect in self._dirty:
+                self.update(self._render(rect))
+        self._full = False
+        self._dirty.clear()
+        if not self.isVisible():
+            self.show()
+
+    def _content_rect(self) -> QRectF:
+        content = self.scene.contents_rect()
+        padding = max(content.width(), content.height()) * CONTENT_PADDING
+        return content.adjusted(-padding, -padding, padding, padding)
+
+    def _update_transform(self) -> None:
+        # Масштаб с сохранением пропорций, содержимое по центру
+        content = self._content
+        scale = min(self.width() / max(content.width(), 1.0), self.height() / max(content.height(), 1.0))
+        dx = (self.width() - content.width() * scale) / 2 - content.left() * scale
+        dy = (self.height() - content.height() * scale) / 2 - content.top() * scale
+        self._transform = QTransform(scale, 0, 0, scale, dx, dy)
+
+        ratio = self.devicePixelRatioF()
+        size = QSize(round(self.width() * ratio), round(self.height() * ratio))
+        if self._pixmap is None or self._pixmap.size() != size:
+            self._pixmap = QPixmap(size)
+            self._pixmap.setDevicePixelRatio(ratio)
+
+    def _render(self, rect: Optional[QRectF]):
+        """
+        Перерисовывает часть растра.
+
+        Args:
+            rect: Область сцены или None - весь растр
+
+        Returns:
+            Перерисованная область мини-карты (QRect)
+        """
+        area = self.rect()
+        if rect is not None:
+            area = self._transform.mapRect(rect).toAlignedRect().adjusted(-1, -1, 1, 1).intersected(area)
+            if area.isEmpty():
+                return area
+            inverted, _ = self._transform.inverted()
+            scene_area = inverted.mapRect(QRectF(area))
+            items = self.scene.blocks_in((scene_area.left(), scene_area.top(),
+                                          scene_area.right(), scene_area.bottom()))
+        else:
+            items = self.scene.block_items.values()
+
+        groups: Dict[str, List[QRectF]] = {}
+        for item in items:
+            groups.setdefault(item.block_type, []).append(QRectF(item.x(), item.y(), BLOCK_WIDTH, BLOCK_HEIGHT))
+
+        painter = QPainter(self._pixmap)
+        painter.setClipRect(area)
+        painter.fillRect(area, self.background)
+        painter.setTransform(self._transform)
+        painter.setPen(Qt.PenStyle.NoPen)
+        colors = self.scene.colors
+        for block_type, rects in groups.items():
+            painter.setBrush(colors.header_brush(block_type))
+            painter.drawRects(rects)
+        painter.end()
+        return area
+
+    def _on_scene_rect_changed(self, rect: QRectF) -> None:
+        # Граница блоков изменилась: масштаб мини-карты пересчитывается
+        self.mark_dirty(QRectF())
+
+    def _on_view_changed(self, value: int) -> None:
+        # Сдвинулась только рамка видимой области
+        if self.isVisible():
+            self.update()
+
+    def place(self) -> None:
+        """Располагает мини-карту в правом нижнем углу области просмотра холста"""
+        viewport = self.canvas.viewport().geometry()
+        self.move(viewport.right() - self.width() - MINIMAP_MARGIN + 1,
+                  viewport.bottom() - self.height() - MINIMAP_MARGIN + 1)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        if self._pixmap is not None:
+            painter.drawPixmap(0, 0, self._pixmap)
+
+        canvas = self.canvas
+        visible = canvas.mapToScene(canvas.viewport().rect()).boundingRect()
+        frame = self._transform.mapRect(visible).intersected(QRectF(self.rect()).adjusted(1, 1, -1, -1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        if not frame.isEmpty():
+            painter.setPen(self.viewport_pen)
+            painter.drawRect(frame)
+        painter.setPen(self.border_pen)
+        painter.drawRect(QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5))
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._center_at(event.position())
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            self._center_at(event.position())
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def _center_at(self, position: QPointF) -> None:
+        inverted, invertible = self._transform.inverted()
+        if invertible:
+            self.canvas.centerOn(inverted.map(position))
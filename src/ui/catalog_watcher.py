@@ -0,0 +1,52 @@
+from typing import List
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+
+
+class CatalogWatcher(QObject):
+
+    # Каталог проектов обновлен (испускается в потоке интерфейса)
+    catalog_changed = pyqtSignal()
+
+    # Сигнал из фонового потока сканирования
+    _scanned = pyqtSignal(object)
+
+    # Ограничение числа наблюдаемых каталогов (inotify и ReadDirectoryChangesW не бесконечны)
+    MAX_WATCHED_DIRS = 1000
+
+    def __init__(self, catalog, parent=None):
+        """
+        Поддерживает каталог проектов в актуальном состоянии.
+
+        Фоновый поток обходит корни каталога, QFileSystemWatcher сообщает
+        об изменениях в просмотренных каталогах, которые затем проверяются
+        повторно.
+
+        Args:
+            catalog: ProjectCatalog
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        from ..core.project_catalog import CatalogScanner
+
+        self.catalog = catalog
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._scanned.connect(self._on_scanned)
+        self.scanner = CatalogScanner(catalog, on_changed=self._scanned.emit)
+
+    def start(self) -> None:
+        self.scanner.start()
+
+    def stop(self) -> None:
+        self.scanner.stop()
+
+    def _on_directory_changed(self, directory: str) -> None:
+        self.scanner.request_scan(directory)
+
+    def _on_scanned(self, directories: List[str]) -> None:
+        watched = set(self._watcher.directories())
+        new_dirs = [d for d in directories if d not in watched]
+        room = self.MAX_WATCHED_DIRS - len(watched)
+        if new_dirs and room > 0:
+            self._watcher.addPaths(new_dirs[:room])
+        self.catalog_changed.emit()
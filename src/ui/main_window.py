@@ -1,5 +1,5 @@
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QCloseEvent
 from ..core.theme_manager import _THEME
 from ..core.window_router import WindowRouter
@@ -8,6 +8,10 @@ from ..core.text_manager import get_text, set_language, get_current_language
 from ..core.app_settings_manager import _APP_SETTINGS
 from .menu_system import MenuSystem
 from .workspace import Workspace
+from .run_controller import RunController
+from .project_open_controller import ProjectOpenController
+from .autosave_controller import AutosaveController
+from .catalog_watcher import CatalogWatcher
 
 
 class MainWindow(QMainWindow):
@@ -43,7 +47,155 @@ class MainWindow(QMainWindow):
         # Добавляем кнопку для тестирования изменений в статус-бар
         self.statusBar().showMessage("Готов к работе")
         
+        # Запуск проекта и отображение профиля выполнения
+        self.run_controller = RunController(parent=self)
+        self.run_controller.progress.connect(self._on_run_progress)
+        self.run_controller.run_finished.connect(self._on_run_finished)
+        self.run_controller.run_failed.connect(self.statusBar().showMessage)
         
+        # Открытие проекта в фоновом потоке с прогрессом в статус-баре
+        self.open_controller = ProjectOpenController(parent=self)
+        self.open_controller.progress.connect(self._on_open_progress)
+        self.open_controller.opened.connect(self._on_open_finished)
+        self.open_controller.failed.connect(self._on_open_failed)
+        self.open_controller.cancelled.connect(self._on_open_cancelled)
+        
+        self.open_progress_bar = QProgressBar()
+        self.open_progress_bar.setRange(0, 100)
+        self.open_progress_bar.setMaximumWidth(200)
+        self.open_progress_bar.hide()
+        self.statusBar().addPermanentWidget(self.open_progress_bar)
+        
+        self.open_cancel_button = QPushButton(get_text("button_cancel"))
+        self.open_cancel_button.clicked.connect(self.open_controller.cancel)
+        self.open_cancel_button.hide()
+        self.statusBar().addPermanentWidget(self.open_cancel_button)
+        
+        # Бюджет памяти истории отмены
+        from ..core.edit_history import _EDIT_HISTORY
+        _EDIT_HISTORY.memory_budget = int(_APP_SETTINGS.get_setting("undo_memory_mb", 8) * 1024 * 1024)
+        
+        # Автосохранение в файл восстановления
+        self.autosave = AutosaveController(parent=self)
+        # Предложение восстановления показывается поверх уже открытого окна
+        QTimer.singleShot(0, lambda: self._offer_recovery(None, "untitled"))
+        
+        # Каталог проектов обновляется в фоне; меню последних проектов читает его без обращения к файлам
+        from ..core.project_manager import _PROJECT_MANAGER
+        self.catalog_watcher = CatalogWatcher(_PROJECT_MANAGER.catalog, parent=self)
+        self.catalog_watcher.catalog_changed.connect(self.menu_system.refresh_recent_projects_menu)
+        self.catalog_watcher.start()
+    
+    def _offer_recovery(self, project_path, project_name):
+        """Предлагает восстановить проект из автосохраненной копии, если она новее файла"""
+        import time
+        from ..core.autosave import find_recovery
+        from ..core.project_manager import _PROJECT_MANAGER
+        from ..windows.recovery_window import RecoveryWindow
+        
+        recovery_path = find_recovery(project_path, project_name)
+        if recovery_path is None:
+            return
+        print(f"Найдена автосохраненная копия проекта: {recovery_path}")
+        try:
+            saved_at = time.strftime("%d.%m.%Y %H:%M", time.localtime(recovery_path.stat().st_mtime))
+        except OSError:
+            return
+        
+        dialog = RecoveryWindow(saved_at, self)
+        dialog.exec()
+        
+        choice = dialog.get_user_choice()
+        if choice == 'restore':
+            if _PROJECT_MANAGER.restore_recovery(recovery_path, project_path):
+                self.statusBar().showMessage(get_text("message_recovery_restored"))
+                return
+        elif choice == 'discard':
+            self.autosave.writer.discard(recovery_path)
+            return
+        # Окно закрыто без выбора - копия остается до следующего изменения проекта
+        self.statusBar().showMessage(f"{get_text('message_recovery_found')}: {recovery_path}")
+    
+    def open_project_file(self, file_path: str) -> bool:
+        """
+        Открывает проект в фоновом потоке; интерфейс остается доступным.
+        
+        Returns:
+            True если чтение начато
+        """
+        import os
+        
+        if not os.path.exists(file_path):
+            print(f"Ошибка: Файл не найден: {file_path}")
+            self.statusBar().showMessage(f"{get_text('message_open_failed')}: {file_path}")
+            return False
+        
+        if not self.open_controller.start(file_path):
+            return False
+        
+        self.open_progress_bar.setValue(0)
+        self.open_progress_bar.show()
+        self.open_cancel_button.setText(get_text("button_cancel"))
+        self.open_cancel_button.show()
+        self.statusBar().showMessage(f"{get_text('message_open_progress')}: {os.path.basename(file_path)}")
+        return True
+    
+    def _on_open_progress(self, done: int, total: int):
+        percent = done * 100 // total if total else 100
+        self.open_progress_bar.setValue(percent)
+        self.statusBar().showMessage(
+            f"{get_text('message_open_progress')}: {done / 1048576:.0f} / {total / 1048576:.0f} {get_text('label_megabytes')}"
+        )
+    
+    def _hide_open_progress(self):
+        self.open_progress_bar.hide()
+        self.open_cancel_button.hide()
+    
+    def _on_open_finished(self, file_path: str):
+        self._hide_open_progress()
+        self.menu_system.refresh_recent_projects_menu()
+        self.statusBar().showMessage(get_text("message_open_finished"))
+        self._offer_recovery(file_path, _TITLE_MANAGER.get_project_name())
+    
+    def _on_open_failed(self, file_path: str, error: str):
+        self._hide_open_progress()
+        self.statusBar().showMessage(f"{get_text('message_open_failed')}: {error}")
+    
+    def _on_open_cancelled(self, file_path: str):
+        self._hide_open_progress()
+        self.statusBar().showMessage(get_text("message_open_cancelled"))
+    
+    def run_project(self):
+        """Запускает выполнение открытого проекта"""
+        from ..core.project_manager import _PROJECT_MANAGER
+        
+        if self.run_controller.is_running():
+            self.statusBar().showMessage(get_text("message_run_already_running"))
+            return
+        
+        # Файл записей прежнего запуска заменяется новым
+        self.workspace.left_panel.profiler_panel.set_results_exporter(None)
+        if self.run_controller.start(_PROJECT_MANAGER.get_current_project_data()):
+            self.workspace.left_panel.profiler_panel.set_profiler(self.run_controller.engine.profiler)
+            self.statusBar().showMessage(get_text("message_run_started"))
+    
+    def stop_project(self):
+        """Останавливает выполнение проекта"""
+        self.run_controller.stop()
+    
+    def _on_run_progress(self, report, status):
+        self.workspace.left_panel.show_profile(report)
+        self.statusBar().showMessage(status)
+    
+    def _on_run_finished(self, summary):
+        self.workspace.left_panel.show_profile(summary["blocks"], summary)
+        self.workspace.left_panel.profiler_panel.set_results_exporter(self.run_controller.export_results)
+        message_key = "message_run_stopped" if summary["stopped"] else "message_run_finished"
+        self.statusBar().showMessage(
+            f"{get_text(message_key)}: {get_text('label_run_records')}: {summary['records']}, "
+            f"{get_text('label_run_errors')}: {summary['errors']}, "
+            f"{summary['elapsed_s']:.1f} {get_text('label_seconds')}"
+        )
     
     def refresh_menus(self):
         menubar = self.menuBar()
@@ -89,10 +241,10 @@ class MainWindow(QMainWindow):
         
         if "top_bar_submenu_AutoSave" in self.menu_system.checkboxes:
             self.menu_system.checkboxes["top_bar_submenu_AutoSave"].setChecked(auto_save)
-        if "top_bar_submenu_ShowGrid" in self.menu_system.checkboxes:
-            self.menu_system.checkboxes["top_bar_submenu_ShowGrid"].setChecked(show_grid)
-        if "top_bar_submenu_SnapToGrid" in self.menu_system.checkboxes:
-            self.menu_system.checkboxes["top_bar_submenu_SnapToGrid"].setChecked(snap_to_grid)
+        if "top_bar_submenu_Toggle_Grid" in self.menu_system.checkboxes:
+            self.menu_system.checkboxes["top_bar_submenu_Toggle_Grid"].setChecked(show_grid)
+        if "top_bar_submenu_Toggle_Snap_to_Grid" in self.menu_system.checkboxes:
+            self.menu_system.checkboxes["top_bar_submenu_Toggle_Snap_to_Grid"].setChecked(snap_to_grid)
     
     def update_workspace_theme(self):
         """Обновляет тему рабочей области"""
@@ -105,15 +257,26 @@ class MainWindow(QMainWindow):
             if hasattr(self.workspace, 'left_panel'):
                 self.workspace.left_panel.apply_theme()
     
+    def update_workspace_settings(self):
+        """Применяет настройки сетки к холсту блоков"""
+        if hasattr(self, 'workspace') and hasattr(self.workspace, 'left_panel'):
+            self.workspace.left_panel.canvas.apply_settings()
+    
     def update_workspace_language(self):
         """Обновляет язык рабочей области"""
         if hasattr(self, 'workspace'):
             # Обновляем язык веб-браузера
             if hasattr(self.workspace, 'right_panel'):
                 self.workspace.right_panel.update_button_texts()
+            # Обновляем язык панели профиля выполнения
+            if hasattr(self.workspace, 'left_panel'):
+                self.workspace.left_panel.profiler_panel.update_texts()
     
     def closeEvent(self, event: QCloseEvent):
         """Обрабатывает событие закрытия окна"""
+        self.run_controller.stop()
+        self.open_controller.cancel()
+        
         if _TITLE_MANAGER.has_unsaved_changes():
             from ..windows.save_discard_window import SaveDiscardWindow
             
@@ -131,6 +294,11 @@ class MainWindow(QMainWindow):
                 # Сохранение уже обработано в диалоге
                 pass
         
+        from ..core.project_manager import _PROJECT_MANAGER
+        self.autosave.shutdown()
+        self.catalog_watcher.stop()
+        self.run_controller.discard_results()
+        _PROJECT_MANAGER.close_journal()
         event.accept()
     
     def _simulate_changes(self):
@@ -119,7 +119,7 @@ class MenuSystem:
             if checkbox:
                 _THEME.set_theme(checkbox.isChecked())
                 self._update_theme()
-        elif action_id in ["top_bar_submenu_AutoSave", "top_bar_submenu_ShowGrid", "top_bar_submenu_SnapToGrid"]:
+        elif action_id in ["top_bar_submenu_AutoSave", "top_bar_submenu_Toggle_Grid", "top_bar_submenu_Toggle_Snap_to_Grid"]:
             self._handle_checkbox_toggle(action_id)
         elif action_id == "top_bar_submenu_Open_Dev_Tools":
             self._handle_open_dev_tools()
@@ -127,6 +127,32 @@ class MenuSystem:
             self._handle_reload_page()
         elif action_id == "top_bar_submenu_Inspector_Mode":
             self._handle_inspector_mode()
+        elif action_id == "top_bar_submenu_Run_Script":
+            self.parent.run_project()
+        elif action_id == "top_bar_submenu_Stop_Execution":
+            self.parent.stop_project()
+        elif action_id == "top_bar_submenu_Undo":
+            self._handle_undo()
+        elif action_id == "top_bar_submenu_Redo":
+            self._handle_redo()
+        elif action_id == "top_bar_submenu_Zoom_In":
+            self._handle_canvas_action("zoom_in")
+        elif action_id == "top_bar_submenu_Zoom_Out":
+            self._handle_canvas_action("zoom_out")
+        elif action_id == "top_bar_submenu_Reset_Zoom":
+            self._handle_canvas_action("reset_zoom")
+        elif action_id == "top_bar_submenu_Cut":
+            self._handle_canvas_action("cut_selection")
+        elif action_id == "top_bar_submenu_Copy":
+            self._handle_canvas_action("copy_selection")
+        elif action_id == "top_bar_submenu_Paste":
+            self._handle_canvas_action("paste")
+        elif action_id == "top_bar_submenu_Select_All_Blocks":
+            self._handle_canvas_action("select_all")
+        elif action_id == "top_bar_submenu_Delete_Block":
+            self._handle_canvas_action("delete_selection")
+        elif action_id == "top_bar_submenu_Clear_Workspace":
+            self._handle_canvas_action("clear_workspace")
         else:
             self._handle_general_action(action_id)
     
@@ -151,8 +177,21 @@ class MenuSystem:
         if self._check_unsaved_changes():
             file_path = _PROJECT_MANAGER.get_open_file_path(self.parent)
             if file_path:
-                _PROJECT_MANAGER.open_project(file_path, self.parent)
-                self.refresh_recent_projects_menu()
+                self._open_project_file(file_path)
+    
+    def _handle_undo(self) -> None:
+        from ..core.edit_history import _EDIT_HISTORY
+        from ..core.text_manager import get_text
+        
+        if not _EDIT_HISTORY.undo():
+            self.parent.statusBar().showMessage(get_text("message_nothing_to_undo"))
+    
+    def _handle_redo(self) -> None:
+        from ..core.edit_history import _EDIT_HISTORY
+        from ..core.text_manager import get_text
+        
+        if not _EDIT_HISTORY.redo():
+            self.parent.statusBar().showMessage(get_text("message_nothing_to_redo"))
     
     def _handle_new_project(self) -> None:
         if self._check_unsaved_changes():
@@ -178,6 +217,8 @@ class MenuSystem:
                 # Сохранение уже обработано в диалоге
                 return True
             elif choice == 'discard':
+                # Отброшенные изменения не должны вернуться из журнала при открытии файла
+                _PROJECT_MANAGER.discard_journal()
                 return True  # Продолжаем действие
         
         return True  # Нет несохраненных изменений, продолжаем
@@ -195,13 +236,16 @@ class MenuSystem:
         # Обновляем настройки
         if action_id == "top_bar_submenu_AutoSave":
             _APP_SETTINGS.set_setting("auto_save", is_checked)
-        elif action_id == "top_bar_submenu_ShowGrid":
+        elif action_id == "top_bar_submenu_Toggle_Grid":
             _APP_SETTINGS.set_setting("show_grid", is_checked)
-        elif action_id == "top_bar_submenu_SnapToGrid":
+        elif action_id == "top_bar_submenu_Toggle_Snap_to_Grid":
             _APP_SETTINGS.set_setting("snap_to_grid", is_checked)
         
         # Синхронизируем с окном настроек если оно открыто
         self._sync_settings_window(action_id, is_checked)
+        
+        if hasattr(self.parent, 'update_workspace_settings'):
+            self.parent.update_workspace_settings()
     
     def _sync_settings_window(self, menu_id: str, is_checked: bool) -> None:
         """Синхронизирует состояние чекбокса с окном настроек"""
@@ -216,11 +260,12 @@ class MenuSystem:
             self.parent.window_router.dispatch(self.parent, action_id)
     
     def _populate_recent_projects_menu(self, menu: QMenu) -> None:
+        self._add_search_projects_to_menu(menu)
         recent_projects = _PROJECT_MANAGER.get_recent_projects()
         
         if recent_projects:
             if menu.actions():
-                menu.addSeparator()
+                self._add_recent_projects_separator(menu)
             
             for project_info in recent_projects:
                 self._add_recent_project_to_menu(menu, project_info)
@@ -239,18 +284,46 @@ class MenuSystem:
         
         menu.addAction(action)
     
+    def _add_search_projects_to_menu(self, menu: QMenu) -> None:
+        from ..core.text_manager import get_text
+        search_action = QAction(get_text("menu_search_projects"), self.parent)
+        search_action.setObjectName("recent_project_search")
+        search_action.triggered.connect(self._on_search_projects)
+        menu.addAction(search_action)
+    
+    def _add_recent_projects_separator(self, menu: QMenu) -> None:
+        # Имя нужно, чтобы разделитель удалялся вместе со списком при обновлении
+        separator = menu.addSeparator()
+        separator.setObjectName("recent_project_separator")
+    
     def _add_no_projects_placeholder(self, menu: QMenu) -> None:
         if menu.actions():
-            menu.addSeparator()
+            self._add_recent_projects_separator(menu)
         
         from ..core.text_manager import get_text
         no_projects_action = QAction(get_text("message_no_recent_projects"), self.parent)
         no_projects_action.setEnabled(False)
         menu.addAction(no_projects_action)
     
+    def _on_search_projects(self) -> None:
+        from ..windows.project_search_window import ProjectSearchWindow
+        search_window = ProjectSearchWindow(self.parent)
+        search_window.exec()
+        
+        project_path = search_window.get_selected_path()
+        if project_path:
+            self._on_open_recent_project(project_path)
+    
     def _on_open_recent_project(self, project_path: str) -> None:
         if self._check_unsaved_changes():
-            _PROJECT_MANAGER.open_project(project_path, self.parent)
+            self._open_project_file(project_path)
+    
+    def _open_project_file(self, file_path: str) -> None:
+        # Главное окно читает проект в фоновом потоке и само обновляет список последних
+        if hasattr(self.parent, 'open_project_file'):
+            self.parent.open_project_file(file_path)
+        else:
+            _PROJECT_MANAGER.open_project(file_path, self.parent)
             self.refresh_recent_projects_menu()
     
     def refresh_recent_projects_menu(self) -> None:
@@ -386,4 +459,11 @@ class MenuSystem:
         if hasattr(self.parent, 'workspace') and hasattr(self.parent.workspace, 'right_panel'):
             web_browser = self.parent.workspace.right_panel
             if hasattr(web_browser, 'toggle_inspector_mode'):
-                web_browser.toggle_inspector_mode()
\ No newline at end of file
+                web_browser.toggle_inspector_mode()
+    
+    def _handle_canvas_action(self, method_name: str) -> None:
+        """Вызывает действие холста блоков левой панели"""
+        if hasattr(self.parent, 'workspace') and hasattr(self.parent.workspace, 'left_panel'):
+            canvas = getattr(self.parent.workspace.left_panel, 'canvas', None)
+            if canvas is not None and hasattr(canvas, method_name):
+                getattr(canvas, method_name)()
\ No newline at end of file
@@ -0,0 +1,181 @@
+from typing import Dict, Any, List, Callable, Optional
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
+from PyQt6.QtCore import Qt
+from ..core.theme_manager import _THEME
+from ..core.text_manager import get_text
+
+
+class ProfilerPanel(QWidget):
+
+    # (ключ отчета, ключ локализации заголовка)
+    COLUMNS = [
+        ("block_id", "profiler_column_block"),
+        ("block_type", "profiler_column_type"),
+        ("wall_ms", "profiler_column_wall"),
+        ("cpu_ms", "profiler_column_cpu"),
+        ("items_in", "profiler_column_in"),
+        ("items_out", "profiler_column_out"),
+        ("queue_wait_ms", "profiler_column_wait"),
+        ("blocked_ms", "profiler_column_blocked"),
+        ("errors", "profiler_column_errors")
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.profiler = None
+        self.summary: Dict[str, Any] = {}
+        self.results_exporter: Optional[Callable[[str], int]] = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        self.title_label = QLabel()
+        layout.addWidget(self.title_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setSortingEnabled(True)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        self.flamegraph_button = QPushButton()
+        self.flamegraph_button.clicked.connect(self._export_flamegraph)
+        buttons_layout.addWidget(self.flamegraph_button)
+
+        self.json_button = QPushButton()
+        self.json_button.clicked.connect(self._export_json)
+        buttons_layout.addWidget(self.json_button)
+
+        self.results_button = QPushButton()
+        self.results_button.clicked.connect(self._export_results)
+        self.results_button.setEnabled(False)
+        buttons_layout.addWidget(self.results_button)
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+
+        self.update_texts()
+        self.apply_theme()
+
+    def set_profiler(self, profiler) -> None:
+        """Задает профилировщик текущего запуска (для экспорта)"""
+        self.profiler = profiler
+        self.summary = {}
+        has_profiler = profiler is not None
+        self.flamegraph_button.setEnabled(has_profiler)
+        self.json_button.setEnabled(has_profiler)
+
+    def set_results_exporter(self, exporter: Optional[Callable[[str], int]]) -> None:
+        """Задает выгрузку записей запуска в файл (None - записей нет, например во время запуска)"""
+        self.results_exporter = exporter
+        self.results_button.setEnabled(exporter is not None)
+
+    def update_report(self, report: List[Dict[str, Any]], summary: Dict[str, Any] = None) -> None:
+        """
+        Обновляет таблицу по отчету профилировщика.
+
+        Args:
+            report: Строки BlockProfiler.report()
+            summary: Итоговая сводка запуска (передается по его завершении)
+        """
+        if summary is not None:
+            self.summary = {k: v for k, v in summary.items() if k != "blocks"}
+
+        # Во время заполнения сортировка отключается, иначе строки переставляются на ходу
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(report))
+        for row_index, row in enumerate(report):
+            for column_index, (key, _) in enumerate(self.COLUMNS):
+                value = row.get(key, "")
+                item = QTableWidgetItem()
+                if isinstance(value, float):
+                    value = round(value, 1)
+                # Числа хранятся как данные, чтобы сортировка была числовой
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                if not isinstance(value, str):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row_index, column_index, item)
+        self.table.setSortingEnabled(True)
+
+    def update_texts(self):
+        self.title_label.setText(get_text("profiler_title"))
+        self.table.setHorizontalHeaderLabels([get_text(text_key) for _, text_key in self.COLUMNS])
+        self.flamegraph_button.setText(get_text("profiler_export_flamegraph"))
+        self.json_button.setText(get_text("profiler_export_json"))
+        self.results_button.setText(get_text("profiler_export_results"))
+
+    def apply_theme(self):
+        colors = _THEME.get_all_colors("panel")
+        self.setStyleSheet(f"""
+            QLabel {{
+                font-size: 14px;
+                font-weight: bold;
+                color: {colors.get('title_text', '#333')};
+            }}
+            QTableWidget {{
+                background-color: {colors.get('placeholder_background', '#f8f8f8')};
+                color: {colors.get('text', '#666')};
+                gridline-color: {colors.get('border', '#ccc')};
+                border: 1px solid {colors.get('border', '#ccc')};
+                border-radius: 4px;
+            }}
+            QHeaderView::section {{
+                background-color: {colors.get('title_background', '#f8f8f8')};
+                color: {colors.get('title_text', '#333')};
+                border: none;
+                border-bottom: 1px solid {colors.get('title_border', '#ccc')};
+                padding: 4px;
+            }}
+            QPushButton {{
+                background-color: {colors.get('title_background', '#f8f8f8')};
+                color: {colors.get('title_text', '#333')};
+                border: 1px solid {colors.get('title_border', '#ccc')};
+                border-radius: 4px;
+                padding: 4px 10px;
+            }}
+        """)
+
+    def _export_flamegraph(self):
+        if self.profiler is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, get_text("profiler_export_flamegraph"), "profile.folded",
+            "Collapsed stacks (*.folded *.txt)"
+        )
+        if file_path:
+            try:
+                self.profiler.export_collapsed(file_path)
+            except OSError as e:
+                print(f"Ошибка экспорта профиля: {e}")
+
+    def _export_json(self):
+        if self.profiler is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, get_text("profiler_export_json"), "profile.json", "JSON (*.json)"
+        )
+        if file_path:
+            try:
+                self.profiler.export_json(file_path, self.summary)
+            except OSError as e:
+                print(f"Ошибка экспорта профиля: {e}")
+
+    def _export_results(self):
+        if self.results_exporter is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, get_text("profiler_export_results"), "results.jsonl",
+            "JSON Lines (*.jsonl);;CSV (*.csv)"
+        )
+        if file_path:
+            try:
+                count = self.results_exporter(file_path)
+                print(f"Выгружено записей: {count}")
+            except (OSError, ValueError) as e:
+                print(f"Ошибка экспорта результатов: {e}")
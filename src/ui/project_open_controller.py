@@ -0,0 +1,98 @@
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+from ..core.title_manager import _TITLE_MANAGER
+from ..core.edit_history import _EDIT_HISTORY
+
+
+class ProjectOpenController(QObject):
+
+    # Сигналы испускаются из рабочего потока и доставляются в поток интерфейса
+    progress = pyqtSignal(int, int)
+    opened = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+    _loaded = pyqtSignal(str, object, object)
+
+    def __init__(self, parent=None):
+        """
+        Чтение файла проекта в фоновом потоке с прогрессом и отменой.
+
+        Результат применяется в потоке интерфейса через ProjectManager.apply_loaded_project.
+        Изменение текущего проекта или создание нового во время чтения отменяет чтение:
+        иначе прочитанный проект молча заменил бы эти изменения.
+        """
+        super().__init__(parent)
+        self._thread = None
+        self._cancel_event = None
+        self._loaded.connect(self._on_loaded)
+        _EDIT_HISTORY.add_listener(self._on_history_command)
+        _TITLE_MANAGER.add_listener(self._on_project_event)
+
+    def is_loading(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, file_path: str) -> bool:
+        """
+        Начинает чтение проекта.
+
+        Returns:
+            True если чтение начато, False если уже идет чтение другого проекта
+        """
+        if self.is_loading():
+            return False
+
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._load, args=(file_path, self._cancel_event),
+                                        name="project-open", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self) -> None:
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def _on_history_command(self, command, action: str) -> None:
+        self.cancel()
+
+    def _on_project_event(self, event: str) -> None:
+        if event in ("new", "modified"):
+            self.cancel()
+
+    def _load(self, file_path: str, cancel_event: threading.Event) -> None:
+        from ..core.project_storage import read_project_file
+        from ..core.project_loader import LoadCancelled
+
+        last_percent = [-1]
+
+        def on_progress(done: int, total: int) -> None:
+            # Сигнал отправляется только при изменении процента, чтобы не засыпать очередь событий
+            percent = done * 100 // total if total else 100
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.progress.emit(done, total)
+
+        try:
+            project_data, store = read_project_file(file_path, on_progress, cancel_event)
+        except LoadCancelled:
+            self.cancelled.emit(file_path)
+            return
+        except Exception as e:
+            print(f"Ошибка открытия проекта: {str(e)}")
+            self.failed.emit(file_path, str(e))
+            return
+
+        self._loaded.emit(file_path, project_data, store)
+
+    def _on_loaded(self, file_path: str, project_data, store) -> None:
+        # Отмена могла прийти, пока сигнал ждал в очереди
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            if hasattr(store, "close"):
+                store.close()
+            self.cancelled.emit(file_path)
+            return
+
+        from ..core.project_manager import _PROJECT_MANAGER
+        # Изменения, которые вызовет само применение (журнал после сбоя), чтение уже не отменяют
+        self._cancel_event = None
+        _PROJECT_MANAGER.apply_loaded_project(file_path, project_data, store)
+        self.opened.emit(file_path)
@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Any, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from ..core.text_manager import get_text
+
+
+class RunController(QObject):
+
+    # Сигналы испускаются из рабочего потока и доставляются в поток интерфейса
+    run_finished = pyqtSignal(object)
+    run_failed = pyqtSignal(str)
+    progress = pyqtSignal(object, str)
+
+    def __init__(self, refresh_interval_ms: int = 500, parent=None):
+        """
+        Запуск проекта в фоновом потоке с периодическим обновлением профиля.
+
+        Args:
+            refresh_interval_ms: Период обновления отчета профилировщика
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.engine = None
+        # Записи запуска пишутся в файл, а не копятся в памяти; файл можно выгрузить через export_results
+        self.results_path: Optional[str] = None
+        self._sink = None
+        self._thread = None
+        self._render_bridge = None
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(refresh_interval_ms)
+        self._refresh_timer.timeout.connect(self._emit_progress)
+        self.run_finished.connect(self._on_finished)
+        self.run_failed.connect(self._on_finished)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, project_data: Dict[str, Any], profile: bool = True) -> bool:
+        """
+        Запускает выполнение проекта.
+
+        Args:
+            project_data: Данные проекта
+            profile: Собирать статистику по блокам
+
+        Returns:
+            True если запуск начат, False если проект уже выполняется или граф некорректен
+        """
+        if self.is_running():
+            return False
+
+        from ..engine.run_engine import RunEngine, RunContext
+        from ..engine.blocks import needs_rendering
+        from ..engine.sinks import open_sink
+
+        self.discard_results()
+        try:
+            fd, self.results_path = tempfile.mkstemp(prefix="parser_run_", suffix=".jsonl")
+            os.close(fd)
+            self._sink = open_sink(self.results_path, "jsonl")
+        except OSError as e:
+            print(f"Ошибка создания файла результатов: {e}")
+            self.results_path = None
+            self.run_failed.emit(str(e))
+            return False
+
+        context = RunContext(on_result=self._sink.write)
+        if needs_rendering(project_data):
+            context.renderer = self._get_render_bridge(context).render
+
+        try:
+            self.engine = RunEngine(project_data, context, profile=profile)
+        except ValueError as e:
+            print(f"Ошибка запуска проекта: {e}")
+            self.discard_results()
+            self.run_failed.emit(str(e))
+            return False
+
+        self._thread = threading.Thread(target=self._run, name="project-run", daemon=True)
+        self._thread.start()
+        self._refresh_timer.start()
+        return True
+
+    def stop(self) -> None:
+        if self.engine is not None and self.is_running():
+            self.engine.stop()
+
+    def export_results(self, target: str) -> int:
+        """
+        Выгружает записи последнего запуска в файл.
+
+        Args:
+            target: Путь к файлу; формат (jsonl или csv) определяется по расширению
+
+        Returns:
+            Число выгруженных записей
+        """
+        from ..engine.sinks import open_sink
+
+        if self.results_path is None:
+            return 0
+        sink = open_sink(target)
+        try:
+            with open(self.results_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    sink.write(json.loads(line))
+        finally:
+            sink.close()
+        return sink.count
+
+    def discard_results(self) -> None:
+        """Удаляет файл записей последнего запуска"""
+        if self.is_running():
+            return
+        self._close_sink()
+        if self.results_path is not None:
+            try:
+                os.remove(self.results_path)
+            except OSError:
+                pass
+            self.results_path = None
+
+    def _close_sink(self) -> None:
+        if self._sink is not None:
+            try:
+                self._sink.close()
+            except OSError as e:
+                print(f"Ошибка записи результатов: {e}")
+            self._sink = None
+
+    def _get_render_bridge(self, context):
+        # Пул страниц создается один раз и переиспользуется между запусками
+        if self._render_bridge is None:
+            from ..engine.render_pool import RenderPool
+            from ..engine.render_bridge import RenderBridge
+            self._render_bridge = RenderBridge(RenderPool(parent=self), parent=self)
+
+        pool = self._render_bridge.pool
+        pool.controller = context.fetcher.fetcher.controller
+        pool.breaker = context.fetcher.breaker
+        pool.dead_letters = context.fetcher.dead_letters
+        return self._render_bridge
+
+    def _run(self) -> None:
+        try:
+            summary = self.engine.run()
+        except Exception as e:
+            print(f"Ошибка выполнения проекта: {e}")
+            self.run_failed.emit(str(e))
+            return
+        finally:
+            # Файл дописан до того, как интерфейс узнает о завершении
+            self._close_sink()
+        self.run_finished.emit(summary)
+
+    def _emit_progress(self) -> None:
+        if self.engine is None:
+            return
+        report = self.engine.profiler.report() if self.engine.profiler else []
+        stats = self.engine.context.fetcher.fetcher.stats()
+        status = f"{get_text('label_run_records')}: {self.engine.context.result_count} | {stats}"
+        self.progress.emit(report, status)
+
+    def _on_finished(self, *args) -> None:
+        self._refresh_timer.stop()
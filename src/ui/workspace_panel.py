@@ -1,6 +1,7 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from ..core.theme_manager import _THEME
+from .block_canvas import BlockCanvas
+from .profiler_panel import ProfilerPanel
 
 
 class WorkspacePanel(QWidget):
@@ -12,62 +13,37 @@ class WorkspacePanel(QWidget):
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
         
-        # Заголовок панели
-        title_label = QLabel(self.title)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title_label)
+        # Холст графа блоков проекта
+        self.canvas = BlockCanvas()
+        layout.addWidget(self.canvas, 1)
         
-        # Заглушка для будущего контента
-        placeholder_label = QLabel("Здесь будет размещен контент панели")
-        placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(placeholder_label)
+        # Профиль выполнения показывается после первого запуска проекта
+        self.profiler_panel = ProfilerPanel()
+        self.profiler_panel.hide()
+        layout.addWidget(self.profiler_panel)
         
         # Применяем тему
-        self.apply_theme(title_label, placeholder_label)
-        
-        # Добавляем растягивающийся элемент
-        layout.addStretch()
+        self.apply_theme()
+    
+    def show_profile(self, report, summary=None):
+        """Показывает отчет профилировщика о запуске проекта"""
+        self.profiler_panel.update_report(report, summary)
+        self.profiler_panel.show()
     
-    def apply_theme(self, title_label=None, placeholder_label=None):
+    def apply_theme(self):
         """Применяет тему к компонентам панели"""
         colors = _THEME.get_all_colors("panel")
         
-        # Если параметры не переданы, ищем виджеты в layout
-        if title_label is None or placeholder_label is None:
-            layout = self.layout()
-            if layout and layout.count() > 0:
-                title_label = layout.itemAt(0).widget() if title_label is None else title_label
-                placeholder_label = layout.itemAt(1).widget() if placeholder_label is None else placeholder_label
-        
-        if title_label:
-            # Стиль для заголовка
-            title_style = f"""
-                QLabel {{
-                    font-size: 18px;
-                    font-weight: bold;
-                    color: {colors.get('title_text', '#333')};
-                    padding: 10px;
-                    background-color: {colors.get('title_background', '#f8f8f8')};
-                    border-bottom: 2px solid {colors.get('title_border', '#ccc')};
-                    margin-bottom: 10px;
-                    border-radius: 6px 6px 0 0;
-                }}
-            """
-            title_label.setStyleSheet(title_style)
+        self.canvas.setStyleSheet(f"""
+            QGraphicsView {{
+                border: none;
+                border-right: 1px solid {colors.get('border', '#333')};
+            }}
+        """)
+        self.canvas.apply_theme()
         
-        if placeholder_label:
-            # Стиль для заглушки
-            placeholder_style = f"""
-                QLabel {{
-                    font-size: 14px;
-                    color: {colors.get('text', '#666')};
-                    padding: 20px;
-                    background-color: {colors.get('placeholder_background', '#f8f8f8')};
-                    border: 2px dashed {colors.get('placeholder_border', '#ccc')};
-                    border-radius: 8px;
-                }}
-            """
-            placeholder_label.setStyleSheet(placeholder_style)
+        if hasattr(self, 'profiler_panel'):
+            self.profiler_panel.apply_theme()
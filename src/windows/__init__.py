@@ -6,5 +6,7 @@ from .settings_window import SettingsWindow
 from .about_window import AboutWindow
 from .new_window import NewWindow
 from .save_discard_window import SaveDiscardWindow
+from .recovery_window import RecoveryWindow
+from .project_search_window import ProjectSearchWindow
 
-__all__ = ['BaseWindow', 'SettingsWindow', 'AboutWindow', 'NewWindow', 'SaveDiscardWindow']
+__all__ = ['BaseWindow', 'SettingsWindow', 'AboutWindow', 'NewWindow', 'SaveDiscardWindow', 'RecoveryWindow', 'ProjectSearchWindow']
@@ -59,7 +59,9 @@ class NewWindow(BaseWindow):
         project_desc = self.desc_input.text().strip()
         
         from ..core.title_manager import _TITLE_MANAGER
+        from ..core.project_manager import _PROJECT_MANAGER
         _TITLE_MANAGER.new_project()
+        _PROJECT_MANAGER.new_project()
         
         if project_name != get_text("window_new_title"):
             _TITLE_MANAGER.project_name = project_name
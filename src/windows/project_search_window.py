@@ -0,0 +1,99 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout
+from PyQt6.QtCore import Qt
+from ..core.text_manager import get_text
+from ..core.project_manager import _PROJECT_MANAGER
+
+
+class ProjectSearchWindow(QDialog):
+
+    def __init__(self, parent=None, width=520, height=420):
+        """
+        Мгновенный поиск проекта по каталогу: список обновляется при каждом
+        изменении строки поиска.
+
+        Args:
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.setWindowTitle(get_text("window_project_search_title"))
+        self.resize(width, height)
+        self.setModal(True)
+        self.selected_path = None  # Путь выбранного проекта или None (окно закрыто)
+
+        self.setup_ui()
+        self._update_results("")
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(12)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(get_text("window_project_search_placeholder"))
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self._update_results)
+        self.search_input.returnPressed.connect(self._open_selected)
+        self.search_input.installEventFilter(self)
+        layout.addWidget(self.search_input)
+
+        self.results_list = QListWidget()
+        self.results_list.itemActivated.connect(lambda item: self._open_selected())
+        layout.addWidget(self.results_list)
+
+        # Кнопки
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        cancel_button = QPushButton(get_text("button_cancel"))
+        cancel_button.clicked.connect(self.close)
+
+        self.open_button = QPushButton(get_text("button_open"))
+        self.open_button.clicked.connect(self._open_selected)
+
+        button_layout.addWidget(cancel_button)
+        button_layout.addWidget(self.open_button)
+        layout.addLayout(button_layout)
+
+        self.search_input.setFocus()
+
+    def _update_results(self, text: str):
+        self.results_list.clear()
+        for project_info in _PROJECT_MANAGER.search_projects(text):
+            project_path = project_info.get("path", "")
+            item = QListWidgetItem(
+                f"{_PROJECT_MANAGER.get_recent_project_name(project_info)}\n{project_path}"
+            )
+            item.setData(Qt.ItemDataRole.UserRole, project_path)
+            item.setToolTip(project_path)
+            self.results_list.addItem(item)
+
+        if self.results_list.count():
+            self.results_list.setCurrentRow(0)
+        else:
+            placeholder = QListWidgetItem(get_text("message_no_projects_found"))
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.results_list.addItem(placeholder)
+        self.open_button.setEnabled(self.results_list.currentItem() is not None)
+
+    def eventFilter(self, obj, event):
+        # Стрелки в строке поиска двигают выделение в списке, не отнимая фокус
+        if obj is self.search_input and event.type() == event.Type.KeyPress:
+            if event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up):
+                step = 1 if event.key() == Qt.Key.Key_Down else -1
+                row = self.results_list.currentRow() + step
+                if 0 <= row < self.results_list.count():
+                    self.results_list.setCurrentRow(row)
+                return True
+        return super().eventFilter(obj, event)
+
+    def _open_selected(self):
+        item = self.results_list.currentItem()
+        if item is None:
+            return
+        project_path = item.data(Qt.ItemDataRole.UserRole)
+        if project_path:
+            self.selected_path = project_path
+            self.close()
+
+    def get_selected_path(self):
+        return self.selected_path
@@ -0,0 +1,86 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
+from ..core.text_manager import get_text
+
+
+class RecoveryWindow(QDialog):
+
+    def __init__(self, saved_at: str, parent=None, width=420, height=130):
+        """
+        Предложение восстановить проект из автосохраненной копии.
+
+        Args:
+            saved_at: Время записи копии (для показа пользователю)
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.setWindowTitle(get_text("window_recovery_title"))
+        self.setFixedSize(width, height)
+        self.setModal(True)
+        self.saved_at = saved_at
+        self.user_choice = None  # None (окно закрыто - копия остается), 'restore', 'discard'
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        question_label = QLabel(f"{get_text('window_recovery_question')} ({self.saved_at})")
+        question_label.setWordWrap(True)
+        question_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(question_label)
+
+        # Кнопки
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(12)
+
+        restore_button = QPushButton(get_text("button_restore"))
+        restore_button.clicked.connect(self._restore_project)
+        restore_button.setDefault(True)
+        restore_button.setStyleSheet("""
+            QPushButton {
+                background-color: #007ACC;
+                color: white;
+                border: none;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #005A9E;
+            }
+        """)
+
+        discard_button = QPushButton(get_text("button_delete_copy"))
+        discard_button.clicked.connect(self._discard_copy)
+        discard_button.setStyleSheet("""
+            QPushButton {
+                background-color: #FF6B6B;
+                color: white;
+                border: none;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #FF5252;
+            }
+        """)
+
+        button_layout.addWidget(restore_button)
+        button_layout.addWidget(discard_button)
+
+        layout.addLayout(button_layout)
+        layout.addStretch()
+
+    def _restore_project(self):
+        self.user_choice = 'restore'
+        self.close()
+
+    def _discard_copy(self):
+        self.user_choice = 'discard'
+        self.close()
+
+    def get_user_choice(self):
+        return self.user_choice
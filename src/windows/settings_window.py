@@ -125,15 +125,18 @@ class SettingsWindow(BaseWindow):
     def _on_show_grid_changed(self, state):
         is_checked = state == Qt.CheckState.Checked.value
         _APP_SETTINGS.set_setting("show_grid", is_checked)
-        self._sync_menu_checkbox("top_bar_submenu_ShowGrid", is_checked)
+        self._sync_menu_checkbox("top_bar_submenu_Toggle_Grid", is_checked)
     
     def _on_snap_to_grid_changed(self, state):
         is_checked = state == Qt.CheckState.Checked.value
         _APP_SETTINGS.set_setting("snap_to_grid", is_checked)
-        self._sync_menu_checkbox("top_bar_submenu_SnapToGrid", is_checked)
+        self._sync_menu_checkbox("top_bar_submenu_Toggle_Snap_to_Grid", is_checked)
     
     def _sync_menu_checkbox(self, menu_id, is_checked):
         """Синхронизирует состояние чекбокса в меню с настройками"""
+        if hasattr(self.parent(), 'update_workspace_settings'):
+            self.parent().update_workspace_settings()
+        
         if hasattr(self.parent(), 'menu_system'):
             menu_system = self.parent().menu_system
             if menu_id in menu_system.checkboxes:
@@ -143,9 +146,9 @@ class SettingsWindow(BaseWindow):
         """Синхронизирует состояние чекбокса из меню в настройки"""
         if menu_id == "top_bar_submenu_AutoSave":
             self.auto_save_checkbox.setChecked(is_checked)
-        elif menu_id == "top_bar_submenu_ShowGrid":
+        elif menu_id == "top_bar_submenu_Toggle_Grid":
             self.show_grid_checkbox.setChecked(is_checked)
-        elif menu_id == "top_bar_submenu_SnapToGrid":
+        elif menu_id == "top_bar_submenu_Toggle_Snap_to_Grid":
             self.snap_to_grid_checkbox.setChecked(is_checked)
     
     def _save_settings(self):